@@ -3,27 +3,80 @@
 ESP8266 TinyML WAF Dashboard Backend
 Real-time monitoring API for WAF events
 """
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from datetime import datetime
-from collections import deque
-import threading
+import atexit
+import os
+
+from event_db import EventDB, parse_time
+from event_store import EventRing, ShardedStats
+from event_stream import StreamHub, format_sse
+from reports import (MAX_BATCH_EVENTS, batch_response, binary_event_count, build_batch,
+                     decode_binary_batch, event_query, live_events_response, parse_batch_body,
+                     parse_event)
+from timeseries import TimeSeries
+from udp_listener import UDPReportListener
 
 app = Flask(__name__)
 CORS(app)  # React frontend için CORS enable
 
-# In-memory storage (son 1000 event)
-events = deque(maxlen=1000)
-stats = {
-    'total_requests': 0,
-    'blocked_requests': 0,
-    'allowed_requests': 0,
-    'last_updated': None,
-    'block_rate': 0.0
-}
+# Kalıcı store (SQLite WAL); yazmalar arka planda batch'lenir
+DB_PATH = os.environ.get('DASHBOARD_DB_PATH',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'events.db'))
+db = EventDB(DB_PATH)
+atexit.register(db.close)
+
+# İkili raporlar için UDP portu (boş = kapalı)
+UDP_PORT = int(os.environ.get('DASHBOARD_UDP_PORT') or 0)
+
+# In-memory storage (son 1000 event); okumalar yazarları bekletmez
+# id'ler kalıcı store'daki son id'den devam eder
+events = EventRing(capacity=1000, first_id=db.max_id() + 1)
+stats = ShardedStats()
+
+# Grafikler için saniye/dakika bucket'ları (ingest'te artımlı güncellenir)
+timeseries = TimeSeries()
+
+# Canlı dashboard istemcilerine SSE yayını (/api/stream)
+hub = StreamHub()
+
+
+def apply_events(new_events):
+    """
+    Event'leri tek seferde store'a ekle (id'ler ring'in yazma lock'u altında atanır)
+    ve istatistikleri bir kez güncelle.
+    Returns: (ilk event id, son event id)
+    """
+    blocked = sum(1 for e in new_events if e['action'] == 'BLOCKED')
+    allowed = sum(1 for e in new_events if e['action'] == 'ALLOWED')
+    
+    first_id, last_id = events.extend(new_events)
+    stats.add(len(new_events), blocked, allowed)
+    timeseries.record(new_events)
+    db.append(new_events)
+    if len(hub):
+        hub.publish(new_events, stats.snapshot())
+    return first_id, last_id
+
+
+def log_batch(source, new_events, rejected):
+    blocked = sum(1 for e in new_events if e['action'] == 'BLOCKED')
+    print(f"[{source}] {len(new_events)} events ({blocked} blocked, {rejected} rejected)")
+
+
+def apply_udp_events(new_events):
+    apply_events(new_events)
+    log_batch('UDP', new_events, 0)
 
-# Thread-safe lock
-lock = threading.Lock()
+
+# Debug reloader'ın izleyici process'i portu tutmasın: yalnızca istekleri
+# işleyen process'te (gunicorn worker / reloader child) başlat
+udp_listener = None
+if UDP_PORT and (__name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+    udp_listener = UDPReportListener('0.0.0.0', UDP_PORT, apply_udp_events)
+    udp_listener.start()
+    atexit.register(udp_listener.close)
 
 
 @app.route('/api/report', methods=['POST'])
@@ -33,34 +86,8 @@ def report_event():
         data = request.get_json()
         
         # Event bilgilerini parse et
-        event = {
-            'id': stats['total_requests'] + 1,
-            'timestamp': datetime.now().isoformat(),
-            'esp_ip': request.remote_addr,
-            'method': data.get('method', 'UNKNOWN'),
-            'path': data.get('path', '/'),
-            'query': data.get('query', ''),
-            'user_agent': data.get('user_agent', ''),
-            'probability': float(data.get('probability', 0)),
-            'classification': data.get('classification', 'UNKNOWN'),
-            'action': data.get('action', 'UNKNOWN'),  # ALLOWED or BLOCKED
-            'client_ip': data.get('client_ip', 'unknown')
-        }
-        
-        with lock:
-            events.appendleft(event)
-            stats['total_requests'] += 1
-            
-            if event['action'] == 'BLOCKED':
-                stats['blocked_requests'] += 1
-            elif event['action'] == 'ALLOWED':
-                stats['allowed_requests'] += 1
-            
-            # Block rate hesapla
-            if stats['total_requests'] > 0:
-                stats['block_rate'] = (stats['blocked_requests'] / stats['total_requests']) * 100
-            
-            stats['last_updated'] = datetime.now().isoformat()
+        event = parse_event(data, request.remote_addr, datetime.now().isoformat())
+        apply_events([event])
         
         print(f"[EVENT] {event['action']} - {event['method']} {event['path']} (prob={event['probability']:.4f})")
         
@@ -71,43 +98,168 @@ def report_event():
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 
+@app.route('/api/report/batch', methods=['POST'])
+def report_batch():
+    """
+    Birden fazla event'i tek istekte al (JSON dizi veya NDJSON).
+    Geçersiz event'ler tek tek reddedilir, geri kalanı tek lock alımıyla eklenir.
+    """
+    try:
+        items = parse_batch_body(request.get_data(cache=False, as_text=True), request.mimetype)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    if len(items) > MAX_BATCH_EVENTS:
+        return jsonify({
+            'status': 'error',
+            'message': f'batch too large ({len(items)} > {MAX_BATCH_EVENTS} events)'
+        }), 413
+    
+    new_events, errors = build_batch(items, request.remote_addr, datetime.now().isoformat())
+    
+    first_id = last_id = None
+    if new_events:
+        first_id, last_id = apply_events(new_events)
+        log_batch('BATCH', new_events, len(errors))
+    
+    body, status = batch_response(len(items), new_events, errors, first_id, last_id)
+    return jsonify(body), status
+
+
+@app.route('/api/report/binary', methods=['POST'])
+def report_binary():
+    """
+    Kompakt ikili batch (format: reports.py). Yanıt /api/report/batch ile aynıdır;
+    kesik kayıtlar reddedilir, öncekiler kabul edilir.
+    """
+    body = request.get_data(cache=False)
+    try:
+        count = binary_event_count(body)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    if count > MAX_BATCH_EVENTS:
+        return jsonify({
+            'status': 'error',
+            'message': f'batch too large ({count} > {MAX_BATCH_EVENTS} events)'
+        }), 413
+    
+    new_events, errors = decode_binary_batch(body, count, request.remote_addr,
+                                             datetime.now().isoformat())
+    
+    first_id = last_id = None
+    if new_events:
+        first_id, last_id = apply_events(new_events)
+        log_batch('BINARY', new_events, len(errors))
+    
+    result, status = batch_response(count, new_events, errors, first_id, last_id)
+    return jsonify(result), status
+
+
 @app.route('/api/events', methods=['GET'])
 def get_events():
-    """Son event'leri getir"""
-    limit = request.args.get('limit', 100, type=int)
-    with lock:
-        return jsonify({
-            'events': list(events)[:limit],
-            'count': len(events)
-        })
+    """
+    Son event'leri getir. Filtre/cursor verilirse kalıcı store'dan sorgulanır:
+    since/until (epoch veya ISO), client_ip, action, cursor (id < cursor)
+    """
+    try:
+        query = event_query(request.args, parse_time)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    if query is None:
+        # Canlı görünüm: bellekteki ring buffer
+        return jsonify(live_events_response(events, request.args.get('limit', 100, type=int)))
+    
+    result, next_cursor = db.query(**query)
+    return jsonify({
+        'events': result,
+        'count': len(result),
+        'next_cursor': next_cursor
+    })
+
+
+@app.route('/api/stream', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events: önce `snapshot` (son `limit` event + stats), sonra yeni
+    event'ler (`events`), istatistikler (`stats`), kaçırılanlar (`gap`) ve `clear`.
+    Yeniden bağlanan istemci (Last-Event-ID) aradaki event'leri `events` olarak alır.
+    """
+    if len(hub) >= hub.max_subscribers:
+        return jsonify({'status': 'error', 'message': 'too many stream clients'}), 503
+    
+    limit = request.args.get('limit', 50, type=int)
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    
+    def initial():
+        if last_id is None:
+            recent = events.latest(max(limit, 0))
+            chunks = [format_sse('snapshot', {'events': recent, 'stats': stats.snapshot()},
+                                 event_id=recent[0]['id'] if recent else None)]
+        else:
+            recent = [e for e in events.latest(events.capacity) if e['id'] > last_id]
+            chunks = []
+            # Ring'de bulunmayan (taşmış) event'ler
+            if recent and recent[-1]['id'] > last_id + 1:
+                chunks.append(format_sse('gap', {'dropped': recent[-1]['id'] - last_id - 1}))
+            if recent:
+                chunks.append(format_sse('events', recent, event_id=recent[0]['id']))
+            chunks.append(format_sse('stats', stats.snapshot()))
+        return chunks, {e['id'] for e in recent}
+    
+    return Response(hub.stream(initial), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """İstatistikleri getir"""
-    with lock:
-        return jsonify(stats)
+    return jsonify(stats.snapshot())
+
+
+@app.route('/api/timeseries', methods=['GET'])
+def get_timeseries():
+    """
+    Zaman bucket'ları: ?resolution=second|minute&points=60&top=5
+    Boş bucket'lar sıfırla döner; top_* tüm pencere için hesaplanır.
+    """
+    try:
+        result = timeseries.query(
+            resolution=request.args.get('resolution', 'second'),
+            points=request.args.get('points', 60, type=int),
+            top=request.args.get('top', 5, type=int)
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify(result)
 
 
 @app.route('/api/clear', methods=['POST'])
 def clear_events():
-    """Tüm event'leri temizle"""
-    with lock:
-        events.clear()
-        stats['total_requests'] = 0
-        stats['blocked_requests'] = 0
-        stats['allowed_requests'] = 0
-        stats['block_rate'] = 0.0
-        stats['last_updated'] = datetime.now().isoformat()
+    """
+    Canlı görünümü ve istatistikleri temizle.
+    ?purge=1 verilirse kalıcı store'daki event'ler de silinir.
+    """
+    events.clear()
+    stats.reset()
+    timeseries.clear()
+    hub.publish_clear(stats.snapshot())
+    purge = request.args.get('purge', '').lower() in ('1', 'true', 'yes')
+    if purge:
+        db.purge()
     
-    print("[INFO] Events cleared")
-    return jsonify({'status': 'cleared'})
+    print(f"[INFO] Events cleared{' (persistent store purged)' if purge else ''}")
+    return jsonify({'status': 'cleared', 'purged': purge})
 
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check"""
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    result = {'status': 'healthy', 'timestamp': datetime.now().isoformat()}
+    if udp_listener is not None:
+        result['udp'] = udp_listener.counters()
+    return jsonify(result)
 
 
 if __name__ == '__main__':
@@ -115,8 +267,15 @@ if __name__ == '__main__':
     print("  ESP8266 TinyML WAF Dashboard Backend")
     print("=" * 70)
     print("  API Endpoint: http://0.0.0.0:5000/api/report")
+    print("  Batch:        http://0.0.0.0:5000/api/report/batch")
+    print("  Binary:       http://0.0.0.0:5000/api/report/binary")
+    if UDP_PORT:
+        print(f"  UDP reports:  0.0.0.0:{UDP_PORT}")
     print("  Stats:        http://0.0.0.0:5000/api/stats")
     print("  Events:       http://0.0.0.0:5000/api/events")
+    print("  Timeseries:   http://0.0.0.0:5000/api/timeseries")
+    print("  Stream (SSE): http://0.0.0.0:5000/api/stream")
+    print(f"  Database:     {DB_PATH}")
     print("=" * 70)
     print()
     app.run(host='0.0.0.0', port=5000, debug=True)
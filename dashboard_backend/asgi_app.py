@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+ESP8266 TinyML WAF Dashboard Backend - ASGI ingest servisi
+
+app.py ile aynı HTTP sözleşmesi (/api/report, /api/report/batch, /api/events,
+/api/report/binary, /api/stats, /api/timeseries, /api/clear, /api/health) ve
+opsiyonel UDP rapor portu (DASHBOARD_UDP_PORT / --udp-port); yüzlerce WAF cihazının
+eşzamanlı raporlaması için asyncio üzerinde çalışır:
+
+- HTTP isteği yalnızca gövdeyi parse eder, event'lere id atar ve iç kuyruğa
+  koyar; yanıt aggregation'ı beklemez.
+- Tek aggregator task kuyruğu toplu boşaltıp ring buffer, istatistik, zaman
+  serisi ve kalıcı store'u günceller (event loop içinde, lock çekişmesi yok).
+- Kuyrukta MAX_QUEUE_EVENTS'ten fazla event birikirse 503 + Retry-After döner.
+
+Framework bağımlılığı yoktur (saf ASGI); herhangi bir ASGI sunucusuyla çalışır:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+/api/stream (SSE) yalnızca Flask uygulamasındadır.
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+from event_db import EventDB, parse_time
+from event_store import EventRing, ShardedStats
+from reports import (MAX_BATCH_EVENTS, batch_response, binary_event_count, build_batch,
+                     decode_binary_batch, event_query, int_arg, live_events_response,
+                     parse_batch_body, parse_event)
+from timeseries import TimeSeries
+from udp_listener import UDPReportProtocol
+
+MAX_QUEUE_EVENTS = 100000    # aggregator geride kalırsa kabul edilen en fazla bekleyen event
+MAX_BODY_BYTES = 1 << 20
+AGGREGATE_ITEMS = 1000       # aggregator turunda kuyruktan alınan en fazla istek
+
+DB_PATH = os.environ.get('DASHBOARD_DB_PATH',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'events.db'))
+UDP_PORT = int(os.environ.get('DASHBOARD_UDP_PORT') or 0)
+
+
+class _Clear:
+    def __init__(self, purge):
+        self.purge = purge
+
+
+class IngestService:
+    """Kabul (HTTP) ile aggregation'ı iç kuyrukla ayıran event store"""
+
+    def __init__(self, db_path=DB_PATH, max_queue_events=MAX_QUEUE_EVENTS, udp_port=UDP_PORT):
+        self.db_path = db_path
+        self.max_queue_events = max_queue_events
+        self.udp_port = udp_port
+        self.udp = None
+        self.started = False
+
+    async def start(self):
+        if self.started:
+            return
+        self.started = True
+        self.db = EventDB(self.db_path)
+        self.events = EventRing(capacity=1000, first_id=self.db.max_id() + 1)
+        self.stats = ShardedStats()
+        self.timeseries = TimeSeries()
+        self.queue = asyncio.Queue()
+        self.queued = 0
+        self.rejected = 0
+        self.failed = 0
+        self.next_id = self.events.first_id
+        self._aggregator = asyncio.create_task(self._aggregate())
+        if self.udp_port:
+            self._udp_transport, self.udp = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: UDPReportProtocol(lambda new_events: self.accept(new_events) is not None),
+                local_addr=('0.0.0.0', self.udp_port))
+
+    async def stop(self):
+        if not self.started:
+            return
+        if self.udp is not None:
+            self._udp_transport.close()
+        self._aggregator.cancel()
+        # Kuyrukta kalanları yaz
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if isinstance(item, list):
+                self._apply(item)
+        self.db.close()
+        self.started = False
+
+    def aggregator_alive(self):
+        return self.started and not self._aggregator.done()
+
+    def accept(self, new_events):
+        """
+        Event'lere id ata ve kuyruğa koy (id sırası = kuyruk sırası = ring sırası).
+        Returns: (ilk event id, son event id) veya None (kuyruk dolu / aggregator durmuş)
+        """
+        if (self.queued + len(new_events) > self.max_queue_events
+                or not self.aggregator_alive()):
+            self.rejected += len(new_events)
+            return None
+        first_id = self.next_id
+        for i, event in enumerate(new_events):
+            event['id'] = first_id + i
+        self.next_id += len(new_events)
+        self.queued += len(new_events)
+        self.queue.put_nowait(new_events)
+        return first_id, first_id + len(new_events) - 1
+
+    def request_clear(self, purge):
+        """Kuyruktaki event'ler işlendikten sonra temizle"""
+        self.queue.put_nowait(_Clear(purge))
+
+    async def _aggregate(self):
+        while True:
+            items = [await self.queue.get()]
+            while not self.queue.empty() and len(items) < AGGREGATE_ITEMS:
+                items.append(self.queue.get_nowait())
+
+            batch = []
+            for item in items:
+                if isinstance(item, list):
+                    batch.extend(item)
+                    continue
+                self._apply(batch)
+                batch = []
+                await self._clear(item.purge)
+            self._apply(batch)
+            # Yoğun yükte HTTP handler'larına sıra ver
+            await asyncio.sleep(0)
+
+    def _apply(self, batch):
+        # Hata tek batch'i etkiler; aggregator task'ı ölmemeli (yoksa kuyruk hiç boşalmaz)
+        if not batch:
+            return
+        self.queued -= len(batch)
+        try:
+            blocked = sum(1 for e in batch if e['action'] == 'BLOCKED')
+            allowed = sum(1 for e in batch if e['action'] == 'ALLOWED')
+            self.events.extend(batch, assign_ids=False)
+            self.stats.add(len(batch), blocked, allowed)
+            self.timeseries.record(batch)
+            self.db.append(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"[ERROR] Aggregation failed for {len(batch)} events: {e}")
+
+    async def _clear(self, purge):
+        try:
+            self.events.clear()
+            self.stats.reset()
+            self.timeseries.clear()
+            if purge:
+                await asyncio.to_thread(self.db.purge)
+        except Exception as e:
+            print(f"[ERROR] Clear failed: {e}")
+            return
+        print(f"[INFO] Events cleared{' (persistent store purged)' if purge else ''}")
+
+
+service = IngestService()
+
+
+class _Request:
+    __slots__ = ('method', 'path', 'args', 'content_type', 'remote_addr', 'body')
+
+    def __init__(self, scope, body):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = {}
+        for key, value in parse_qsl(scope.get('query_string', b'').decode('latin-1')):
+            self.args.setdefault(key, value)
+        self.content_type = ''
+        for name, value in scope.get('headers', ()):
+            if name == b'content-type':
+                self.content_type = value.decode('latin-1').split(';')[0].strip()
+        client = scope.get('client')
+        self.remote_addr = client[0] if client else None
+        self.body = body
+
+    def text(self):
+        return self.body.decode('utf-8', 'replace')
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+def _error(status, message):
+    return status, {'status': 'error', 'message': message}
+
+
+def _queue_full():
+    message = 'ingest queue full' if service.aggregator_alive() else 'aggregator stopped'
+    return 503, {'status': 'error', 'message': message}, [(b'retry-after', b'1')]
+
+
+async def report_event(request):
+    """ESP8266'dan event al"""
+    try:
+        event = parse_event(json.loads(request.text()), request.remote_addr,
+                            datetime.now().isoformat())
+    except (TypeError, ValueError) as e:
+        return _error(400, str(e))
+    ids = service.accept([event])
+    if ids is None:
+        return _queue_full()
+    return 200, {'status': 'success', 'event_id': ids[0]}
+
+
+async def report_batch(request):
+    """Birden fazla event'i tek istekte al (JSON dizi veya NDJSON)"""
+    try:
+        items = parse_batch_body(request.text(), request.content_type)
+    except ValueError as e:
+        return _error(400, str(e))
+    if len(items) > MAX_BATCH_EVENTS:
+        return _error(413, f'batch too large ({len(items)} > {MAX_BATCH_EVENTS} events)')
+
+    new_events, errors = build_batch(items, request.remote_addr, datetime.now().isoformat())
+    first_id = last_id = None
+    if new_events:
+        ids = service.accept(new_events)
+        if ids is None:
+            return _queue_full()
+        first_id, last_id = ids
+    body, status = batch_response(len(items), new_events, errors, first_id, last_id)
+    return status, body
+
+
+async def report_binary(request):
+    """Kompakt ikili batch (format: reports.py)"""
+    try:
+        count = binary_event_count(request.body)
+    except ValueError as e:
+        return _error(400, str(e))
+    if count > MAX_BATCH_EVENTS:
+        return _error(413, f'batch too large ({count} > {MAX_BATCH_EVENTS} events)')
+
+    new_events, errors = decode_binary_batch(request.body, count, request.remote_addr,
+                                             datetime.now().isoformat())
+    first_id = last_id = None
+    if new_events:
+        ids = service.accept(new_events)
+        if ids is None:
+            return _queue_full()
+        first_id, last_id = ids
+    body, status = batch_response(count, new_events, errors, first_id, last_id)
+    return status, body
+
+
+async def get_events(request):
+    """Son event'ler; filtre/cursor verilirse kalıcı store'dan (app.py ile aynı)"""
+    try:
+        query = event_query(request.args, parse_time)
+    except ValueError as e:
+        return _error(400, str(e))
+    if query is None:
+        return 200, live_events_response(service.events, int_arg(request.args, 'limit', 100))
+    result, next_cursor = await asyncio.to_thread(service.db.query, **query)
+    return 200, {'events': result, 'count': len(result), 'next_cursor': next_cursor}
+
+
+async def get_stats(request):
+    return 200, service.stats.snapshot()
+
+
+async def get_timeseries(request):
+    try:
+        return 200, service.timeseries.query(
+            resolution=request.args.get('resolution', 'second'),
+            points=int_arg(request.args, 'points', 60),
+            top=int_arg(request.args, 'top', 5)
+        )
+    except ValueError as e:
+        return _error(400, str(e))
+
+
+async def clear_events(request):
+    purge = request.args.get('purge', '').lower() in ('1', 'true', 'yes')
+    service.request_clear(purge)
+    return 200, {'status': 'cleared', 'purged': purge}
+
+
+async def health(request):
+    alive = service.aggregator_alive()
+    result = {'status': 'healthy' if alive else 'unhealthy',
+              'timestamp': datetime.now().isoformat(),
+              'aggregator_alive': alive,
+              'queued_events': service.queued,
+              'failed_events': service.failed}
+    if service.udp is not None:
+        result['udp'] = service.udp.counters()
+    return (200 if alive else 503), result
+
+
+ROUTES = {
+    ('POST', '/api/report'): report_event,
+    ('POST', '/api/report/batch'): report_batch,
+    ('POST', '/api/report/binary'): report_binary,
+    ('GET', '/api/events'): get_events,
+    ('GET', '/api/stats'): get_stats,
+    ('GET', '/api/timeseries'): get_timeseries,
+    ('POST', '/api/clear'): clear_events,
+    ('GET', '/api/health'): health,
+}
+ROUTE_PATHS = {path for _, path in ROUTES}
+
+CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+
+
+async def _read_body(receive):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body = message.get('body', b'')
+        size += len(body)
+        if size > MAX_BODY_BYTES:
+            raise _BodyTooLarge()
+        chunks.append(body)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _send(send, status, data=None, headers=()):
+    body = json.dumps(data).encode('utf-8') if data is not None else b''
+    response_headers = [(b'content-length', str(len(body)).encode('latin-1'))] + CORS_HEADERS
+    if data is not None:
+        response_headers.append((b'content-type', b'application/json'))
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': response_headers + list(headers)})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await service.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await service.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI uygulaması"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    await service.start()
+
+    method, path = scope['method'], scope['path']
+    if method == 'OPTIONS':
+        # CORS preflight (React frontend)
+        await _send(send, 204, headers=[
+            (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+            (b'access-control-allow-headers', b'Content-Type'),
+        ])
+        return
+
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        if path in ROUTE_PATHS:
+            await _send(send, 405, {'status': 'error', 'message': 'method not allowed'})
+        else:
+            await _send(send, 404, {'status': 'error', 'message': 'not found'})
+        return
+
+    try:
+        body = await _read_body(receive) if method == 'POST' else b''
+    except _BodyTooLarge:
+        await _send(send, 413, {'status': 'error', 'message': 'request body too large'})
+        return
+    if body is None:
+        return
+
+    status, data, *headers = await handler(_Request(scope, body))
+    await _send(send, status, data, headers[0] if headers else ())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WAF dashboard ASGI ingest service')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--udp-port', type=int, default=UDP_PORT,
+                        help='İkili UDP raporları için port (0 = kapalı)')
+    args = parser.parse_args()
+    service.udp_port = args.udp_port
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("[!] uvicorn is required to run the ASGI service: pip3 install uvicorn")
+        raise SystemExit(1)
+
+    print("=" * 70)
+    print("  ESP8266 TinyML WAF Dashboard Backend (ASGI)")
+    print("=" * 70)
+    print(f"  API Endpoint: http://{args.host}:{args.port}/api/report")
+    if args.udp_port:
+        print(f"  UDP reports:  {args.host}:{args.udp_port}")
+    print(f"  Database:     {DB_PATH}")
+    print("=" * 70)
+    print()
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
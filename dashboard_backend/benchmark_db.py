@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Kalıcı event store (event_db.py) büyüme benchmark'ı.
+
+Store'u --events kadar event'e büyütür; her --report-every event'te bir
+batch yazma gecikmesini ve tipik /api/events sorgularının süresini yazar.
+Ingest maliyetinin store büyüdükçe sabit kalması beklenir.
+
+Kullanım:
+    python3 benchmark_db.py --events 10000000 --db /tmp/bench_events.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime
+
+from event_db import EventDB
+
+
+def _make_events(first_id, count, start_ts):
+    result = []
+    for i in range(count):
+        blocked = random.random() < 0.2
+        result.append({
+            'id': first_id + i,
+            'timestamp': datetime.fromtimestamp(start_ts + i * 0.001).isoformat(),
+            'esp_ip': '192.168.1.50',
+            'method': 'GET',
+            'path': f'/page/{random.randint(0, 500)}',
+            'query': '',
+            'user_agent': 'bench',
+            'probability': 0.9 if blocked else 0.1,
+            'classification': 'MALICIOUS' if blocked else 'BENIGN',
+            'action': 'BLOCKED' if blocked else 'ALLOWED',
+            'client_ip': f'10.0.{random.randint(0, 255)}.{random.randint(0, 255)}'
+        })
+    return result
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent event store growth benchmark')
+    parser.add_argument('--events', type=int, default=2000000)
+    parser.add_argument('--batch', type=int, default=1000, help='Yazma turu başına event')
+    parser.add_argument('--report-every', type=int, default=500000)
+    parser.add_argument('--db', default='bench_events.db')
+    parser.add_argument('--keep', action='store_true', help='Bitince veritabanını silme')
+    args = parser.parse_args()
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    # Writer thread'i beklemeden turları doğrudan ölçmek için flush_interval büyük
+    db = EventDB(args.db, flush_interval=3600, max_pending=args.batch * 2)
+    start_ts = time.time() - args.events * 0.001
+    batch_ms = []
+    written = 0
+
+    print(f"[*] Growing {args.db} to {args.events:,} events (batch={args.batch})")
+    print(f"{'events':>12}{'batch p50 ms':>14}{'batch max ms':>14}{'latest ms':>11}"
+          f"{'since ms':>10}{'client_ip ms':>14}{'cursor ms':>11}")
+    while written < args.events:
+        count = min(args.batch, args.events - written)
+        new_events = _make_events(written + 1, count, start_ts + written * 0.001)
+        db.append(new_events)
+        batch_ms.append(_timed(db._write_pending))
+        written += count
+
+        if written % args.report_every == 0 or written == args.events:
+            batch_ms.sort()
+            mid_ts = start_ts + written * 0.0005
+            ip = new_events[0]['client_ip']
+            _, cursor = db.query(limit=100)
+            timings = [
+                _timed(lambda: db.query(limit=100)),
+                _timed(lambda: db.query(limit=100, since=mid_ts, until=mid_ts + 60)),
+                _timed(lambda: db.query(limit=100, client_ip=ip, action='BLOCKED')),
+                _timed(lambda: db.query(limit=100, cursor=cursor // 2)),
+            ]
+            print(f"{written:>12,}{batch_ms[len(batch_ms) // 2]:>14.2f}{batch_ms[-1]:>14.2f}"
+                  + ''.join(f"{t:>{w}.2f}" for t, w in zip(timings, (11, 10, 14, 11))))
+            batch_ms = []
+
+    db.close()
+    size_mb = sum(os.path.getsize(args.db + s) for s in ('', '-wal') if os.path.exists(args.db + s)) / 1e6
+    print(f"[+] Database size: {size_mb:,.0f} MB")
+    if not args.keep:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+
+
+if __name__ == '__main__':
+    main()
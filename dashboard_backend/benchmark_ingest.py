@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Ingest yük benchmark'ı: Flask (app.py) ve ASGI (asgi_app.py) karşılaştırması.
+
+--devices kadar eşzamanlı "WAF cihazı" /api/report'a (veya --batch > 1 ise
+/api/report/batch'e NDJSON) durmadan rapor gönderir. Varsayılan olarak her
+rapor firmware gibi yeni bir bağlantıyla gider (Connection: close);
+--keep-alive ile cihaz başına kalıcı bağlantı kullanılır.
+
+Sunucular bu script tarafından geçici bir veritabanıyla ayrı process olarak
+başlatılır (ASGI için uvicorn gerekir). Çalışan bir sunucuyu ölçmek için --url.
+
+Kullanım:
+    python3 benchmark_ingest.py --devices 200 --duration 10
+    python3 benchmark_ingest.py --servers asgi --devices 500 --keep-alive
+    python3 benchmark_ingest.py --url http://127.0.0.1:5000 --devices 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REQUEST_TIMEOUT = 10.0
+
+SERVER_COMMANDS = {
+    'flask': lambda port: [sys.executable, '-c',
+                           f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"],
+    'asgi': lambda port: [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--host', '127.0.0.1',
+                          '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+}
+
+EVENT = {'method': 'GET', 'path': '/index.html', 'query': 'id=1', 'user_agent': 'Mozilla/5.0',
+         'probability': 0.0123, 'classification': 'BENIGN', 'action': 'ALLOWED',
+         'client_ip': '192.168.1.23'}
+
+
+def _request_bytes(host, port, batch, keep_alive):
+    if batch > 1:
+        path, content_type = '/api/report/batch', 'application/x-ndjson'
+        body = ''.join(json.dumps(EVENT) + '\n' for _ in range(batch)).encode()
+    else:
+        path, content_type = '/api/report', 'application/json'
+        body = json.dumps(EVENT).encode()
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+async def _read_response(reader):
+    """
+    Gövde Content-Length kadar okunur.
+    Returns: (HTTP status, sunucu bağlantıyı kapatıyor mu)
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split()[1])
+    length = 0
+    close = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            close = 'close' in value.lower()
+    if length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def _device(host, port, payload, keep_alive, deadline, latencies, counts):
+    conn = None
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if conn is None:
+                conn = await asyncio.open_connection(host, port)
+            reader, writer = conn
+            writer.write(payload)
+            await writer.drain()
+            status, close = await asyncio.wait_for(_read_response(reader), REQUEST_TIMEOUT)
+            # Sunucu keep-alive desteklemiyorsa (Werkzeug dev server) yeniden bağlan
+            if close or not keep_alive:
+                writer.close()
+                conn = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError,
+                ValueError, IndexError):
+            counts['errors'] += 1
+            if conn is not None:
+                conn[1].close()
+                conn = None
+            await asyncio.sleep(0.01)
+            continue
+        latencies.append(time.perf_counter() - start)
+        counts[status] = counts.get(status, 0) + 1
+    if conn is not None:
+        conn[1].close()
+
+
+async def run_load(url, devices, duration, batch, keep_alive):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    payload = _request_bytes(host, port, batch, keep_alive)
+    latencies = []
+    counts = {'errors': 0}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[_device(host, port, payload, keep_alive, deadline, latencies, counts)
+                           for _ in range(devices)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ok = counts.get(200, 0)
+
+    def pct(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    return {
+        'requests_per_s': len(latencies) / elapsed,
+        'events_per_s': ok * batch / elapsed,
+        'p50_ms': pct(0.50),
+        'p99_ms': pct(0.99),
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'ok': ok,
+        'other': {k: v for k, v in counts.items() if k not in (200, 'errors') and v},
+        'errors': counts['errors'],
+    }
+
+
+def _wait_ready(url, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + '/api/health', timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _print_result(name, result):
+    extra = ''
+    if result['other']:
+        extra += f" status={result['other']}"
+    if result['errors']:
+        extra += f" errors={result['errors']}"
+    print(f"{name:<8}{result['requests_per_s']:>12,.0f}{result['events_per_s']:>12,.0f}"
+          f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['max_ms']:>10.1f}{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard ingest load benchmark (Flask vs ASGI)')
+    parser.add_argument('--servers', default='flask,asgi', help='Başlatılacak sunucular')
+    parser.add_argument('--url', help='Sunucu başlatmadan bu adresi ölç')
+    parser.add_argument('--port', type=int, default=5600)
+    parser.add_argument('--devices', type=int, default=200, help='Eşzamanlı cihaz sayısı')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--batch', type=int, default=1, help='İstek başına event (>1: /api/report/batch)')
+    parser.add_argument('--keep-alive', action='store_true', help='Cihaz başına kalıcı bağlantı')
+    args = parser.parse_args()
+
+    print(f"[*] devices={args.devices} batch={args.batch} keep_alive={args.keep_alive} "
+          f"duration={args.duration}s cpus={os.cpu_count()}")
+    print(f"{'server':<8}{'req/s':>12}{'events/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+
+    if args.url:
+        _print_result('target', asyncio.run(run_load(args.url.rstrip('/'), args.devices,
+                                                     args.duration, args.batch, args.keep_alive)))
+        return
+
+    for offset, name in enumerate(s.strip() for s in args.servers.split(',')):
+        port = args.port + offset
+        url = f'http://127.0.0.1:{port}'
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DASHBOARD_DB_PATH=os.path.join(tmp, 'events.db'))
+            server = subprocess.Popen(SERVER_COMMANDS[name](port), cwd=HERE, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                if not _wait_ready(url):
+                    print(f"[!] {name} server did not start on port {port}")
+                    continue
+                _print_result(name, asyncio.run(run_load(url, args.devices, args.duration,
+                                                         args.batch, args.keep_alive)))
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Rapor formatı benchmark'ı: NDJSON vs kompakt ikili format.
+
+Aynı event'ler iki formatta kodlanır; event başına bayt ve sunucu tarafı decode
+süresi (parse_batch_body + build_batch vs binary_event_count + decode_binary_batch)
+ölçülür.
+
+Kullanım:
+    python3 benchmark_report_format.py --batch 8
+    python3 benchmark_report_format.py --batch 100 --rounds 2000
+"""
+import argparse
+import json
+import time
+
+from reports import (batch_response, binary_event_count, build_batch, decode_binary_batch,
+                     encode_binary_batch, parse_batch_body)
+
+PATHS = ['/index.html', '/api/v1/users', '/search', '/login.php', '/static/app.js']
+QUERIES = ['', 'id=1', 'q=shoes&page=2', "id=1' OR '1'='1", 'file=../../etc/passwd']
+USER_AGENTS = ['Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+               'curl/8.4.0', 'sqlmap/1.7.2#stable (https://sqlmap.org)']
+
+
+def make_events(n):
+    events = []
+    for i in range(n):
+        malicious = i % 4 == 0
+        events.append({
+            'method': 'POST' if i % 3 == 0 else 'GET',
+            'path': PATHS[i % len(PATHS)],
+            'query': QUERIES[i % len(QUERIES)],
+            'user_agent': USER_AGENTS[i % len(USER_AGENTS)],
+            'probability': 0.9731 if malicious else 0.0123,
+            'classification': 'MALICIOUS' if malicious else 'BENIGN',
+            'action': 'BLOCKED' if malicious else 'ALLOWED',
+            'client_ip': f'192.168.1.{i % 250 + 1}'
+        })
+    return events
+
+
+def decode_ndjson(body):
+    items = parse_batch_body(body.decode('utf-8'), 'application/x-ndjson')
+    new_events, errors = build_batch(items, '10.0.0.2', 'now')
+    return batch_response(len(items), new_events, errors, 1, len(new_events))
+
+
+def decode_binary(body):
+    count = binary_event_count(body)
+    new_events, errors = decode_binary_batch(body, count, '10.0.0.2', 'now')
+    return batch_response(count, new_events, errors, 1, len(new_events))
+
+
+def measure(decode, body, rounds):
+    decode(body)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode(body)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NDJSON vs binary report format benchmark')
+    parser.add_argument('--batch', type=int, default=8, help='Rapor başına event')
+    parser.add_argument('--rounds', type=int, default=5000)
+    args = parser.parse_args()
+
+    events = make_events(args.batch)
+    bodies = {
+        'ndjson': (decode_ndjson, ''.join(json.dumps(e) + '\n' for e in events).encode('utf-8')),
+        'binary': (decode_binary, encode_binary_batch(events)),
+    }
+
+    print(f"[*] batch={args.batch} rounds={args.rounds}")
+    print(f"{'format':<8}{'bytes/req':>11}{'bytes/ev':>10}{'decode µs/ev':>14}{'events/s':>12}")
+    for name, (decode, body) in bodies.items():
+        elapsed = measure(decode, body, args.rounds)
+        per_event = elapsed / (args.rounds * args.batch)
+        print(f"{name:<8}{len(body):>11,}{len(body) / args.batch:>10.1f}"
+              f"{per_event * 1e6:>14.2f}{1 / per_event:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
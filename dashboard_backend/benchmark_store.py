@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Event store eşzamanlılık benchmark'ı: ingest ve okuma throughput'u.
+
+Aynı iş yükünü iki store üzerinde çalıştırır:
+- legacy:  deque(maxlen) + tek global lock, okuma list(events)[:limit] kopyası
+- sharded: EventRing (lock'suz okuma) + ShardedStats (thread başına shard)
+
+Writer thread'leri apply_events eşdeğerini batch'lerle çağırır, reader
+thread'leri /api/events (limit) ve /api/stats eşdeğerlerini sırayla çağırır.
+HTTP/JSON maliyeti dahil değildir; yalnızca store katmanı ölçülür.
+
+Kullanım:
+    python3 benchmark_store.py --writers 4 --readers 4 --duration 3
+    python3 benchmark_store.py --readers 8 --read-rate 20   # dashboard polling'i gibi
+"""
+import argparse
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from event_store import EventRing, ShardedStats
+
+
+class LegacyStore:
+    """app.py'nin önceki hâli: deque + global lock"""
+
+    def __init__(self, capacity):
+        self.events = deque(maxlen=capacity)
+        self.stats = {'total_requests': 0, 'blocked_requests': 0, 'allowed_requests': 0,
+                      'last_updated': None, 'block_rate': 0.0}
+        self.lock = threading.Lock()
+
+    def apply(self, new_events, blocked, allowed):
+        with self.lock:
+            first_id = self.stats['total_requests'] + 1
+            for i, event in enumerate(new_events):
+                event['id'] = first_id + i
+                self.events.appendleft(event)
+            self.stats['total_requests'] += len(new_events)
+            self.stats['blocked_requests'] += blocked
+            self.stats['allowed_requests'] += allowed
+            self.stats['block_rate'] = self.stats['blocked_requests'] / self.stats['total_requests'] * 100
+            self.stats['last_updated'] = datetime.now().isoformat()
+
+    def latest(self, limit):
+        with self.lock:
+            return list(self.events)[:limit]
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+class ShardedStore:
+    """app.py'nin şimdiki hâli: EventRing + ShardedStats"""
+
+    def __init__(self, capacity):
+        self.events = EventRing(capacity)
+        self.stats = ShardedStats()
+
+    def apply(self, new_events, blocked, allowed):
+        self.events.extend(new_events)
+        self.stats.add(len(new_events), blocked, allowed)
+
+    def latest(self, limit):
+        return self.events.latest(limit)
+
+    def snapshot(self):
+        return self.stats.snapshot()
+
+
+def _make_batch(size):
+    return [{'method': 'GET', 'path': '/index.html', 'query': '', 'user_agent': 'bench',
+             'probability': 0.1, 'classification': 'BENIGN',
+             'action': 'BLOCKED' if i % 4 == 0 else 'ALLOWED', 'client_ip': '10.0.0.1'}
+            for i in range(size)]
+
+
+def run(store, writers, readers, duration, batch_size, limit, read_rate):
+    stop = threading.Event()
+    ingested = [0] * writers
+    latencies = [[] for _ in range(readers)]
+    interval = 1.0 / read_rate if read_rate > 0 else 0.0
+
+    def writer(slot):
+        template = _make_batch(batch_size)
+        blocked = sum(1 for e in template if e['action'] == 'BLOCKED')
+        allowed = batch_size - blocked
+        while not stop.is_set():
+            store.apply([dict(e) for e in template], blocked, allowed)
+            ingested[slot] += batch_size
+
+    def reader(slot):
+        samples = latencies[slot]
+        next_read = time.perf_counter()
+        while not stop.is_set():
+            start = time.perf_counter()
+            store.latest(limit)
+            store.snapshot()
+            samples.append(time.perf_counter() - start)
+            if interval:
+                next_read += interval
+                stop.wait(max(0.0, next_read - time.perf_counter()))
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    samples = sorted(x for reader_samples in latencies for x in reader_samples)
+    p50 = samples[len(samples) // 2] * 1e6 if samples else 0.0
+    p99 = samples[int(len(samples) * 0.99)] * 1e6 if samples else 0.0
+    return {
+        'ingest_per_s': sum(ingested) / duration,
+        'reads_per_s': len(samples) / duration,
+        'read_p50_us': p50,
+        'read_p99_us': p99,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard event store concurrency benchmark')
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=3.0, help='Senaryo başına saniye')
+    parser.add_argument('--batch', type=int, default=1, help='Writer başına batch boyutu')
+    parser.add_argument('--limit', type=int, default=100, help='/api/events limit')
+    parser.add_argument('--capacity', type=int, default=1000)
+    parser.add_argument('--read-rate', type=float, default=0,
+                        help='Reader başına saniyedeki okuma (0 = durmadan oku)')
+    args = parser.parse_args()
+
+    print(f"[*] writers={args.writers} readers={args.readers} batch={args.batch} "
+          f"limit={args.limit} capacity={args.capacity} read_rate={args.read_rate or 'max'} "
+          f"duration={args.duration}s")
+    print(f"{'store':<10}{'ingest ev/s':>14}{'reads/s':>12}{'read p50 µs':>13}{'read p99 µs':>13}")
+    for name, cls in (('legacy', LegacyStore), ('sharded', ShardedStore)):
+        result = run(cls(args.capacity), args.writers, args.readers, args.duration,
+                     args.batch, args.limit, args.read_rate)
+        print(f"{name:<10}{result['ingest_per_s']:>14,.0f}{result['reads_per_s']:>12,.0f}"
+              f"{result['read_p50_us']:>13.1f}{result['read_p99_us']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
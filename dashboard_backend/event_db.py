@@ -0,0 +1,222 @@
+"""
+Dashboard event'leri için kalıcı SQLite (WAL) store.
+
+- Ingest yolu yalnızca kuyruğa ekler; arka plandaki writer thread kuyruğu
+  FLUSH_INTERVAL'da bir (veya FLUSH_BATCH dolunca) tek transaction'la yazar.
+- id'ler uygulamada atanır (EventRing) ve INTEGER PRIMARY KEY (rowid) olarak
+  saklanır; artan id'lerle yazmak B-tree'nin sonuna eklemek demektir, store
+  büyüdükçe ingest maliyeti sabit kalır.
+- Sorgular rowid sırasıyla (yeniden eskiye) döner; since/until ts index'iyle
+  rowid aralığına çevrilir, client_ip / action kendi index'lerini kullanır.
+  Cursor pagination: bir sonraki sayfa için `cursor` = son sayfadaki en küçük id.
+
+Tek process'in yazacağı varsayılır (id'ler process içinde atanır).
+"""
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+
+FLUSH_INTERVAL = 0.5     # saniye
+FLUSH_BATCH = 1000       # bu kadar event birikince beklemeden yaz
+MAX_PENDING = 100000     # writer geride kalırsa bundan fazlası düşürülür
+MAX_QUERY_LIMIT = 1000
+
+COLUMNS = ('id', 'timestamp', 'esp_ip', 'method', 'path', 'query', 'user_agent',
+           'probability', 'classification', 'action', 'client_ip')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    esp_ip TEXT,
+    method TEXT,
+    path TEXT,
+    query TEXT,
+    user_agent TEXT,
+    probability REAL,
+    classification TEXT,
+    action TEXT,
+    client_ip TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS idx_events_client_ip ON events(client_ip);
+CREATE INDEX IF NOT EXISTS idx_events_action ON events(action);
+'''
+
+
+def parse_time(value):
+    """Epoch saniye veya ISO 8601 (event timestamp'leri gibi yerel saat) -> epoch"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class EventDB:
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, flush_batch=FLUSH_BATCH,
+                 max_pending=MAX_PENDING):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.max_pending = max_pending
+        self.written = 0
+        self.dropped = 0
+
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._local = threading.local()
+        self._pending = deque()
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._generation = 0     # tamamlanan yazma turu sayısı
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='event-db-writer', daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self):
+        """Thread başına okuma bağlantısı (WAL: okuyucular writer'ı beklemez)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def max_id(self):
+        row = self._writer.execute('SELECT MAX(id) FROM events').fetchone()
+        return row[0] or 0
+
+    def append(self, new_events):
+        """Event'leri yazma kuyruğuna ekle (bloklamaz)"""
+        with self._pending_lock:
+            if self._pending_count >= self.max_pending:
+                self.dropped += len(new_events)
+                return
+            self._pending.append(new_events)
+            self._pending_count += len(new_events)
+            full = self._pending_count >= self.flush_batch
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            closed = self._closed
+            self._write_pending()
+            with self._flushed:
+                self._generation += 1
+                self._flushed.notify_all()
+            if closed:
+                return
+
+    def _write_pending(self):
+        with self._pending_lock:
+            batches = list(self._pending)
+            self._pending.clear()
+            self._pending_count = 0
+
+        rows = []
+        for batch in batches:
+            for e in batch:
+                rows.append((e['id'], parse_time(e['timestamp']), e['timestamp'], e['esp_ip'],
+                             e['method'], e['path'], e['query'], e['user_agent'],
+                             e['probability'], e['classification'], e['action'], e['client_ip']))
+        if not rows:
+            return
+        try:
+            with self._writer:
+                self._writer.executemany(
+                    'INSERT OR REPLACE INTO events (id, ts, timestamp, esp_ip, method, path, query, '
+                    'user_agent, probability, classification, action, client_ip) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            self.dropped += len(rows)
+            print(f"[ERROR] Event DB write failed: {e}")
+
+    def flush(self, timeout=5.0):
+        """Çağrı anında kuyrukta olan event'ler yazılana kadar bekle"""
+        with self._flushed:
+            # Devam eden tur çağrıdan önce başlamış olabilir; bir tam tur daha bekle
+            target = self._generation + 2
+            self._wakeup.set()
+            self._flushed.wait_for(lambda: self._generation >= target or self._closed, timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._writer.close()
+
+    def _id_at(self, ts):
+        """ts'ye eşit/sonraki ilk event'in id'si (ts index'i üzerinden), yoksa None"""
+        row = self._reader().execute(
+            'SELECT id FROM events WHERE ts >= ? ORDER BY ts LIMIT 1', (ts,)).fetchone()
+        return row[0] if row else None
+
+    def query(self, limit=100, since=None, until=None, client_ip=None, action=None, cursor=None):
+        """
+        Filtrelere uyan event'ler, yeniden eskiye (id azalan).
+        since/until: epoch saniye ([since, until) aralığı); cursor: id < cursor
+        Returns: (events, next_cursor veya None)
+        """
+        limit = max(1, min(limit, MAX_QUERY_LIMIT))
+        where, params = [], []
+
+        # Zaman aralığını rowid aralığına çevir; ts koşulu kesinlik için kalır
+        # (+ts: planner'ın sıralama için ts index'ini seçmesini engeller)
+        if since is not None:
+            lower = self._id_at(since)
+            if lower is None:
+                return [], None
+            where.append('id >= ? AND +ts >= ?')
+            params += [lower, since]
+        if until is not None:
+            upper = self._id_at(until)
+            if upper is not None:
+                cursor = upper if cursor is None else min(cursor, upper)
+            where.append('+ts < ?')
+            params.append(until)
+        if cursor is not None:
+            where.append('id < ?')
+            params.append(cursor)
+        if client_ip is not None:
+            where.append('client_ip = ?')
+            params.append(client_ip)
+        if action is not None:
+            # action az seçicidir; client_ip de varsa onun index'i kullanılsın
+            where.append('+action = ?' if client_ip is not None else 'action = ?')
+            params.append(action)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM events"
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+
+        rows = self._reader().execute(sql, params).fetchall()
+        events = [dict(zip(COLUMNS, row)) for row in rows]
+        next_cursor = events[-1]['id'] if len(events) == limit else None
+        return events, next_cursor
+
+    def purge(self):
+        """Tüm kalıcı event'leri sil"""
+        self.flush()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM events')
+        finally:
+            conn.close()
@@ -0,0 +1,147 @@
+"""
+Dashboard için eşzamanlı bellek içi event store ve istatistik sayaçları.
+
+- EventRing: sabit kapasiteli ring buffer. Yazarlar kısa bir lock altında slot
+  yazar; okuyucular lock almadan yalnızca istenen `limit` kadar slotu dilimler
+  (tüm buffer kopyalanmaz).
+- ShardedStats: thread başına bir shard'a yazılan sayaçlar; yazarlar birbirini
+  beklemez, okuma shard'ları lock almadan toplar.
+"""
+import itertools
+import threading
+from datetime import datetime
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_SHARDS = 8
+
+
+class EventRing:
+    """
+    Son `capacity` event'i tutan ring buffer (seq -> slot: seq % capacity).
+
+    Yazar önce `_reserved`'ı (yazılacak son seq + 1) günceller, slotları yazar,
+    sonra `_head`'i yayınlar. Okuyucu head'i okur, slotları dilimler ve ardından
+    `_reserved`'a bakar: dilimleme sırasında üzerine yazılmış olabilecek en eski
+    slotlar (seq < reserved - capacity) sonuçtan atılır. Böylece okuma tutarlı
+    kalır ve yazarları hiç bekletmez.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, first_id=1):
+        if capacity < 1:
+            raise ValueError('capacity must be >= 1')
+        self.capacity = capacity
+        self.first_id = first_id  # seq 0'ın id'si (kalıcı store'daki son id + 1)
+        self._slots = [None] * capacity
+        self._head = 0      # yayınlanmış son seq + 1
+        self._reserved = 0  # yazılmakta olan son seq + 1
+        self._start = 0     # son clear() anındaki seq (öncesi okunmaz)
+        self._write_lock = threading.Lock()
+
+    def __len__(self):
+        head = self._head
+        return min(head - self._start, self.capacity)
+
+    def extend(self, new_events, assign_ids=True):
+        """
+        Event'leri sırayla ekle ve artan id ata (clear() id'leri sıfırlamaz).
+        assign_ids=False: id'ler çağıran tarafından (aynı sırayla) önceden atanmıştır.
+        Returns: (ilk event id, son event id)
+        """
+        count = len(new_events)
+        capacity = self.capacity
+        slots = self._slots
+        with self._write_lock:
+            head = self._head
+            first_id = self.first_id + head
+            self._reserved = head + count
+            for i, event in enumerate(new_events):
+                if assign_ids:
+                    event['id'] = first_id + i
+                slots[(head + i) % capacity] = event
+            self._head = head + count
+        return first_id, first_id + count - 1
+
+    def latest(self, limit):
+        """En yeni `limit` event (yeniden eskiye), lock almadan."""
+        capacity = self.capacity
+        head = self._head
+        lower = max(head - min(limit, capacity), self._start)
+        if lower >= head:
+            return []
+
+        slots = self._slots
+        lo, hi = lower % capacity, head % capacity
+        if lo < hi:
+            window = slots[lo:hi]
+        else:
+            window = slots[lo:] + slots[:hi]
+
+        # Dilimleme sırasında yazar ring'i döndürdüyse en eski kısım geçersizdir
+        overwritten = self._reserved - capacity - lower
+        if overwritten > 0:
+            window = window[overwritten:]
+        window.reverse()
+        return window
+
+    def clear(self):
+        with self._write_lock:
+            self._start = self._head
+
+
+class _Shard:
+    __slots__ = ('lock', 'counts')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = (0, 0, 0)  # (total, blocked, allowed); tek atamayla değişir
+
+
+class ShardedStats:
+    """
+    total/blocked/allowed sayaçları; her thread kendine atanmış shard'a yazar
+    (thread sayısı shard sayısını aşarsa shard lock'u paylaşımı korur).
+    Her shard sayaçlarını değişmez bir tuple olarak yayınladığı için
+    snapshot() lock almadan tutarlı değerler toplar.
+    """
+
+    def __init__(self, shards=DEFAULT_SHARDS):
+        self._shards = [_Shard() for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+        self._last_updated = None
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._shards[next(self._next_shard) % len(self._shards)]
+            self._local.shard = shard
+        return shard
+
+    def add(self, total, blocked, allowed):
+        shard = self._shard()
+        with shard.lock:
+            t, b, a = shard.counts
+            shard.counts = (t + total, b + blocked, a + allowed)
+        self._last_updated = datetime.now()
+
+    def snapshot(self):
+        """/api/stats formatında istatistikler"""
+        total = blocked = allowed = 0
+        for shard in self._shards:
+            t, b, a = shard.counts
+            total += t
+            blocked += b
+            allowed += a
+        return {
+            'total_requests': total,
+            'blocked_requests': blocked,
+            'allowed_requests': allowed,
+            'last_updated': self._last_updated.isoformat() if self._last_updated else None,
+            'block_rate': (blocked / total) * 100 if total > 0 else 0.0
+        }
+
+    def reset(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.counts = (0, 0, 0)
+        self._last_updated = datetime.now()
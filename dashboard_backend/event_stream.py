@@ -0,0 +1,164 @@
+"""
+Dashboard için Server-Sent Events (SSE) yayını.
+
+Ingest tarafı StreamHub.publish() ile yeni event'leri tüm abonelere bırakır;
+publish hiçbir zaman bloklamaz. Her abonenin kendi sınırlı kuyruğu vardır:
+
+- Yavaş istemcide kuyruk MAX_PENDING'i aşarsa en eski event'ler atılır ve
+  istemciye kaç event kaçırdığı `gap` mesajıyla bildirilir (gerekirse
+  /api/events ile tamamlar).
+- Gönderimler en fazla FLUSH_INTERVAL'da bir yapılır; aradaki event'ler tek
+  `events` mesajında, istatistikler yalnızca son hâliyle (`stats`) gider.
+- Trafik yokken HEARTBEAT_INTERVAL'da bir yorum satırı gönderilir (proxy'lerin
+  bağlantıyı kapatmaması için).
+
+Mesaj türleri: snapshot, events, stats, gap, clear.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+MAX_PENDING = 500
+FLUSH_INTERVAL = 0.25
+HEARTBEAT_INTERVAL = 15.0
+MAX_SUBSCRIBERS = 100
+
+
+def format_sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class _Subscriber:
+    def __init__(self, max_pending):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.stats = None
+        self.cleared = False
+
+    def push(self, new_events, stats):
+        with self.lock:
+            overflow = len(self.pending) + len(new_events) - self.pending.maxlen
+            if overflow > 0:
+                self.dropped += min(overflow, len(self.pending) + len(new_events))
+            self.pending.extend(new_events)
+            if stats is not None:
+                self.stats = stats
+        self.wakeup.set()
+
+    def take(self):
+        """Returns: (event listesi, son stats veya None, kaçırılan sayı, clear geldi mi)"""
+        with self.lock:
+            new_events = list(self.pending)
+            self.pending.clear()
+            result = (new_events, self.stats, self.dropped, self.cleared)
+            self.stats = None
+            self.dropped = 0
+            self.cleared = False
+        return result
+
+
+class StreamHub:
+    """
+    Abonelere event / istatistik dağıtımı.
+
+        hub = StreamHub()
+        hub.publish(new_events, stats_snapshot)     # ingest
+        Response(hub.stream(initial), ...)          # SSE yanıt gövdesi
+    """
+
+    def __init__(self, max_pending=MAX_PENDING, flush_interval=FLUSH_INTERVAL,
+                 heartbeat_interval=HEARTBEAT_INTERVAL, max_subscribers=MAX_SUBSCRIBERS):
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_subscribers = max_subscribers
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def publish(self, new_events, stats=None):
+        subscribers = self._subscribers  # kopya-üzerine-yaz liste, lock gerekmez
+        for subscriber in subscribers:
+            subscriber.push(new_events, stats)
+
+    def publish_clear(self, stats):
+        for subscriber in self._subscribers:
+            with subscriber.lock:
+                subscriber.pending.clear()
+                subscriber.dropped = 0
+                subscriber.cleared = True
+                subscriber.stats = stats
+            subscriber.wakeup.set()
+
+    def subscribe(self):
+        """Returns: _Subscriber veya None (abone sınırı dolu)"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscriber = _Subscriber(self.max_pending)
+            self._subscribers = self._subscribers + [subscriber]
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def stream(self, initial):
+        """
+        SSE yanıt gövdesi üreteci. Abonelik üreteç başlayınca açılır, istemci
+        bağlantıyı kapatınca (GeneratorExit) silinir.
+
+        initial(): abone olunduktan sonra çağrılır ->
+            (ilk mesajlar, bu mesajlarda gönderilen event id'leri)
+        id'ler ilk gönderimde atlanır (abone olma ile snapshot arasında yayınlanan
+        event'ler iki kez gitmesin).
+        """
+        subscriber = self.subscribe()
+        if subscriber is None:
+            yield format_sse('error', {'message': 'too many stream clients'})
+            return
+        try:
+            chunks, skip_ids = initial()
+            yield 'retry: 2000\n\n'
+            for chunk in chunks:
+                yield chunk
+            last_sent = time.monotonic()
+            while True:
+                if not subscriber.wakeup.wait(self.heartbeat_interval):
+                    yield ': keep-alive\n\n'
+                    continue
+
+                # Coalescing: gönderimler arasında en az flush_interval bekle
+                wait = self.flush_interval - (time.monotonic() - last_sent)
+                if wait > 0:
+                    time.sleep(wait)
+                subscriber.wakeup.clear()
+                new_events, stats, dropped, cleared = subscriber.take()
+                last_sent = time.monotonic()
+                if skip_ids:
+                    new_events = [e for e in new_events if e['id'] not in skip_ids]
+                    skip_ids = ()
+
+                if cleared:
+                    yield format_sse('clear', {})
+                if dropped:
+                    yield format_sse('gap', {'dropped': dropped})
+                if new_events:
+                    # Yeniden eskiye (/api/events ile aynı sıra)
+                    new_events.reverse()
+                    yield format_sse('events', new_events,
+                                     event_id=max(e['id'] for e in new_events))
+                if stats is not None:
+                    yield format_sse('stats', stats)
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,251 @@
+"""
+WAF rapor gövdelerinin framework'ten bağımsız parse'ı.
+
+Flask uygulaması (app.py) ve ASGI ingest servisi (asgi_app.py) aynı sözleşmeyi
+bu fonksiyonlarla uygular.
+
+Kompakt ikili rapor formatı (firmware REPORT_HTTP_BINARY / REPORT_UDP_BINARY;
+/api/report/binary gövdesi veya tek UDP datagramı), tüm sayılar little-endian:
+
+    Başlık (6 bayt):  'WR' | versiyon u8 | ayrılmış u8 | event sayısı u16
+    Kayıt (13 bayt + string'ler):
+        flags u8 (bit0: BLOCKED, bit1: MALICIOUS) | probability u16 (p * 65535)
+        client IPv4 (4 bayt) | method_len u8 | path_len u16 | query_len u16 | ua_len u8
+        method | path | query | user_agent (UTF-8, sonlandırıcısız)
+"""
+import json
+import math
+import socket
+import struct
+
+# Tek batch'te kabul edilen maksimum event sayısı
+MAX_BATCH_EVENTS = 1000
+
+EVENT_QUERY_KEYS = ('since', 'until', 'client_ip', 'action', 'cursor')
+
+BINARY_MAGIC = b'WR'
+BINARY_VERSION = 1
+BINARY_CONTENT_TYPE = 'application/x-waf-report'
+FLAG_BLOCKED = 0x01
+FLAG_MALICIOUS = 0x02
+
+_BINARY_HEADER = struct.Struct('<2sBxH')
+_BINARY_RECORD = struct.Struct('<BH4sBHHB')
+
+
+def _text(data, key, default):
+    """String alan; JSON'daki sayı/liste vb. değerler str'ye çevrilir, null -> default"""
+    value = data.get(key)
+    if value is None:
+        return default
+    return value if isinstance(value, str) else str(value)
+
+
+def parse_event(data, esp_ip, timestamp):
+    """
+    Gelen JSON objesinden event oluştur (id, store'a eklenirken atanır).
+    Tüm doğrulama burada yapılır: store / istatistik / zaman serisi / SQLite
+    event'i alan tipleri kesin (str, sonlu float) varsayarak işler.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('event must be a JSON object')
+    try:
+        # Çok büyük JSON tamsayıları float()'ta OverflowError verir
+        probability = float(data.get('probability', 0))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError('probability must be a finite number') from None
+    if not math.isfinite(probability):
+        raise ValueError('probability must be a finite number')
+    return {
+        'id': None,
+        'timestamp': timestamp,
+        'esp_ip': esp_ip,
+        'method': _text(data, 'method', 'UNKNOWN'),
+        'path': _text(data, 'path', '/'),
+        'query': _text(data, 'query', ''),
+        'user_agent': _text(data, 'user_agent', ''),
+        'probability': probability,
+        'classification': _text(data, 'classification', 'UNKNOWN'),
+        'action': _text(data, 'action', 'UNKNOWN'),  # ALLOWED or BLOCKED
+        'client_ip': _text(data, 'client_ip', 'unknown')
+    }
+
+
+def parse_batch_body(body, content_type):
+    """
+    Batch gövdesini item listesine çevir: JSON dizi, {"events": [...]} veya NDJSON.
+    NDJSON'da bozuk satır yalnızca kendisini geçersiz kılar (None + hata mesajı).
+    Returns: [(item veya None, hata mesajı veya None), ...]
+    """
+    content_type = (content_type or '').lower()
+
+    if content_type != 'application/x-ndjson':
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if isinstance(data, dict) and isinstance(data.get('events'), list):
+            data = data['events']
+        if isinstance(data, list):
+            return [(item, None) for item in data]
+        if content_type == 'application/json':
+            raise ValueError('body must be a JSON array of events')
+
+    items = []
+    for line in body.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            items.append((json.loads(line), None))
+        except ValueError as e:
+            items.append((None, f'invalid JSON: {e}'))
+    return items
+
+
+def build_batch(items, esp_ip, timestamp):
+    """
+    Item'lardan event'leri oluştur; geçersizler index'leriyle hataya yazılır.
+    Returns: (event listesi, [{'index', 'message'}, ...])
+    """
+    new_events = []
+    errors = []
+    for index, (item, error) in enumerate(items):
+        if error is None:
+            try:
+                new_events.append(parse_event(item, esp_ip, timestamp))
+                continue
+            except (TypeError, ValueError) as e:
+                error = str(e)
+        errors.append({'index': index, 'message': error})
+    return new_events, errors
+
+
+def binary_event_count(body):
+    """
+    İkili rapor başlığını doğrula.
+    Returns: başlıktaki event sayısı (geçersiz başlıkta ValueError)
+    """
+    if len(body) < _BINARY_HEADER.size:
+        raise ValueError('binary report too short')
+    magic, version, count = _BINARY_HEADER.unpack_from(body)
+    if magic != BINARY_MAGIC:
+        raise ValueError('not a binary WAF report (bad magic)')
+    if version != BINARY_VERSION:
+        raise ValueError(f'unsupported binary report version {version}')
+    return count
+
+
+def decode_binary_batch(body, count, esp_ip, timestamp):
+    """
+    İkili rapordaki `count` kaydı doğrudan event'e çevir (ara dict / JSON yok).
+    Kesik bir kayıttan sonra çerçeve kaybolur; o ve sonraki kayıtlar hataya yazılır.
+    Returns: (event listesi, [{'index', 'message'}, ...])
+    """
+    new_events = []
+    size = len(body)
+    offset = _BINARY_HEADER.size
+    unpack_record = _BINARY_RECORD.unpack_from
+    record_size = _BINARY_RECORD.size
+    for index in range(count):
+        if offset + record_size > size:
+            break
+        flags, probability, ip, method_len, path_len, query_len, ua_len = unpack_record(body, offset)
+        offset += record_size
+        if offset + method_len + path_len + query_len + ua_len > size:
+            break
+        method = str(body[offset:offset + method_len], 'utf-8', 'replace')
+        offset += method_len
+        path = str(body[offset:offset + path_len], 'utf-8', 'replace')
+        offset += path_len
+        query = str(body[offset:offset + query_len], 'utf-8', 'replace')
+        offset += query_len
+        user_agent = str(body[offset:offset + ua_len], 'utf-8', 'replace')
+        offset += ua_len
+        new_events.append({
+            'id': None,
+            'timestamp': timestamp,
+            'esp_ip': esp_ip,
+            'method': method,
+            'path': path,
+            'query': query,
+            'user_agent': user_agent,
+            'probability': round(probability / 65535, 4),
+            'classification': 'MALICIOUS' if flags & FLAG_MALICIOUS else 'BENIGN',
+            'action': 'BLOCKED' if flags & FLAG_BLOCKED else 'ALLOWED',
+            'client_ip': socket.inet_ntoa(ip)
+        })
+    else:
+        return new_events, []
+    return new_events, [{'index': i, 'message': 'truncated record'} for i in range(index, count)]
+
+
+def encode_binary_batch(events):
+    """
+    Event dict'lerini ikili rapora çevir (firmware'in ürettiği format; test ve
+    benchmark için). path/query 65535, method/user_agent 255 bayta kırpılır.
+    """
+    parts = [_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(events))]
+    for e in events:
+        method = e.get('method', 'UNKNOWN').encode('utf-8')[:255]
+        path = e.get('path', '/').encode('utf-8')[:65535]
+        query = e.get('query', '').encode('utf-8')[:65535]
+        user_agent = e.get('user_agent', '').encode('utf-8')[:255]
+        flags = ((FLAG_BLOCKED if e.get('action') == 'BLOCKED' else 0) |
+                 (FLAG_MALICIOUS if e.get('classification') == 'MALICIOUS' else 0))
+        probability = min(max(float(e.get('probability', 0)), 0.0), 1.0)
+        try:
+            ip = socket.inet_aton(e.get('client_ip', '0.0.0.0'))
+        except OSError:
+            ip = bytes(4)
+        parts.append(_BINARY_RECORD.pack(flags, round(probability * 65535), ip, len(method),
+                                         len(path), len(query), len(user_agent)))
+        parts += (method, path, query, user_agent)
+    return b''.join(parts)
+
+
+def batch_response(total, new_events, errors, first_id, last_id):
+    """Returns: (/api/report/batch yanıt gövdesi, HTTP status); total: gelen event sayısı"""
+    return {
+        'status': 'success' if not errors else ('partial' if new_events else 'error'),
+        'accepted': len(new_events),
+        'rejected': len(errors),
+        'first_event_id': first_id,
+        'last_event_id': last_id,
+        'errors': errors
+    }, 200 if new_events or not total else 400
+
+
+def int_arg(args, name, default=None):
+    """Sayısal query parametresi; yoksa veya geçersizse default (Flask type=int gibi)"""
+    try:
+        return int(args[name])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+def event_query(args, parse_time):
+    """
+    /api/events filtre parametreleri -> EventDB.query() argümanları.
+    Filtre yoksa None (canlı görünüm). Geçersiz zaman ValueError fırlatır.
+    """
+    if not any(key in args for key in EVENT_QUERY_KEYS):
+        return None
+    return {
+        'limit': int_arg(args, 'limit', 100),
+        'since': parse_time(args['since']) if 'since' in args else None,
+        'until': parse_time(args['until']) if 'until' in args else None,
+        'client_ip': args.get('client_ip'),
+        'action': args.get('action'),
+        'cursor': int_arg(args, 'cursor')
+    }
+
+
+def live_events_response(ring, limit):
+    """/api/events canlı görünüm yanıtı (bellekteki ring buffer'dan)"""
+    result = ring.latest(max(limit, 0))
+    return {
+        'events': result,
+        'count': len(ring),
+        'next_cursor': result[-1]['id'] if result and len(result) == limit else None
+    }
@@ -0,0 +1,38 @@
+"""
+reports.py parse / doğrulama testleri (python -m pytest dashboard_backend).
+"""
+import json
+
+import pytest
+
+from reports import build_batch, parse_batch_body, parse_event
+
+HUGE_INT = int('9' * 401)
+
+
+@pytest.mark.parametrize('probability', [HUGE_INT, -HUGE_INT, 'nan', 'inf', [0.5], {'p': 1}, 'abc'])
+def test_parse_event_rejects_invalid_probability(probability):
+    with pytest.raises(ValueError, match='probability must be a finite number'):
+        parse_event({'probability': probability}, '10.0.0.2', 'now')
+
+
+def test_parse_event_accepts_int_probability():
+    event = parse_event({'probability': 1, 'path': 7}, '10.0.0.2', 'now')
+    assert event['probability'] == 1.0
+    assert event['path'] == '7'
+
+
+def test_build_batch_reports_overflow_as_item_error():
+    body = '[{"probability": 0.5}, {"probability": %d}]' % HUGE_INT
+    items = parse_batch_body(body, 'application/json')
+    new_events, errors = build_batch(items, '10.0.0.2', 'now')
+    assert [e['probability'] for e in new_events] == [0.5]
+    assert errors == [{'index': 1, 'message': 'probability must be a finite number'}]
+
+
+def test_build_batch_ndjson_overflow():
+    body = json.dumps({'probability': 0.1}) + '\n' + '{"probability": %d}\n' % HUGE_INT
+    new_events, errors = build_batch(parse_batch_body(body, 'application/x-ndjson'),
+                                     '10.0.0.2', 'now')
+    assert len(new_events) == 1
+    assert errors[0]['index'] == 1
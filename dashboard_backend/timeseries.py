@@ -0,0 +1,146 @@
+"""
+Dashboard grafikleri için önceden toplanmış zaman bucket'ları.
+
+Her çözünürlük (saniye / dakika) sabit sayıda bucket'lık bir ring'dir; event'ler
+ingest sırasında ilgili bucket'a artımlı eklenir. /api/timeseries yalnızca
+istenen bucket'ları okur, event'leri yeniden taramaz.
+
+Bucket içeriği: requests, blocked, allowed, probability histogramı (10 bin),
+path ve client IP sayaçları (bucket başına en fazla MAX_KEYS anahtar; fazlası
+OTHER_KEY altında toplanır).
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROBABILITY_BINS = 10
+MAX_KEYS = 500
+OTHER_KEY = '(other)'
+
+# çözünürlük -> (bucket genişliği sn, tutulan bucket sayısı)
+RESOLUTIONS = {
+    'second': (1, 300),    # son 5 dakika
+    'minute': (60, 1440),  # son 24 saat
+}
+
+
+class _Bucket:
+    __slots__ = ('slot', 'requests', 'blocked', 'allowed', 'histogram', 'paths', 'client_ips')
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.requests = 0
+        self.blocked = 0
+        self.allowed = 0
+        self.histogram = [0] * PROBABILITY_BINS
+        self.paths = Counter()
+        self.client_ips = Counter()
+
+
+def _count(counter, key):
+    if key in counter or len(counter) < MAX_KEYS:
+        counter[key] += 1
+    else:
+        counter[OTHER_KEY] += 1
+
+
+class _Series:
+    def __init__(self, width, size):
+        self.width = width
+        self.size = size
+        self.buckets = [None] * size
+
+    def bucket(self, slot):
+        i = slot % self.size
+        b = self.buckets[i]
+        if b is None or b.slot != slot:
+            b = _Bucket(slot)
+            self.buckets[i] = b
+        return b
+
+    def get(self, slot):
+        b = self.buckets[slot % self.size]
+        return b if b is not None and b.slot == slot else None
+
+
+class TimeSeries:
+    """
+    Saniye ve dakika çözünürlüğünde artımlı metrikler.
+
+        ts = TimeSeries()
+        ts.record(events)                      # ingest, batch başına bir lock
+        ts.query('second', points=60, top=5)   # /api/timeseries
+    """
+
+    def __init__(self, resolutions=RESOLUTIONS):
+        self._series = {name: _Series(width, size) for name, (width, size) in resolutions.items()}
+        self._lock = threading.Lock()
+
+    def record(self, new_events, now=None):
+        """Aynı anda gelen event'leri (bir batch) tüm çözünürlüklere ekle"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for series in self._series.values():
+                b = series.bucket(int(now // series.width))
+                b.requests += len(new_events)
+                histogram, paths, client_ips = b.histogram, b.paths, b.client_ips
+                for e in new_events:
+                    action = e['action']
+                    if action == 'BLOCKED':
+                        b.blocked += 1
+                    elif action == 'ALLOWED':
+                        b.allowed += 1
+                    histogram[min(max(int(e['probability'] * PROBABILITY_BINS), 0),
+                                  PROBABILITY_BINS - 1)] += 1
+                    _count(paths, e['path'])
+                    _count(client_ips, e['client_ip'])
+
+    def query(self, resolution='second', points=60, top=5, now=None):
+        """
+        Son `points` bucket (eskiden yeniye, boş bucket'lar sıfır) ve pencere
+        genelindeki en sık `top` path / client IP.
+        """
+        if resolution not in self._series:
+            raise ValueError(f"unknown resolution '{resolution}' (expected: {', '.join(self._series)})")
+        series = self._series[resolution]
+        points = max(1, min(points, series.size))
+        now = time.time() if now is None else now
+        last = int(now // series.width)
+
+        buckets = []
+        paths = Counter()
+        client_ips = Counter()
+        with self._lock:
+            for slot in range(last - points + 1, last + 1):
+                b = series.get(slot)
+                start = slot * series.width
+                if b is None:
+                    buckets.append({'start': start, 'requests': 0, 'blocked': 0, 'allowed': 0,
+                                    'block_rate': 0.0, 'probability_histogram': [0] * PROBABILITY_BINS})
+                    continue
+                buckets.append({
+                    'start': start,
+                    'requests': b.requests,
+                    'blocked': b.blocked,
+                    'allowed': b.allowed,
+                    'block_rate': (b.blocked / b.requests) * 100 if b.requests else 0.0,
+                    'probability_histogram': list(b.histogram)
+                })
+                if top > 0:
+                    paths.update(b.paths)
+                    client_ips.update(b.client_ips)
+
+        return {
+            'resolution': resolution,
+            'bucket_seconds': series.width,
+            'start': datetime.fromtimestamp((last - points + 1) * series.width).isoformat(),
+            'buckets': buckets,
+            'top_paths': [{'path': k, 'count': n} for k, n in paths.most_common(top)],
+            'top_client_ips': [{'client_ip': k, 'count': n} for k, n in client_ips.most_common(top)]
+        }
+
+    def clear(self):
+        with self._lock:
+            for series in self._series.values():
+                series.buckets = [None] * series.size
@@ -0,0 +1,106 @@
+"""
+Fire-and-forget UDP rapor alıcısı.
+
+Her datagram bir ikili rapor batch'idir (format: reports.py); cihaza yanıt
+gönderilmez, bozuk datagramlar yalnızca sayılır. Kayıp kabul edilir: cihaz
+bağlantı kurmak / yanıt beklemek için bloklanmaz.
+
+    UDPReportListener   Flask uygulaması için arka plan thread'i
+    UDPReportProtocol   ASGI servisi için asyncio datagram protokolü
+"""
+import asyncio
+import socket
+import threading
+from datetime import datetime
+
+from reports import MAX_BATCH_EVENTS, binary_event_count, decode_binary_batch
+
+MAX_DATAGRAM_BYTES = 65535
+
+
+def decode_datagram(data, esp_ip):
+    """Returns: (event listesi, hatalar); geçersiz başlıkta ValueError"""
+    count = binary_event_count(data)
+    if count > MAX_BATCH_EVENTS:
+        raise ValueError(f'batch too large ({count} > {MAX_BATCH_EVENTS} events)')
+    return decode_binary_batch(data, count, esp_ip, datetime.now().isoformat())
+
+
+class _Counters:
+    def __init__(self):
+        self.datagrams = 0
+        self.events = 0
+        self.invalid = 0
+
+    def counters(self):
+        return {'datagrams': self.datagrams, 'events': self.events, 'invalid': self.invalid}
+
+    def _decode(self, data, addr):
+        self.datagrams += 1
+        try:
+            new_events, errors = decode_datagram(data, addr[0])
+        except ValueError:
+            self.invalid += 1
+            return []
+        if errors:
+            self.invalid += 1
+        self.events += len(new_events)
+        return new_events
+
+
+class UDPReportListener(_Counters):
+    """
+    Datagramları bir thread'de alıp handler(new_events) çağırır.
+
+        listener = UDPReportListener('0.0.0.0', 5001, apply_events)
+        listener.start()
+    """
+
+    def __init__(self, host, port, handler):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.handler = handler
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._sock.bind((self.host, self.port))
+        self._thread = threading.Thread(target=self._run, name='udp-reports', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                data, addr = self._sock.recvfrom(MAX_DATAGRAM_BYTES)
+            except OSError:
+                return  # close()
+            new_events = self._decode(data, addr)
+            if new_events:
+                self.handler(new_events)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+
+
+class UDPReportProtocol(_Counters, asyncio.DatagramProtocol):
+    """
+    Event loop içinde çalışır; handler(new_events) bloklamamalıdır.
+    handler False dönerse (ör. kuyruk dolu) event'ler `dropped` olarak sayılır.
+    """
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.dropped = 0
+
+    def counters(self):
+        return dict(super().counters(), dropped=self.dropped)
+
+    def datagram_received(self, data, addr):
+        new_events = self._decode(data, addr)
+        if new_events and self.handler(new_events) is False:
+            self.dropped += len(new_events)
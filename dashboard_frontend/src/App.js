@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import './App.css';
 
 const API_URL = 'http://localhost:5000/api';
+const MAX_EVENTS = 50;
 
 function App() {
   const [stats, setStats] = useState({
@@ -13,6 +14,7 @@ function App() {
   });
   const [events, setEvents] = useState([]);
   const [autoRefresh, setAutoRefresh] = useState(true);
+  const [connected, setConnected] = useState(false);
 
   // Fetch stats
   const fetchStats = async () => {
@@ -28,7 +30,7 @@ function App() {
   // Fetch events
   const fetchEvents = async () => {
     try {
-      const response = await fetch(`${API_URL}/events?limit=50`);
+      const response = await fetch(`${API_URL}/events?limit=${MAX_EVENTS}`);
       const data = await response.json();
       setEvents(data.events);
     } catch (error) {
@@ -49,19 +51,42 @@ function App() {
     }
   };
 
-  // Auto-refresh
+  // Canlı yayın (Server-Sent Events): polling yerine backend yeni event'leri ve
+  // istatistikleri gönderir; bağlantı koparsa EventSource kendisi yeniden bağlanır
   useEffect(() => {
-    fetchStats();
-    fetchEvents();
+    if (!autoRefresh) {
+      return;
+    }
 
-    if (autoRefresh) {
-      const interval = setInterval(() => {
-        fetchStats();
-        fetchEvents();
-      }, 2000); // Her 2 saniyede bir güncelle
+    const source = new EventSource(`${API_URL}/stream?limit=${MAX_EVENTS}`);
 
-      return () => clearInterval(interval);
-    }
+    source.onopen = () => setConnected(true);
+    source.onerror = () => setConnected(false);
+
+    source.addEventListener('snapshot', (e) => {
+      const data = JSON.parse(e.data);
+      setEvents(data.events);
+      setStats(data.stats);
+    });
+    source.addEventListener('events', (e) => {
+      const newEvents = JSON.parse(e.data);
+      setEvents((prev) => [...newEvents, ...prev].slice(0, MAX_EVENTS));
+    });
+    source.addEventListener('stats', (e) => {
+      setStats(JSON.parse(e.data));
+    });
+    source.addEventListener('clear', () => {
+      setEvents([]);
+    });
+    source.addEventListener('gap', () => {
+      // Yavaş bağlantıda atlanan event'ler: listeyi baştan çek
+      fetchEvents();
+    });
+
+    return () => {
+      source.close();
+      setConnected(false);
+    };
   }, [autoRefresh]);
 
   return (
@@ -73,7 +98,7 @@ function App() {
 
       <div className="controls">
         <button onClick={() => setAutoRefresh(!autoRefresh)}>
-          {autoRefresh ? '⏸️ Pause' : '▶️ Resume'} Auto-Refresh
+          {autoRefresh ? '⏸️ Pause' : '▶️ Resume'} Live Updates
         </button>
         <button onClick={() => { fetchStats(); fetchEvents(); }}>
           🔄 Refresh Now
@@ -104,6 +129,7 @@ function App() {
 
       {stats.last_updated && (
         <div className="last-updated">
+          {autoRefresh && (connected ? '🟢 Live' : '🟠 Reconnecting...')}{' '}
           Last updated: {new Date(stats.last_updated).toLocaleString()}
         </div>
       )}
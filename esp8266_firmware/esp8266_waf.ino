@@ -11,11 +11,13 @@
 
 #include <ESP8266WiFi.h>
 #include <WiFiClient.h>
+#include <WiFiUdp.h>
 
 // Model ve feature extraction header'ları
 #include "scaler_params.h"
 #include "model_weights.h"
 #include "esp8266_features.h"
+#include "ip_window.h"
 
 // ===== CONFIGURATION =====
 // WiFi ayarları
@@ -31,6 +33,16 @@ const int BACKEND_PORT = 8080;              // Gerçek web sunucusu port
 const char* DASHBOARD_HOST = "192.168.1.100"; // Dashboard backend IP
 const int DASHBOARD_PORT = 5000;              // Dashboard backend port
 const bool DASHBOARD_ENABLED = true;          // Dashboard reporting aktif/pasif
+const int REPORT_BATCH_SIZE = 8;              // Bu kadar event birikince gönder (batch)
+const unsigned long REPORT_FLUSH_MS = 2000;   // İlk bekleyen event'ten sonra en geç gönderim
+
+// Rapor formatı / taşıma:
+//   REPORT_HTTP_NDJSON  POST /api/report/batch (JSON satırları)
+//   REPORT_HTTP_BINARY  POST /api/report/binary (kompakt ikili format)
+//   REPORT_UDP_BINARY   ikili batch tek UDP datagramı; bağlantı/yanıt yok, kayıp kabul
+enum ReportMode { REPORT_HTTP_NDJSON, REPORT_HTTP_BINARY, REPORT_UDP_BINARY };
+const ReportMode REPORT_MODE = REPORT_HTTP_BINARY;
+const int DASHBOARD_UDP_PORT = 5001;          // Backend'de DASHBOARD_UDP_PORT ile aynı
 
 // Model threshold
 const float MALICIOUS_THRESHOLD = 0.5f;     // >0.5 = malicious
@@ -48,7 +60,9 @@ void forwardToBackend(WiFiClient& client, const String& method, const String& pa
 void blockRequest(WiFiClient& client, float probability);
 void reportToDashboard(const String& method, const String& path, const String& query,
                       const String& userAgent, float probability, const String& classification,
-                      const String& action, const String& clientIP);
+                      const String& action, const IPAddress& clientIP);
+void flushDashboardReports();
+uint32_t uptimeSeconds();
 
 // ===== GLOBAL VARIABLES =====
 WiFiServer wafServer(WAF_PORT);
@@ -56,6 +70,18 @@ unsigned long requestCount = 0;
 unsigned long blockedCount = 0;
 unsigned long allowedCount = 0;
 
+// Dashboard'a gönderilmeyi bekleyen event'ler
+// NDJSON: satır başına bir JSON obje; ikili: 6 bayt başlık + kayıtlar
+// (format: dashboard_backend/reports.py). İkili tampon tek datagrama sığar (MTU altı).
+const int REPORT_BINARY_MAX = 1400;
+const int REPORT_BINARY_HEADER = 6;
+String reportBuffer;
+uint8_t reportBinary[REPORT_BINARY_MAX];
+int reportBinaryLen = REPORT_BINARY_HEADER;
+int reportBuffered = 0;
+unsigned long reportFirstMs = 0;
+WiFiUDP reportUdp;
+
 // ===== SETUP =====
 void setup() {
     Serial.begin(115200);
@@ -102,6 +128,10 @@ void loop() {
     // Yeni client bağlantısını bekle
     WiFiClient client = wafServer.available();
     if (!client) {
+        // Trafik azsa bekleyen raporları süre dolunca gönder
+        if (reportBuffered > 0 && millis() - reportFirstMs >= REPORT_FLUSH_MS) {
+            flushDashboardReports();
+        }
         return;
     }
     
@@ -190,11 +220,15 @@ void loop() {
         features
     );
     
+    // f19-f21: IP bazlı sliding window (ip_window.h), login hit = f7
+    ip_window_observe((uint32_t)client.remoteIP(), uptimeSeconds(), path.c_str(),
+                      features[7] > 0.5f, &features[19]);
+    
     // Feature scaling
     scale_features(features);
     
     // Model inference
-    float probability = mlp_inference(features);
+    float probability = model_inference(features);
     int classification = (probability >= MALICIOUS_THRESHOLD) ? 1 : 0;
     
     if (DEBUG_MODE) {
@@ -207,7 +241,7 @@ void loop() {
     // Karar: benign ise forward et, malicious ise engelle
     String classificationStr = (classification == 1) ? "MALICIOUS" : "BENIGN";
     String action;
-    String clientIP = client.remoteIP().toString();
+    IPAddress clientIP = client.remoteIP();
     
     if (classification == 0) {
         // BENIGN - Backend'e forward et
@@ -396,40 +430,151 @@ void blockRequest(WiFiClient& client, float probability) {
     client.println("</body></html>");
 }
 
+// millis() ~49.7 günde taşar; taşmaları sayarak monoton saniye döndür (64 bit ms).
+// ~49.7 gün hiç istek gelmezse taşma kaçabilir; o zaman oluşan geri sıçramada ip_window.h
+// girişi sıfırlar.
+uint32_t uptimeSeconds() {
+    static uint32_t lastMillis = 0;
+    static uint32_t wraps = 0;
+    uint32_t now = millis();
+    if (now < lastMillis) {
+        wraps++;
+    }
+    lastMillis = now;
+    return (uint32_t)((((uint64_t)wraps << 32) | now) / 1000);
+}
+
+// JSON string değeri ekle (", \\ ve kontrol karakterleri escape edilir)
+void appendJsonString(String& out, const String& value) {
+    out += '"';
+    for (unsigned int i = 0; i < value.length(); i++) {
+        char c = value.charAt(i);
+        if (c == '"' || c == '\\') {
+            out += '\\';
+            out += c;
+        } else if ((unsigned char)c < 0x20) {
+            char esc[7];
+            snprintf(esc, sizeof(esc), "\\u%04x", (unsigned char)c);
+            out += esc;
+        } else {
+            out += c;
+        }
+    }
+    out += '"';
+}
+
+// Event'i JSON satırı olarak ekle (REPORT_HTTP_NDJSON)
+void appendJsonReport(const String& method, const String& path, const String& query,
+                      const String& userAgent, float probability, const String& classification,
+                      const String& action, const IPAddress& clientIP) {
+    reportBuffer += "{\"method\":";
+    appendJsonString(reportBuffer, method);
+    reportBuffer += ",\"path\":";
+    appendJsonString(reportBuffer, path);
+    reportBuffer += ",\"query\":";
+    appendJsonString(reportBuffer, query);
+    reportBuffer += ",\"user_agent\":";
+    appendJsonString(reportBuffer, userAgent);
+    reportBuffer += ",\"probability\":" + String(probability, 4);
+    reportBuffer += ",\"classification\":";
+    appendJsonString(reportBuffer, classification);
+    reportBuffer += ",\"action\":";
+    appendJsonString(reportBuffer, action);
+    reportBuffer += ",\"client_ip\":";
+    appendJsonString(reportBuffer, clientIP.toString());
+    reportBuffer += "}\n";
+}
+
+// Event'i ikili kayıt olarak ekle: 13 bayt sabit alan + string'ler (little-endian).
+// Alanlar kırpılır; en büyük kayıt (13+16+512+512+255) boş tampona her zaman sığar.
+void appendBinaryReport(const String& method, const String& path, const String& query,
+                        const String& userAgent, float probability, const String& classification,
+                        const String& action, const IPAddress& clientIP) {
+    unsigned int methodLen = min(method.length(), 16u);
+    unsigned int pathLen = min(path.length(), 512u);
+    unsigned int queryLen = min(query.length(), 512u);
+    unsigned int uaLen = min(userAgent.length(), 255u);
+    int recordLen = 13 + methodLen + pathLen + queryLen + uaLen;
+    
+    // Tampona (tek datagram) sığmıyorsa önce bekleyenleri gönder
+    if (reportBinaryLen + recordLen > REPORT_BINARY_MAX) {
+        flushDashboardReports();
+    }
+    
+    uint8_t flags = 0;
+    if (action == "BLOCKED") flags |= 0x01;
+    if (classification == "MALICIOUS") flags |= 0x02;
+    uint16_t prob = (uint16_t)(constrain(probability, 0.0f, 1.0f) * 65535.0f + 0.5f);
+    
+    uint8_t* p = reportBinary + reportBinaryLen;
+    *p++ = flags;
+    *p++ = prob & 0xFF;
+    *p++ = prob >> 8;
+    for (int i = 0; i < 4; i++) {
+        *p++ = clientIP[i];
+    }
+    *p++ = methodLen;
+    *p++ = pathLen & 0xFF;
+    *p++ = pathLen >> 8;
+    *p++ = queryLen & 0xFF;
+    *p++ = queryLen >> 8;
+    *p++ = uaLen;
+    memcpy(p, method.c_str(), methodLen);
+    p += methodLen;
+    memcpy(p, path.c_str(), pathLen);
+    p += pathLen;
+    memcpy(p, query.c_str(), queryLen);
+    p += queryLen;
+    memcpy(p, userAgent.c_str(), uaLen);
+    p += uaLen;
+    reportBinaryLen = p - reportBinary;
+}
+
+// Event'i batch'e ekle; REPORT_BATCH_SIZE dolunca gönder (süre dolumu loop()'ta)
 void reportToDashboard(const String& method, const String& path, const String& query,
                       const String& userAgent, float probability, const String& classification,
-                      const String& action, const String& clientIP) {
-    WiFiClient dashboardClient;
+                      const String& action, const IPAddress& clientIP) {
+    if (REPORT_MODE == REPORT_HTTP_NDJSON) {
+        appendJsonReport(method, path, query, userAgent, probability, classification, action, clientIP);
+    } else {
+        appendBinaryReport(method, path, query, userAgent, probability, classification, action, clientIP);
+    }
+    
+    if (reportBuffered == 0) {
+        reportFirstMs = millis();
+    }
+    reportBuffered++;
     
+    if (reportBuffered >= REPORT_BATCH_SIZE) {
+        flushDashboardReports();
+    }
+}
+
+// Bekleyen batch'i HTTP POST ile gönder (/api/report/batch veya /api/report/binary)
+bool postDashboardReports() {
+    WiFiClient dashboardClient;
     if (!dashboardClient.connect(DASHBOARD_HOST, DASHBOARD_PORT)) {
-        if (DEBUG_MODE) {
-            Serial.println("[!] Dashboard connection failed");
-        }
-        return;
+        return false;
     }
     
-    // JSON payload oluştur
-    String payload = "{";
-    payload += "\"method\":\"" + method + "\",";
-    payload += "\"path\":\"" + path + "\",";
-    payload += "\"query\":\"" + query + "\",";
-    payload += "\"user_agent\":\"" + userAgent + "\",";
-    payload += "\"probability\":" + String(probability, 4) + ",";
-    payload += "\"classification\":\"" + classification + "\",";
-    payload += "\"action\":\"" + action + "\",";
-    payload += "\"client_ip\":\"" + clientIP + "\"";
-    payload += "}";
+    bool binary = (REPORT_MODE == REPORT_HTTP_BINARY);
     
     // HTTP POST request
-    dashboardClient.println("POST /api/report HTTP/1.1");
+    dashboardClient.println(binary ? "POST /api/report/binary HTTP/1.1"
+                                   : "POST /api/report/batch HTTP/1.1");
     dashboardClient.print("Host: ");
     dashboardClient.println(DASHBOARD_HOST);
-    dashboardClient.println("Content-Type: application/json");
+    dashboardClient.println(binary ? "Content-Type: application/x-waf-report"
+                                   : "Content-Type: application/x-ndjson");
     dashboardClient.print("Content-Length: ");
-    dashboardClient.println(payload.length());
+    dashboardClient.println(binary ? reportBinaryLen : (int)reportBuffer.length());
     dashboardClient.println("Connection: close");
     dashboardClient.println();
-    dashboardClient.println(payload);
+    if (binary) {
+        dashboardClient.write(reportBinary, reportBinaryLen);
+    } else {
+        dashboardClient.print(reportBuffer);
+    }
     
     // Response'u bekle (opsiyonel)
     unsigned long timeout = millis() + 1000;
@@ -440,8 +585,47 @@ void reportToDashboard(const String& method, const String& path, const String& q
     }
     
     dashboardClient.stop();
+    return true;
+}
+
+// Bekleyen event'leri gönder (REPORT_MODE'a göre HTTP veya UDP)
+void flushDashboardReports() {
+    if (reportBuffered == 0) {
+        return;
+    }
+    
+    int count = reportBuffered;
+    
+    // İkili başlık: 'WR' | versiyon | ayrılmış | event sayısı (u16)
+    reportBinary[0] = 'W';
+    reportBinary[1] = 'R';
+    reportBinary[2] = 1;
+    reportBinary[3] = 0;
+    reportBinary[4] = count & 0xFF;
+    reportBinary[5] = count >> 8;
+    
+    bool sent;
+    if (REPORT_MODE == REPORT_UDP_BINARY) {
+        // Fire-and-forget: bağlantı kurulmaz, yanıt beklenmez
+        sent = reportUdp.beginPacket(DASHBOARD_HOST, DASHBOARD_UDP_PORT) &&
+               reportUdp.write(reportBinary, reportBinaryLen) == (size_t)reportBinaryLen &&
+               reportUdp.endPacket();
+    } else {
+        sent = postDashboardReports();
+    }
+    
+    // Gönderim başarısızsa da batch atılır (RAM sınırlı, yeniden deneme yok)
+    reportBuffer = "";
+    reportBinaryLen = REPORT_BINARY_HEADER;
+    reportBuffered = 0;
     
     if (DEBUG_MODE) {
-        Serial.println("[+] Reported to dashboard");
+        if (sent) {
+            Serial.print("[+] Reported ");
+            Serial.print(count);
+            Serial.println(" events to dashboard");
+        } else {
+            Serial.println("[!] Dashboard report failed");
+        }
     }
 }
@@ -4,7 +4,15 @@
 #ifndef ESP8266_FEATURES_H
 #define ESP8266_FEATURES_H
 
+#ifdef ARDUINO
 #include <Arduino.h>
+#else
+// Host build (python_training/feature_parity.py)
+#include <ctype.h>
+#include <stdio.h>
+#include <string.h>
+#include <strings.h>
+#endif
 #include <math.h>
 
 // Pattern arrays
@@ -15,10 +23,10 @@ const char* LOGIN_KEYWORDS[] = {
 const int LOGIN_KEYWORDS_COUNT = 11;
 
 const char* SQLI_PATTERNS[] = {
-    "union", "select", " or 1=1", "%27", "'", "\"", "--", "/*", 
-    "../", "..%2f", "%2e%2e/"
+    "union", "select", " or 1=1", "' or '1'='1",
+    "%27", "'", "\"", "--", "/*", "../", "..%2f", "%2e%2e/"
 };
-const int SQLI_PATTERNS_COUNT = 11;
+const int SQLI_PATTERNS_COUNT = 12;
 
 const char* XSS_PATTERNS[] = {
     "<script", "</script", "onerror=", "onload=", "javascript:", 
@@ -26,12 +34,12 @@ const char* XSS_PATTERNS[] = {
 };
 const int XSS_PATTERNS_COUNT = 7;
 
+// python_training/features.py ile aynı liste (model bu feature ile eğitildi)
 const char* SUSPICIOUS_UA_KEYWORDS[] = {
     "sqlmap", "nikto", "nessus", "acunetix", "wpscan",
-    "nmap", "curl", "wget", "bot", "crawler", "spider", "scanner",
-    "scripting engine", "compatible;", "nikto/"
+    "nmap", "curl", "wget", "bot", "crawler", "spider", "scanner"
 };
-const int SUSPICIOUS_UA_KEYWORDS_COUNT = 16;
+const int SUSPICIOUS_UA_KEYWORDS_COUNT = 12;
 
 const char* COMMON_HEADERS[] = {
     "host", "user-agent", "accept", "accept-language",
@@ -40,20 +48,17 @@ const char* COMMON_HEADERS[] = {
 };
 const int COMMON_HEADERS_COUNT = 11;
 
-// Shannon entropy hesaplama
-float shannon_entropy(const char* s) {
-    if (s == NULL || s[0] == '\0') {
-        return 0.0f;
-    }
-    
-    int freq[256] = {0};
-    int len = 0;
-    
+// Karakter frekanslarını biriktir (Shannon entropy için)
+void count_chars(const char* s, int freq[256], int* len) {
+    if (s == NULL) return;
     for (const unsigned char* p = (const unsigned char*)s; *p; p++) {
         freq[*p]++;
-        len++;
+        (*len)++;
     }
-    
+}
+
+// Frekans tablosundan Shannon entropy
+float entropy_from_freq(const int freq[256], int len) {
     if (len == 0) return 0.0f;
     
     float ent = 0.0f;
@@ -66,6 +71,18 @@ float shannon_entropy(const char* s) {
     return ent;
 }
 
+// Shannon entropy hesaplama
+float shannon_entropy(const char* s) {
+    if (s == NULL || s[0] == '\0') {
+        return 0.0f;
+    }
+    
+    int freq[256] = {0};
+    int len = 0;
+    count_chars(s, freq, &len);
+    return entropy_from_freq(freq, len);
+}
+
 // Case-insensitive substring search
 bool contains_substring_ci(const char* haystack, const char* needle) {
     if (haystack == NULL || needle == NULL) return false;
@@ -101,33 +118,46 @@ int contains_any(const char* haystack, const char* patterns[], int pattern_count
 }
 
 // Query string'den parametre sayısı ve max uzunluk
+// Python query.split('&') ile aynı: boş segmentler de sayılır, kopya/kırpma yok
 void parse_query_params(const char* query, int* num_params, int* max_param_len) {
     *num_params = 0;
     *max_param_len = 0;
     
     if (query == NULL || query[0] == '\0') return;
     
-    char local_query[256];
-    strncpy(local_query, query, sizeof(local_query) - 1);
-    local_query[sizeof(local_query) - 1] = '\0';
-    
-    char* token = strtok(local_query, "&");
-    while (token != NULL) {
-        (*num_params)++;
+    const char* seg = query;
+    while (true) {
+        const char* end = strchr(seg, '&');
+        int seg_len = end ? (int)(end - seg) : (int)strlen(seg);
         
-        char* eq = strchr(token, '=');
-        const char* val = token;
-        if (eq != NULL) {
-            val = eq + 1;
-        }
+        const char* eq = (const char*)memchr(seg, '=', seg_len);
+        int vlen = eq ? seg_len - (int)(eq - seg) - 1 : seg_len;
         
-        int vlen = strlen(val);
+        (*num_params)++;
         if (vlen > *max_param_len) {
             *max_param_len = vlen;
         }
         
-        token = strtok(NULL, "&");
+        if (end == NULL) break;
+        seg = end + 1;
+    }
+}
+
+// UTF-8 karakter sayısı (Python len(str) ile aynı: continuation byte'ları sayılmaz)
+int utf8_length(const char* s, int nbytes) {
+    int count = 0;
+    for (int i = 0; i < nbytes; i++) {
+        if (((unsigned char)s[i] & 0xC0) != 0x80) count++;
     }
+    return count;
+}
+
+// Header değerinin baştaki/sondaki boşluklar atılmış uzunluğu (Python value.strip())
+int header_value_length(const char* value) {
+    while (*value == ' ' || *value == '\t') value++;
+    int len = strlen(value);
+    while (len > 0 && (value[len - 1] == ' ' || value[len - 1] == '\t')) len--;
+    return utf8_length(value, len);
 }
 
 // Header isminin common olup olmadığını kontrol et
@@ -169,27 +199,39 @@ void extract_features(
     features[5] = (float)num_params;
     features[6] = (float)max_param_len;
     
-    // Combined path+query için buffer
-    char combined[384];
-    snprintf(combined, sizeof(combined), "%s?%s", path, query ? query : "");
+    // f7-f10: path + "?" + query üzerinde (query boşsa sadece path; Python ile aynı).
+    // Geçici buffer yok, uzun URL'ler kırpılmaz. Pattern'lerin hiçbiri '?' içermediği
+    // için path ve query'yi ayrı taramak birleşik string'i taramakla aynı sonucu verir.
+    bool has_query = (query != NULL && query[0] != '\0');
     
     // f7: has_login_keyword
-    features[7] = (float)contains_any(combined, LOGIN_KEYWORDS, LOGIN_KEYWORDS_COUNT);
+    features[7] = (contains_any(path, LOGIN_KEYWORDS, LOGIN_KEYWORDS_COUNT) ||
+                   (has_query && contains_any(query, LOGIN_KEYWORDS, LOGIN_KEYWORDS_COUNT))) ? 1.0f : 0.0f;
     
     // f8: has_sqli_pattern
-    features[8] = (float)contains_any(combined, SQLI_PATTERNS, SQLI_PATTERNS_COUNT);
+    features[8] = (contains_any(path, SQLI_PATTERNS, SQLI_PATTERNS_COUNT) ||
+                   (has_query && contains_any(query, SQLI_PATTERNS, SQLI_PATTERNS_COUNT))) ? 1.0f : 0.0f;
     
     // f9: has_xss_pattern
-    features[9] = (float)contains_any(combined, XSS_PATTERNS, XSS_PATTERNS_COUNT);
+    features[9] = (contains_any(path, XSS_PATTERNS, XSS_PATTERNS_COUNT) ||
+                   (has_query && contains_any(query, XSS_PATTERNS, XSS_PATTERNS_COUNT))) ? 1.0f : 0.0f;
     
     // f10: path_entropy
-    features[10] = shannon_entropy(combined);
+    int freq[256] = {0};
+    int combined_len = 0;
+    count_chars(path, freq, &combined_len);
+    if (has_query) {
+        freq[(unsigned char)'?']++;
+        combined_len++;
+        count_chars(query, freq, &combined_len);
+    }
+    features[10] = entropy_from_freq(freq, combined_len);
     
     // f11: num_headers
     features[11] = (float)num_headers;
     
     // f12: user_agent_length
-    features[12] = (float)strlen(user_agent ? user_agent : "");
+    features[12] = user_agent ? (float)utf8_length(user_agent, strlen(user_agent)) : 0.0f;
     
     // f13: has_suspicious_ua
     features[13] = (float)contains_any(user_agent, SUSPICIOUS_UA_KEYWORDS, SUSPICIOUS_UA_KEYWORDS_COUNT);
@@ -226,16 +268,16 @@ void extract_features(
     for (int i = 0; i < num_headers; i++) {
         if (headers[i] != NULL) {
             if (strncasecmp(headers[i], "Accept-Language:", 16) == 0) {
-                features[16] = (float)strlen(headers[i] + 16);
+                features[16] = (float)header_value_length(headers[i] + 16);
             } else if (strncasecmp(headers[i], "Host:", 5) == 0) {
-                features[17] = (float)strlen(headers[i] + 5);
+                features[17] = (float)header_value_length(headers[i] + 5);
             } else if (strncasecmp(headers[i], "Referer:", 8) == 0) {
-                features[18] = (float)strlen(headers[i] + 8);
+                features[18] = (float)header_value_length(headers[i] + 8);
             }
         }
     }
     
-    // f19-f21: IP bazlı davranışsal (şimdilik 0)
+    // f19-f21: IP bazlı davranışsal; stateless çıkarımda 0, firmware ip_window_observe() ile doldurur
     features[19] = 0.0f;
     features[20] = 0.0f;
     features[21] = 0.0f;
@@ -0,0 +1,165 @@
+#ifndef IP_WINDOW_H
+#define IP_WINDOW_H
+
+// IP bazlı davranışsal feature'lar (f19-f21), sliding window
+// Python referansı: python_training/ip_window.py (bucket düzeni, FNV-1a path hash'i,
+// sayaç doyumu ve linear counting tablosu birebir aynı; parity: feature_parity.py)
+//
+// f19 req_count_last_10s:        10 x 1 s bucket
+// f20 login_admin_hits_last_60s: 12 x 5 s bucket (f7 = 1 olan istekler)
+// f21 unique_paths_last_60s:     12 x 5 s bucket'lık 64 bit path bitmap'i, linear counting
+//
+// Tablo IP_WINDOW_MAX_IPS girişlik; dolunca en uzun süredir görülmeyen IP atılır (LRU).
+// Giriş başına ~150 byte (32 IP ~ 5 KB RAM).
+
+#include <stdint.h>
+#include <string.h>
+
+#ifndef IP_WINDOW_MAX_IPS
+#define IP_WINDOW_MAX_IPS 32
+#endif
+
+#define IP_WINDOW_SHORT_BUCKETS 10
+#define IP_WINDOW_LONG_BUCKETS 12
+#define IP_WINDOW_LONG_BUCKET_SECONDS 5
+#define IP_WINDOW_COUNTER_MAX 65535
+// Saat son istekten tüm pencere kadar geri giderse (reset / millis() taşması) giriş sıfırlanır
+#define IP_WINDOW_RESET_SECONDS (IP_WINDOW_LONG_BUCKETS * IP_WINDOW_LONG_BUCKET_SECONDS)
+
+// Linear counting: bitmap'teki sıfır bit sayısı -> tekil path tahmini
+static const uint16_t LINEAR_COUNT_TABLE[65] = {
+    266, 266, 222, 196, 177, 163, 151, 142, 133, 126, 119, 113, 107, 102, 97, 93,
+    89, 85, 81, 78, 74, 71, 68, 65, 63, 60, 58, 55, 53, 51, 48, 46,
+    44, 42, 40, 39, 37, 35, 33, 32, 30, 28, 27, 25, 24, 23, 21, 20,
+    18, 17, 16, 15, 13, 12, 11, 10, 9, 7, 6, 5, 4, 3, 2, 1,
+    0
+};
+
+struct IPWindowEntry {
+    uint32_t ip;
+    uint32_t last_sec;
+    uint32_t last_used;     // LRU sırası
+    uint32_t req_total;
+    uint32_t login_total;
+    uint16_t req[IP_WINDOW_SHORT_BUCKETS];
+    uint16_t login[IP_WINDOW_LONG_BUCKETS];
+    uint64_t paths[IP_WINDOW_LONG_BUCKETS];
+    bool used;
+};
+
+static IPWindowEntry ip_window_table[IP_WINDOW_MAX_IPS];
+static uint32_t ip_window_clock = 0;
+
+// 32 bit FNV-1a
+uint32_t ip_window_path_hash(const char* path) {
+    uint32_t h = 0x811C9DC5u;
+    for (const unsigned char* p = (const unsigned char*)path; p != NULL && *p; p++) {
+        h = (h ^ *p) * 0x01000193u;
+    }
+    return h;
+}
+
+int ip_window_popcount64(uint64_t x) {
+    int count = 0;
+    while (x) {
+        x &= x - 1;
+        count++;
+    }
+    return count;
+}
+
+void ip_window_reset() {
+    for (int i = 0; i < IP_WINDOW_MAX_IPS; i++) {
+        ip_window_table[i].used = false;
+    }
+    ip_window_clock = 0;
+}
+
+// IP'nin girişini bul; yoksa boş (veya LRU) girişi sıfırlayıp ver
+IPWindowEntry* ip_window_lookup(uint32_t ip, uint32_t now_sec) {
+    IPWindowEntry* victim = NULL;
+    for (int i = 0; i < IP_WINDOW_MAX_IPS; i++) {
+        IPWindowEntry* e = &ip_window_table[i];
+        if (!e->used) {
+            if (victim == NULL || victim->used) victim = e;
+            continue;
+        }
+        if (e->ip == ip) return e;
+        if (victim == NULL || (victim->used && e->last_used < victim->last_used)) victim = e;
+    }
+
+    memset(victim, 0, sizeof(IPWindowEntry));
+    victim->ip = ip;
+    victim->last_sec = now_sec;
+    victim->used = true;
+    return victim;
+}
+
+// Pencereyi now_sec'e kaydır. Küçük geri sıçramalar yok sayılır (istek mevcut saniyeye
+// yazılır); IP_WINDOW_RESET_SECONDS veya daha fazla geri gitmede pencere sıfırlanır,
+// yoksa süre dolumu durur ve sayaçlar COUNTER_MAX'e kadar birikir.
+void ip_window_advance(IPWindowEntry* e, uint32_t now_sec) {
+    int32_t dt = (int32_t)(now_sec - e->last_sec);
+    if (dt <= -IP_WINDOW_RESET_SECONDS) {
+        uint32_t ip = e->ip;
+        uint32_t last_used = e->last_used;
+        memset(e, 0, sizeof(IPWindowEntry));
+        e->ip = ip;
+        e->last_used = last_used;
+        e->last_sec = now_sec;
+        e->used = true;
+        return;
+    }
+    if (dt <= 0) return;
+
+    uint32_t n = (dt < IP_WINDOW_SHORT_BUCKETS) ? (uint32_t)dt : IP_WINDOW_SHORT_BUCKETS;
+    for (uint32_t s = e->last_sec + 1; s <= e->last_sec + n; s++) {
+        int i = s % IP_WINDOW_SHORT_BUCKETS;
+        e->req_total -= e->req[i];
+        e->req[i] = 0;
+    }
+
+    uint32_t b_last = e->last_sec / IP_WINDOW_LONG_BUCKET_SECONDS;
+    uint32_t b_new = now_sec / IP_WINDOW_LONG_BUCKET_SECONDS;
+    uint32_t nb = b_new - b_last;
+    if (nb > IP_WINDOW_LONG_BUCKETS) nb = IP_WINDOW_LONG_BUCKETS;
+    for (uint32_t b = b_last + 1; b <= b_last + nb; b++) {
+        int i = b % IP_WINDOW_LONG_BUCKETS;
+        e->login_total -= e->login[i];
+        e->login[i] = 0;
+        e->paths[i] = 0;
+    }
+    e->last_sec = now_sec;
+}
+
+// İsteği pencereye ekle ve f19-f21'i out[0..2]'ye yaz (mevcut istek dahil)
+void ip_window_observe(uint32_t ip, uint32_t now_sec, const char* path, bool login_hit, float out[3]) {
+    IPWindowEntry* e = ip_window_lookup(ip, now_sec);
+    e->last_used = ++ip_window_clock;
+    ip_window_advance(e, now_sec);
+    uint32_t sec = e->last_sec;
+
+    int i = sec % IP_WINDOW_SHORT_BUCKETS;
+    if (e->req[i] < IP_WINDOW_COUNTER_MAX) {
+        e->req[i]++;
+        e->req_total++;
+    }
+
+    int b = (sec / IP_WINDOW_LONG_BUCKET_SECONDS) % IP_WINDOW_LONG_BUCKETS;
+    if (login_hit && e->login[b] < IP_WINDOW_COUNTER_MAX) {
+        e->login[b]++;
+        e->login_total++;
+    }
+    e->paths[b] |= (uint64_t)1 << (ip_window_path_hash(path) % 64);
+
+    uint64_t all_paths = 0;
+    for (int k = 0; k < IP_WINDOW_LONG_BUCKETS; k++) {
+        all_paths |= e->paths[k];
+    }
+
+    out[0] = (float)e->req_total;
+    out[1] = (float)e->login_total;
+    out[2] = (float)LINEAR_COUNT_TABLE[64 - ip_window_popcount64(all_paths)];
+}
+
+#endif // IP_WINDOW_H
@@ -107,4 +107,9 @@ int classify_request(const float features[N_INPUT], float threshold=0.5f) {
     return (prob >= threshold) ? 1 : 0;
 }
 
+// Model-agnostic entry point used by the firmware
+inline float model_inference(const float features[N_INPUT]) {
+    return mlp_inference(features);
+}
+
 #endif // MODEL_WEIGHTS_H
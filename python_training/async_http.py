@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+asyncio üzerinde minimal HTTP/1.1 yardımcıları (ek bağımlılık yok):
+- HTTPConnectionPool: tek hedefe keep-alive bağlantı havuzu (istemci)
+- read_request / read_response: stream'den istek / yanıt okuma
+
+replay_load.py (yük üretici) ve waf_simulator.py (reverse proxy) ortak kullanır.
+"""
+import asyncio
+from collections import namedtuple
+
+DEFAULT_POOL_SIZE = 64
+MAX_HEADER_LINES = 100
+
+# headers: [(name, value), ...] (orijinal sıra ve yazımla)
+HTTPRequest = namedtuple("HTTPRequest", "method target version headers body")
+HTTPResponse = namedtuple("HTTPResponse", "status reason headers body")
+
+
+class HTTPConnectionPool:
+    """
+    Tek hedefe keep-alive HTTP/1.1 bağlantı havuzu (asyncio stream'leri üzerinde).
+    En fazla `size` eşzamanlı bağlantı; sunucu bağlantıyı kapatırsa (ESP8266 her
+    yanıttan sonra kapatır) bağlantı atılır ve gerektiğinde yenisi açılır.
+    """
+
+    def __init__(self, host, port, size=DEFAULT_POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.host_header = host if port == 80 else f"{host}:{port}"
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            conn = await asyncio.open_connection(self.host, self.port)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.opened += 1
+        return conn
+
+    def _release(self, conn, reusable):
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        self._slots.release()
+
+    async def request(self, method, target, headers=(), body=b""):
+        """
+        headers: [(name, value), ...] veya dict (Host / Connection / Content-Length eklenir)
+        Returns: HTTPResponse (gövde okunmuş, chunked ise birleştirilmiş)
+        """
+        if isinstance(headers, dict):
+            headers = headers.items()
+        conn = await self._acquire()
+        reusable = False
+        try:
+            reader, writer = conn
+            lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host_header}"]
+            lines += [f"{name}: {value}" for name, value in headers]
+            if body:
+                lines.append(f"Content-Length: {len(body)}")
+            lines.append("Connection: keep-alive")
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8", "surrogateescape") + body)
+            await writer.drain()
+            response, reusable = await read_response(reader, method)
+            return response
+        finally:
+            self._release(conn, reusable)
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+async def _read_header_lines(reader):
+    # Byte'lar str'ye kayıpsız çevrilir (geçersiz UTF-8 dahil);
+    # .encode("utf-8", "surrogateescape") orijinal byte'ları geri verir
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        if len(headers) >= MAX_HEADER_LINES:
+            raise ValueError("too many header lines")
+        name, sep, value = line.decode("utf-8", "surrogateescape").partition(":")
+        if sep:
+            headers.append((name.strip(), value.strip()))
+
+
+def _framing(headers):
+    """Returns: (content_length veya None, chunked mı, Connection değeri)"""
+    length, chunked, connection = None, False, ""
+    for name, value in headers:
+        lname = name.lower()
+        if lname == "content-length":
+            length = int(value)
+        elif lname == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+        elif lname == "connection":
+            connection = value.lower()
+    return length, chunked, connection
+
+
+async def _read_body(reader, length, chunked):
+    if chunked:
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            data = await reader.readexactly(size + 2)
+            if size == 0:
+                return b"".join(parts)
+            parts.append(data[:-2])
+    if length:
+        return await reader.readexactly(length)
+    return b""
+
+
+async def read_response(reader, method="GET"):
+    """
+    Status satırı + header'lar + gövde (Content-Length / chunked / bağlantı sonu).
+    Returns: (HTTPResponse, bağlantı tekrar kullanılabilir mi)
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before response")
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+        raise ConnectionError(f"malformed status line: {status_line[:80]!r}")
+    status = int(parts[1])
+    reason = parts[2].strip().decode("latin-1") if len(parts) > 2 else ""
+    headers = await _read_header_lines(reader)
+    length, chunked, connection = _framing(headers)
+    keep_alive = "keep-alive" in connection if parts[0] != b"HTTP/1.1" else "close" not in connection
+
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return HTTPResponse(status, reason, headers, b""), keep_alive
+    if chunked or length is not None:
+        body = await _read_body(reader, length, chunked)
+        return HTTPResponse(status, reason, headers, body), keep_alive
+    body = await reader.read()  # gövde bağlantı kapanana kadar
+    return HTTPResponse(status, reason, headers, body), False
+
+
+async def read_request(reader):
+    """
+    Sunucu tarafı: istek satırı + header'lar + gövde.
+    Returns: HTTPRequest veya None (bağlantı istek gelmeden kapandı)
+    """
+    line = await reader.readline()
+    while line in (b"\r\n", b"\n"):
+        line = await reader.readline()
+    if not line:
+        return None
+    request_line = line.decode("utf-8", "surrogateescape").strip()
+    parts = request_line.split(" ")
+    method = parts[0] if parts else ""
+    target = parts[1] if len(parts) > 1 else ""
+    version = parts[2] if len(parts) > 2 else "HTTP/1.0"
+    headers = await _read_header_lines(reader)
+    length, chunked, _ = _framing(headers)
+    body = await _read_body(reader, length, chunked)
+    return HTTPRequest(method, target, version, headers, body)
+
+
+def wants_keep_alive(request):
+    connection = _framing(request.headers)[2]
+    if request.version == "HTTP/1.1":
+        return "close" not in connection
+    return "keep-alive" in connection
@@ -0,0 +1,2 @@
+# test_waf.py gerçek bir ESP8266'ya istek gönderen manuel script'tir, pytest testi değil
+collect_ignore = ["test_waf.py"]
@@ -1,10 +1,34 @@
 #!/usr/bin/env python3
 """
-MLP(8) modelini ve StandardScaler parametrelerini C array'lerine export eder.
+Eğitilmiş modeli ve StandardScaler parametrelerini C array'lerine export eder.
 ESP8266'da kullanılmak üzere .h header dosyaları oluşturur.
+Desteklenen modeller: MLPClassifier, DecisionTreeClassifier (if/else veya node
+dizisi), LogisticRegression / SGDClassifier (scaler katlanmış tek dot product).
+Firmware her model tipi için model_inference() çağırır.
+
+MLP modları:
+- float: float32 ağırlıklar, runtime scale_features + sigmoid (varsayılan)
+- folded: scaler ilk katmana katlanmış, budanmış, döngüleri açılmış float32
+- int8:  post-training quantization; scaler giriş quantization'ına katlanır,
+         mlp_inference katmanları sadece tamsayı aritmetiğiyle hesaplar
 """
+import argparse
+import os
 import pickle
 import numpy as np
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from quantization import (
+    ACT_QMAX,
+    INPUT_QMAX,
+    quantize_mlp,
+    quantized_predict,
+    quantized_predict_proba,
+    quantized_size_bytes,
+)
 
 
 def export_scaler_to_c(scaler, output_file):
@@ -54,81 +78,257 @@ def export_scaler_to_c(scaler, output_file):
     print(f"[+] Scaler parameters exported to: {output_file}")
 
 
+def export_identity_scaler_to_c(n_features, output_file, note):
+    """
+    Scaling modele katlandığında scaler_params.h: scale_features() no-op kalır,
+    böylece firmware'deki çağrı sırası değişmeden çalışır.
+    """
+    with open(output_file, 'w') as f:
+        f.write("// Auto-generated scaler parameters\n")
+        f.write(f"// {note}\n\n")
+        f.write("#ifndef SCALER_PARAMS_H\n")
+        f.write("#define SCALER_PARAMS_H\n\n")
+
+        f.write(f"#define N_FEATURES {n_features}\n\n")
+
+        f.write("// No-op: scaling is folded into model_weights.h\n")
+        f.write("inline void scale_features(float features[N_FEATURES]) {\n")
+        f.write("    (void)features;\n")
+        f.write("}\n\n")
+
+        f.write("#endif // SCALER_PARAMS_H\n")
+
+    print(f"[+] Identity scaler exported to: {output_file}")
+
+
+def _c_float(value):
+    text = f"{float(value) + 0.0:.9g}"
+    if not any(c in text for c in ".en"):
+        text += ".0"
+    return text + "f"
+
+
+# ESP8266 (Xtensa LX106, FPU yok) için kaba işlem maliyetleri (cycle, soft-float).
+# Mutlak değil, modeller/modlar arası karşılaştırma içindir; cihazda
+# ESP.getCycleCount() ile ölçülerek kalibre edilmeli.
+ESP8266_OP_CYCLES = {
+    "fadd": 60,    # float toplama/çıkarma
+    "fmul": 80,    # float çarpma
+    "fdiv": 250,   # float bölme
+    "fcmp": 25,    # float karşılaştırma
+    "expf": 2500,  # libm expf
+    "imac": 3,     # int32 çarp-topla
+}
+ESP8266_CPU_MHZ = 80
+
+
+def print_cost_estimate(ops, label="Ops per request"):
+    """
+    ops: {"fadd": n, "fmul": n, ...} -> işlem sayıları ve kaba cycle tahmini yazdır.
+    """
+    cycles = sum(ESP8266_OP_CYCLES[op] * count for op, count in ops.items())
+    counts = ", ".join(f"{op}={count:g}" for op, count in ops.items() if count)
+    print(f"    {label}: {counts}")
+    print(f"    Estimated cycles (ESP8266 soft-float, rough): ~{cycles:,.0f} "
+          f"(~{cycles / ESP8266_CPU_MHZ:.0f} us @ {ESP8266_CPU_MHZ} MHz)")
+
+
+def _write_model_inference(f, impl):
+    """
+    Model tipinden bağımsız giriş noktası: firmware sadece model_inference() çağırır.
+    """
+    f.write("// Model-agnostic entry point used by the firmware\n")
+    f.write("inline float model_inference(const float features[N_INPUT]) {\n")
+    f.write(f"    return {impl}(features);\n")
+    f.write("}\n\n")
+
+
+def _c_array(values, fmt):
+    return ", ".join(fmt.format(v) for v in values)
+
+
+def _c_float_array(values):
+    return ", ".join(_c_float(v) for v in values)
+
+
+def export_mlp_int8_to_c(params, output_file):
+    """
+    quantize_mlp() çıktısını integer-only inference'lı C header'ına yaz.
+    Hesap quantization.quantized_logits() ile birebir aynıdır.
+    """
+    layers = params["layers"]
+    n_input = len(params["input_mul"])
+    sizes = [n_input] + [layer["weights"].shape[0] for layer in layers]
+    arch = " -> ".join(str(n) for n in sizes)
+
+    with open(output_file, 'w') as f:
+        f.write("// Auto-generated int8 quantized MLP model\n")
+        f.write(f"// Architecture: {arch} (ReLU hidden, sigmoid output)\n")
+        f.write("// StandardScaler is folded into the input quantization (QIN_MUL/QIN_ADD)\n")
+        f.write("// int16 input, int8 weights, uint8 hidden activations, int32 accumulators\n\n")
+        f.write("#ifndef MODEL_WEIGHTS_H\n")
+        f.write("#define MODEL_WEIGHTS_H\n\n")
+        f.write("#include <math.h>\n")
+        f.write("#include <stdint.h>\n\n")
+
+        f.write(f"#define N_INPUT {n_input}\n")
+        f.write(f"#define N_OUTPUT {sizes[-1]}\n")
+        f.write(f"#define INPUT_QMAX {INPUT_QMAX}\n")
+        f.write(f"#define ACT_QMAX {ACT_QMAX}\n\n")
+
+        f.write("// Input quantization: x_q = round(clamp(x * QIN_MUL + QIN_ADD, -INPUT_QMAX, INPUT_QMAX))\n")
+        f.write(f"// (input scale {params['input_scale']:.8g})\n")
+        f.write(f"const float QIN_MUL[N_INPUT] = {{{_c_float_array(params['input_mul'])}}};\n")
+        f.write(f"const float QIN_ADD[N_INPUT] = {{{_c_float_array(params['input_add'])}}};\n\n")
+
+        for k, layer in enumerate(layers):
+            n_out, n_in = layer["weights"].shape
+            f.write(f"// Layer {k}: {n_in} -> {n_out} (accumulator scale {layer['acc_scale']:.8g})\n")
+            f.write(f"#define L{k}_IN {n_in}\n")
+            f.write(f"#define L{k}_OUT {n_out}\n")
+            f.write(f"const int8_t W{k}[L{k}_OUT][L{k}_IN] = {{\n")
+            for o in range(n_out):
+                f.write(f"    {{{_c_array(layer['weights'][o], '{:d}')}}}")
+                f.write(",\n" if o < n_out - 1 else "\n")
+            f.write("};\n")
+            f.write(f"const int32_t B{k}[L{k}_OUT] = {{{_c_array(layer['bias'], '{:d}')}}};\n")
+            if "multiplier" in layer:
+                f.write("// Requantization: a_q = min(((relu(acc) >> PRE) * MULT + 2^(SHIFT-1)) >> SHIFT, ACT_QMAX)\n")
+                f.write(f"#define L{k}_PRE {layer['pre_shift']}\n")
+                f.write(f"#define L{k}_MULT {layer['multiplier']}\n")
+                f.write(f"#define L{k}_SHIFT {layer['shift']}\n")
+            f.write("\n")
+
+        f.write("// logit = accumulator * QOUT_SCALE\n")
+        f.write(f"const float QOUT_SCALE = {_c_float(params['logit_scale'])};\n\n")
+
+        f.write("// Quantize one raw feature (scaler folded in)\n")
+        f.write("inline int16_t quantize_input(float x, int i) {\n")
+        f.write("    float v = x * QIN_MUL[i] + QIN_ADD[i];\n")
+        f.write("    if (v > (float)INPUT_QMAX) v = (float)INPUT_QMAX;\n")
+        f.write("    if (v < -(float)INPUT_QMAX) v = -(float)INPUT_QMAX;\n")
+        f.write("    return (int16_t)(v >= 0.0f ? v + 0.5f : v - 0.5f);\n")
+        f.write("}\n\n")
+
+        f.write("// Integer-only MLP: returns the output accumulator (logit / QOUT_SCALE)\n")
+        f.write("// Input: raw (unscaled) features[22]\n")
+        f.write("int32_t mlp_logit_q(const float features[N_INPUT]) {\n")
+        f.write("    int16_t a0[L0_IN];\n")
+        f.write("    for (int i = 0; i < N_INPUT; i++) {\n")
+        f.write("        a0[i] = quantize_input(features[i], i);\n")
+        f.write("    }\n\n")
+        last = len(layers) - 1
+        for k in range(last):
+            f.write(f"    // Layer {k}: ReLU + requantize\n")
+            f.write(f"    uint8_t a{k + 1}[L{k}_OUT];\n")
+            f.write(f"    for (int o = 0; o < L{k}_OUT; o++) {{\n")
+            f.write(f"        int32_t acc = B{k}[o];\n")
+            f.write(f"        for (int i = 0; i < L{k}_IN; i++) {{\n")
+            f.write(f"            acc += (int32_t)a{k}[i] * W{k}[o][i];\n")
+            f.write("        }\n")
+            f.write("        if (acc < 0) acc = 0;\n")
+            f.write(f"        acc = ((acc >> L{k}_PRE) * L{k}_MULT + (1 << (L{k}_SHIFT - 1))) >> L{k}_SHIFT;\n")
+            f.write(f"        a{k + 1}[o] = (uint8_t)(acc > ACT_QMAX ? ACT_QMAX : acc);\n")
+            f.write("    }\n\n")
+        f.write(f"    // Layer {last}: output accumulator\n")
+        f.write(f"    int32_t acc = B{last}[0];\n")
+        f.write(f"    for (int i = 0; i < L{last}_IN; i++) {{\n")
+        f.write(f"        acc += (int32_t)a{last}[i] * W{last}[0][i];\n")
+        f.write("    }\n")
+        f.write("    return acc;\n")
+        f.write("}\n\n")
+
+        f.write("// MLP inference function\n")
+        f.write("// Input: raw features[22] (scale_features() is a no-op in this mode)\n")
+        f.write("// Output: probability [0.0, 1.0] (>0.5 = malicious)\n")
+        f.write("float mlp_inference(const float features[N_INPUT]) {\n")
+        f.write("    return 1.0f / (1.0f + expf(-(float)mlp_logit_q(features) * QOUT_SCALE));\n")
+        f.write("}\n\n")
+
+        f.write("// Classify request: 0=benign, 1=malicious\n")
+        f.write("// threshold 0.5 <=> logit >= 0: integer-only, no expf\n")
+        f.write("int classify_request(const float features[N_INPUT], float threshold=0.5f) {\n")
+        f.write("    if (threshold == 0.5f) {\n")
+        f.write("        return (mlp_logit_q(features) >= 0) ? 1 : 0;\n")
+        f.write("    }\n")
+        f.write("    return (mlp_inference(features) >= threshold) ? 1 : 0;\n")
+        f.write("}\n\n")
+
+        _write_model_inference(f, "mlp_inference")
+        f.write("#endif // MODEL_WEIGHTS_H\n")
+
+    print(f"[+] Int8 model exported to: {output_file}")
+
+    total_params = sum(layer["weights"].size + layer["bias"].size for layer in layers)
+    total_bytes = quantized_size_bytes(params)
+    macs = sum(layer["weights"].size for layer in layers)
+    print("\n[*] Model Statistics:")
+    print(f"    Architecture: {arch}")
+    print(f"    Total parameters: {total_params}")
+    print(f"    Memory (int8 weights, int32 bias, float32 input tables): "
+          f"{total_bytes} bytes (~{total_bytes/1024:.2f} KB)")
+    print(f"    Integer MACs per request: {macs} (+{n_input} float input multiply-adds)")
+    print_cost_estimate({"fmul": n_input, "fadd": n_input, "fcmp": 2 * n_input,
+                         "imac": macs, "expf": 1})
+    print_cost_estimate({"fmul": n_input, "fadd": n_input, "fcmp": 2 * n_input, "imac": macs},
+                        label="classify_request(0.5)")
+
+
+def evaluate_quantization(model, scaler, params, X_test, y_test):
+    """
+    Test split'inde float model ile int8 referansını karşılaştır.
+    """
+    from train_models import compute_metrics
+
+    y_float = model.predict(scaler.transform(X_test))
+    y_q = quantized_predict(params, X_test)
+    agreement = float(np.mean(y_float == y_q))
+
+    print("\n[*] Quantization accuracy (test split):")
+    print(f"    {'Model':8s} | {'Acc':>6s} | {'Prec':>6s} | {'Recall':>6s} | {'F1':>6s}")
+    for name, y_pred in (("float32", y_float), ("int8", y_q)):
+        acc, precision, recall, f1 = compute_metrics(y_test, y_pred)
+        print(f"    {name:8s} | {acc:6.4f} | {precision:6.4f} | {recall:6.4f} | {f1:6.4f}")
+    print(f"    Decision agreement float32 vs int8: {agreement * 100:.3f}% "
+          f"({int(np.sum(y_float != y_q))} / {len(y_q)} differ)")
+
+
 def export_mlp_to_c(model, output_file):
     """
-    MLPClassifier modelini C header dosyasına yaz.
-    Mimari: Input(22) -> Hidden(8, ReLU) -> Output(1, Sigmoid)
+    MLPClassifier modelini C header dosyasına yaz (float32, scaler ayrı).
+    Mimari model.coefs_'ten okunur: Input -> Hidden(ReLU) x N -> Output(1, Sigmoid)
+    Katman k: W{k}[L{k}_IN][L{k}_OUT] (sklearn yönü), B{k}[L{k}_OUT]
     """
-    # Model ağırlıkları ve bias'ları al
-    weights_input_hidden = model.coefs_[0]  # shape: (22, 8)
-    bias_hidden = model.intercepts_[0]      # shape: (8,)
-    weights_hidden_output = model.coefs_[1] # shape: (8, 1)
-    bias_output = model.intercepts_[1]      # shape: (1,)
-    
-    n_input = weights_input_hidden.shape[0]
-    n_hidden = weights_input_hidden.shape[1]
-    n_output = weights_hidden_output.shape[1]
+    weights = model.coefs_
+    biases = model.intercepts_
+    n_input = weights[0].shape[0]
+    sizes = [n_input] + [W.shape[1] for W in weights]
+    arch = " -> ".join(str(n) for n in sizes)
+    last = len(weights) - 1
     
     with open(output_file, 'w') as f:
-        f.write("// Auto-generated MLP(8) model weights\n")
-        f.write("// Architecture: Input(22) -> Hidden(8, ReLU) -> Output(1, Sigmoid)\n\n")
+        f.write(f"// Auto-generated MLP({', '.join(str(n) for n in sizes[1:-1])}) model weights\n")
+        f.write(f"// Architecture: {arch} (ReLU hidden, sigmoid output)\n\n")
         f.write("#ifndef MODEL_WEIGHTS_H\n")
         f.write("#define MODEL_WEIGHTS_H\n\n")
         f.write("#include <math.h>\n\n")
         
         f.write(f"#define N_INPUT {n_input}\n")
-        f.write(f"#define N_HIDDEN {n_hidden}\n")
-        f.write(f"#define N_OUTPUT {n_output}\n\n")
-        
-        # Input -> Hidden weights (22x8 = 176 values)
-        f.write("// Weights: Input -> Hidden (22x8)\n")
-        f.write("const float W_INPUT_HIDDEN[N_INPUT][N_HIDDEN] = {\n")
-        for i in range(n_input):
-            f.write("    {")
-            for j in range(n_hidden):
-                f.write(f"{weights_input_hidden[i, j]:.8f}f")
-                if j < n_hidden - 1:
-                    f.write(", ")
-            f.write("}")
-            if i < n_input - 1:
-                f.write(",")
-            f.write(f"  // f{i}\n")
-        f.write("};\n\n")
+        f.write(f"#define N_OUTPUT {sizes[-1]}\n\n")
         
-        # Hidden bias (8 values)
-        f.write("// Bias: Hidden layer (8)\n")
-        f.write("const float B_HIDDEN[N_HIDDEN] = {\n")
-        for i, val in enumerate(bias_hidden):
-            f.write(f"    {val:.8f}f")
-            if i < len(bias_hidden) - 1:
-                f.write(",")
-            f.write(f"  // h{i}\n")
-        f.write("};\n\n")
-        
-        # Hidden -> Output weights (8x1 = 8 values)
-        f.write("// Weights: Hidden -> Output (8x1)\n")
-        f.write("const float W_HIDDEN_OUTPUT[N_HIDDEN][N_OUTPUT] = {\n")
-        for i in range(n_hidden):
-            f.write("    {")
-            for j in range(n_output):
-                f.write(f"{weights_hidden_output[i, j]:.8f}f")
-                if j < n_output - 1:
-                    f.write(", ")
-            f.write("}")
-            if i < n_hidden - 1:
-                f.write(",")
-            f.write(f"  // h{i}\n")
-        f.write("};\n\n")
-        
-        # Output bias (1 value)
-        f.write("// Bias: Output layer (1)\n")
-        f.write("const float B_OUTPUT[N_OUTPUT] = {\n")
-        for i, val in enumerate(bias_output):
-            f.write(f"    {val:.8f}f")
-            if i < len(bias_output) - 1:
-                f.write(",")
-            f.write("\n")
-        f.write("};\n\n")
+        for k, (W, b) in enumerate(zip(weights, biases)):
+            n_in, n_out = W.shape
+            row = "f" if k == 0 else "h"
+            f.write(f"// Layer {k}: {n_in} -> {n_out}\n")
+            f.write(f"#define L{k}_IN {n_in}\n")
+            f.write(f"#define L{k}_OUT {n_out}\n")
+            f.write(f"const float W{k}[L{k}_IN][L{k}_OUT] = {{\n")
+            for i in range(n_in):
+                f.write("    {" + ", ".join(f"{w:.8f}f" for w in W[i]) + "}")
+                f.write("," if i < n_in - 1 else "")
+                f.write(f"  // {row}{i}\n")
+            f.write("};\n")
+            f.write(f"const float B{k}[L{k}_OUT] = {{" + ", ".join(f"{v:.8f}f" for v in b) + "};\n\n")
         
         # Activation functions
         f.write("// ReLU activation function\n")
@@ -143,29 +343,28 @@ def export_mlp_to_c(model, output_file):
         
         # Inference function
         f.write("// MLP inference function\n")
-        f.write("// Input: scaled features[22]\n")
+        f.write(f"// Input: scaled features[{n_input}]\n")
         f.write("// Output: probability [0.0, 1.0] (>0.5 = malicious)\n")
         f.write("float mlp_inference(const float features[N_INPUT]) {\n")
-        f.write("    float hidden[N_HIDDEN];\n")
-        f.write("    float output;\n\n")
-        
-        f.write("    // Layer 1: Input -> Hidden (with ReLU)\n")
-        f.write("    for (int h = 0; h < N_HIDDEN; h++) {\n")
-        f.write("        float sum = B_HIDDEN[h];\n")
-        f.write("        for (int i = 0; i < N_INPUT; i++) {\n")
-        f.write("            sum += features[i] * W_INPUT_HIDDEN[i][h];\n")
-        f.write("        }\n")
-        f.write("        hidden[h] = relu(sum);\n")
-        f.write("    }\n\n")
+        previous = "features"
+        for k in range(last):
+            f.write(f"    // Layer {k}: L{k}_IN -> L{k}_OUT (with ReLU)\n")
+            f.write(f"    float a{k + 1}[L{k}_OUT];\n")
+            f.write(f"    for (int h = 0; h < L{k}_OUT; h++) {{\n")
+            f.write(f"        float sum = B{k}[h];\n")
+            f.write(f"        for (int i = 0; i < L{k}_IN; i++) {{\n")
+            f.write(f"            sum += {previous}[i] * W{k}[i][h];\n")
+            f.write("        }\n")
+            f.write(f"        a{k + 1}[h] = relu(sum);\n")
+            f.write("    }\n\n")
+            previous = f"a{k + 1}"
         
-        f.write("    // Layer 2: Hidden -> Output (with Sigmoid)\n")
-        f.write("    output = B_OUTPUT[0];\n")
-        f.write("    for (int h = 0; h < N_HIDDEN; h++) {\n")
-        f.write("        output += hidden[h] * W_HIDDEN_OUTPUT[h][0];\n")
+        f.write(f"    // Layer {last}: L{last}_IN -> Output (with Sigmoid)\n")
+        f.write(f"    float output = B{last}[0];\n")
+        f.write(f"    for (int i = 0; i < L{last}_IN; i++) {{\n")
+        f.write(f"        output += {previous}[i] * W{last}[i][0];\n")
         f.write("    }\n")
-        f.write("    output = sigmoid(output);\n\n")
-        
-        f.write("    return output;\n")
+        f.write("    return sigmoid(output);\n")
         f.write("}\n\n")
         
         # Classification function
@@ -175,26 +374,465 @@ def export_mlp_to_c(model, output_file):
         f.write("    return (prob >= threshold) ? 1 : 0;\n")
         f.write("}\n\n")
         
+        _write_model_inference(f, "mlp_inference")
         f.write("#endif // MODEL_WEIGHTS_H\n")
     
     print(f"[+] Model weights exported to: {output_file}")
     
     # Model istatistikleri
-    total_params = (n_input * n_hidden + n_hidden + 
-                   n_hidden * n_output + n_output)
+    total_params = sum(W.size + b.size for W, b in zip(weights, biases))
     total_bytes = total_params * 4  # float32
     
     print(f"\n[*] Model Statistics:")
-    print(f"    Architecture: {n_input} -> {n_hidden} -> {n_output}")
+    print(f"    Architecture: {arch}")
     print(f"    Total parameters: {total_params}")
     print(f"    Memory (float32): {total_bytes} bytes (~{total_bytes/1024:.2f} KB)")
+    macs = sum(W.size for W in weights)
+    n_hidden = sum(sizes[1:-1])
+    print_cost_estimate({"fadd": n_input + macs, "fmul": macs, "fdiv": n_input,
+                         "fcmp": n_hidden, "expf": 1})
+
+
+def fold_mlp(model, scaler, prune_eps=0.0):
+    """
+    StandardScaler'ı ilk katmana katla ve küçük ağırlıkları at.
+    W1' = W1 / scale (satır bazında), b1' = b1 - (mean / scale) @ W1
+    Budama scale edilmiş uzayda (girişler ~birim varyans) katman max|W|'ine göre
+    yapılır; katlanmış ağırlıkların büyüklüğü feature aralığına bağlı olduğundan
+    orada eşik anlamsız olurdu. Çıkışı hiç kullanılmayan gizli nöronlar ve
+    tüm giriş ağırlıkları atılmış (sabit) nöronlar da kaldırılır.
+    Returns: (weights, biases, dropped_weights)
+    """
+    weights = [np.array(W, dtype=np.float64) for W in model.coefs_]
+    biases = [np.array(b, dtype=np.float64) for b in model.intercepts_]
+
+    dropped = 0
+    if prune_eps > 0.0:
+        for W in weights:
+            mask = np.abs(W) < prune_eps * np.max(np.abs(W))
+            dropped += int(np.count_nonzero(mask & (W != 0.0)))
+            W[mask] = 0.0
+
+    # Sabit gizli nöronlar: relu(b) sabitini sonraki katmanın bias'ına katla
+    for k in range(len(weights) - 1):
+        const = ~weights[k].any(axis=0)
+        biases[k + 1] = biases[k + 1] + np.maximum(biases[k][const], 0.0) @ weights[k + 1][const]
+        weights[k + 1][const] = 0.0
+
+    # Kullanılmayan gizli nöronları sondan başa doğru kaldır
+    for k in range(len(weights) - 2, -1, -1):
+        alive = weights[k + 1].any(axis=1)
+        weights[k] = weights[k][:, alive]
+        biases[k] = biases[k][alive]
+        weights[k + 1] = weights[k + 1][alive]
+
+    mean = scaler.mean_.astype(np.float64)
+    scale = scaler.scale_.astype(np.float64)
+    biases[0] = biases[0] - (mean / scale) @ weights[0]
+    weights[0] = weights[0] / scale[:, None]
+    return weights, biases, dropped
+
+
+def _c_linear_terms(bias, inputs, column):
+    """
+    bias + sum(inputs[i] * column[i]) ifadesi, sıfır ağırlıklar atlanmış, satır başına bir terim.
+    """
+    lines = [_c_float(bias)]
+    for name, w in zip(inputs, column):
+        if w != 0.0:
+            sign = "-" if w < 0.0 else "+"
+            lines.append(f"{sign} {name} * {_c_float(abs(w))}")
+    return "\n        ".join(lines)
+
+
+def export_mlp_folded_to_c(model, scaler, output_file, prune_eps=1e-4):
+    """
+    Optimize edilmiş float32 export:
+    - StandardScaler ilk katmana katlanır (scale_features no-op, bölme yok)
+    - |w| < prune_eps * max|W| olan ağırlıklar atılır
+    - 22x8 / 8x1 döngüleri sabit katsayılı ifadelere açılır (unroll)
+    - classify_request(threshold=0.5) logit >= 0 karşılaştırır, expf çağırmaz
+    """
+    weights, biases, dropped = fold_mlp(model, scaler, prune_eps)
+    n_input = weights[0].shape[0]
+    sizes = [n_input] + [W.shape[1] for W in weights]
+    arch = " -> ".join(str(n) for n in sizes)
+    dense_sizes = [n_input] + [W.shape[1] for W in model.coefs_]
+
+    with open(output_file, 'w') as f:
+        f.write("// Auto-generated MLP model (folded float32)\n")
+        f.write(f"// Architecture: {arch} (ReLU hidden, sigmoid output)\n")
+        f.write("// StandardScaler folded into layer 1, near-zero weights dropped, loops unrolled\n\n")
+        f.write("#ifndef MODEL_WEIGHTS_H\n")
+        f.write("#define MODEL_WEIGHTS_H\n\n")
+        f.write("#include <math.h>\n\n")
+
+        f.write(f"#define N_INPUT {n_input}\n")
+        f.write(f"#define N_OUTPUT {sizes[-1]}\n\n")
+
+        f.write("// Pre-sigmoid output (logit)\n")
+        f.write("// Input: raw (unscaled) features[22]\n")
+        f.write("float mlp_logit(const float x[N_INPUT]) {\n")
+        inputs = [f"x[{i}]" for i in range(n_input)]
+        last = len(weights) - 1
+        for k in range(last):
+            f.write(f"    // Layer {k}: {weights[k].shape[0]} -> {weights[k].shape[1]} (ReLU)\n")
+            names = [f"h{k}_{j}" for j in range(weights[k].shape[1])]
+            for j, name in enumerate(names):
+                f.write(f"    float {name} = {_c_linear_terms(biases[k][j], inputs, weights[k][:, j])};\n")
+                f.write(f"    if ({name} < 0.0f) {name} = 0.0f;\n")
+            f.write("\n")
+            inputs = names
+        f.write(f"    // Layer {last}: output logit\n")
+        f.write(f"    return {_c_linear_terms(biases[last][0], inputs, weights[last][:, 0])};\n")
+        f.write("}\n\n")
+
+        f.write("// MLP inference function\n")
+        f.write("// Input: raw features[22] (scale_features() is a no-op in this mode)\n")
+        f.write("// Output: probability [0.0, 1.0] (>0.5 = malicious)\n")
+        f.write("float mlp_inference(const float features[N_INPUT]) {\n")
+        f.write("    return 1.0f / (1.0f + expf(-mlp_logit(features)));\n")
+        f.write("}\n\n")
+
+        f.write("// Classify request: 0=benign, 1=malicious\n")
+        f.write("// threshold 0.5 <=> logit >= 0: no expf\n")
+        f.write("int classify_request(const float features[N_INPUT], float threshold=0.5f) {\n")
+        f.write("    if (threshold == 0.5f) {\n")
+        f.write("        return (mlp_logit(features) >= 0.0f) ? 1 : 0;\n")
+        f.write("    }\n")
+        f.write("    return (mlp_inference(features) >= threshold) ? 1 : 0;\n")
+        f.write("}\n\n")
+
+        _write_model_inference(f, "mlp_inference")
+        f.write("#endif // MODEL_WEIGHTS_H\n")
+
+    print(f"[+] Folded model exported to: {output_file}")
+
+    dense_macs = sum(a * b for a, b in zip(dense_sizes[:-1], dense_sizes[1:]))
+    macs = sum(int(np.count_nonzero(W)) for W in weights)
+    print("\n[*] Model Statistics:")
+    print(f"    Architecture: {arch} (dense: {' -> '.join(str(n) for n in dense_sizes)})")
+    print(f"    Weights dropped (|w| < {prune_eps:g} * layer max): {dropped}")
+    print(f"    Multiply-adds per request: {macs} (dense: {dense_macs})")
+    print(f"    Scaling: 0 divisions (was {n_input}); classify_request(0.5): 0 expf")
+    print(f"    Memory: constants inlined in code ({macs + sum(len(b) for b in biases)} floats)")
+    n_hidden = sum(len(b) for b in biases[:-1])
+    print_cost_estimate({"fadd": macs, "fmul": macs, "fcmp": n_hidden, "expf": 1})
+    print_cost_estimate({"fadd": macs, "fmul": macs, "fcmp": n_hidden + 1},
+                        label="classify_request(0.5)")
+
+
+def _tree_threshold_f32(threshold):
+    """
+    sklearn, float32 x'i float64 threshold ile karşılaştırır (x <= t). Firmware'de
+    aynı kararı float32 karşılaştırmayla vermek için t'yi aşağı doğru float32'ye yuvarla.
+    """
+    t32 = np.float32(threshold)
+    if float(t32) > threshold:
+        t32 = np.nextafter(t32, np.float32(-np.inf))
+    return t32
+
+
+def _tree_structure(model):
+    """
+    Returns: (P(malicious) per node, depth per node)
+    """
+    tree = model.tree_
+    positive = list(model.classes_).index(1)
+    value = tree.value[:, 0, :]
+    proba = value[:, positive] / value.sum(axis=1)
+
+    depth = np.zeros(tree.node_count, dtype=np.int64)
+    for node in range(tree.node_count):
+        if tree.children_left[node] != -1:
+            depth[tree.children_left[node]] = depth[node] + 1
+            depth[tree.children_right[node]] = depth[node] + 1
+    return proba, depth
+
+
+def _write_tree_ifelse(f, model, proba):
+    tree = model.tree_
+
+    def emit(node, indent):
+        pad = "    " * indent
+        if tree.children_left[node] == -1:
+            f.write(f"{pad}return {_c_float(proba[node])};\n")
+            return
+        threshold = _c_float(_tree_threshold_f32(tree.threshold[node]))
+        f.write(f"{pad}if (x[{tree.feature[node]}] <= {threshold}) {{\n")
+        emit(tree.children_left[node], indent + 1)
+        f.write(f"{pad}}} else {{\n")
+        emit(tree.children_right[node], indent + 1)
+        f.write(f"{pad}}}\n")
+
+    f.write("float tree_inference(const float x[N_INPUT]) {\n")
+    emit(0, 1)
+    f.write("}\n\n")
+
+
+def _write_tree_array(f, model, proba):
+    tree = model.tree_
+    n_nodes = tree.node_count
+    index_type = "int16_t" if n_nodes < 2**15 else "int32_t"
+    leaf = tree.children_left == -1
+    feature = np.where(leaf, -1, tree.feature)
+    threshold = [0.0 if leaf[i] else _tree_threshold_f32(tree.threshold[i]) for i in range(n_nodes)]
+    value = np.where(leaf, proba, 0.0)
+
+    f.write(f"#define TREE_N_NODES {n_nodes}\n\n")
+    f.write("// Node arrays (feature < 0 => leaf, TREE_VALUE = P(malicious))\n")
+    f.write(f"const int8_t TREE_FEATURE[TREE_N_NODES] = {{{_c_array(feature, '{:d}')}}};\n")
+    f.write(f"const float TREE_THRESHOLD[TREE_N_NODES] = {{{_c_float_array(threshold)}}};\n")
+    f.write(f"const {index_type} TREE_LEFT[TREE_N_NODES] = {{{_c_array(tree.children_left, '{:d}')}}};\n")
+    f.write(f"const {index_type} TREE_RIGHT[TREE_N_NODES] = {{{_c_array(tree.children_right, '{:d}')}}};\n")
+    f.write(f"const float TREE_VALUE[TREE_N_NODES] = {{{_c_float_array(value)}}};\n\n")
+
+    f.write("float tree_inference(const float x[N_INPUT]) {\n")
+    f.write("    int node = 0;\n")
+    f.write("    while (TREE_FEATURE[node] >= 0) {\n")
+    f.write("        node = (x[TREE_FEATURE[node]] <= TREE_THRESHOLD[node])\n")
+    f.write("            ? TREE_LEFT[node] : TREE_RIGHT[node];\n")
+    f.write("    }\n")
+    f.write("    return TREE_VALUE[node];\n")
+    f.write("}\n\n")
+    return n_nodes * (1 + 4 + 4 + 2 * np.dtype(index_type.replace("_t", "")).itemsize)
+
+
+def export_tree_to_c(model, output_file, style="ifelse"):
+    """
+    DecisionTreeClassifier'ı C header'ına yaz.
+    style: "ifelse" (iç içe if/else, veri tablosu yok) veya "array" (kompakt node dizisi)
+    Ağaç ham feature'larla eğitildiği için scaling ve expf gerekmez.
+    """
+    tree = model.tree_
+    n_input = model.n_features_in_
+    proba, depth = _tree_structure(model)
+    leaves = tree.children_left == -1
+    max_depth = int(depth[leaves].max())
+    # Eğitim örneklerine göre ağırlıklı ortalama yaprak derinliği = ortalama karşılaştırma sayısı
+    samples = tree.n_node_samples[leaves]
+    avg_depth = float(np.sum(depth[leaves] * samples) / np.sum(samples))
+
+    with open(output_file, 'w') as f:
+        f.write("// Auto-generated decision tree model\n")
+        f.write(f"// DecisionTree: {tree.node_count} nodes, {int(leaves.sum())} leaves, "
+                f"depth {max_depth} ({style})\n")
+        f.write("// Raw (unscaled) features, float comparisons only\n\n")
+        f.write("#ifndef MODEL_WEIGHTS_H\n")
+        f.write("#define MODEL_WEIGHTS_H\n\n")
+        f.write("#include <stdint.h>\n\n")
+
+        f.write(f"#define N_INPUT {n_input}\n")
+        f.write("#define N_OUTPUT 1\n\n")
+
+        f.write("// Tree inference: returns P(malicious) of the reached leaf\n")
+        if style == "array":
+            table_bytes = _write_tree_array(f, model, proba)
+        else:
+            table_bytes = 0
+            _write_tree_ifelse(f, model, proba)
+
+        _write_model_inference(f, "tree_inference")
+
+        f.write("// Classify request: 0=benign, 1=malicious\n")
+        f.write("int classify_request(const float features[N_INPUT], float threshold=0.5f) {\n")
+        f.write("    return (tree_inference(features) >= threshold) ? 1 : 0;\n")
+        f.write("}\n\n")
+
+        f.write("#endif // MODEL_WEIGHTS_H\n")
+
+    print(f"[+] Decision tree exported to: {output_file}")
+
+    print("\n[*] Model Statistics:")
+    print(f"    Nodes: {tree.node_count}, leaves: {int(leaves.sum())}, depth: {max_depth}")
+    if style == "array":
+        print(f"    Memory (node arrays): {table_bytes} bytes (~{table_bytes/1024:.2f} KB)")
+    else:
+        print("    Memory: thresholds inlined in code (no tables)")
+    print_cost_estimate({"fcmp": max_depth}, label="Ops per request (worst case)")
+    print_cost_estimate({"fcmp": round(avg_depth, 2)}, label="Ops per request (average)")
+
+
+def fold_linear(model, scaler, prune_eps=0.0):
+    """
+    Lineer model (LogisticRegression / SGDClassifier) ağırlıklarına scaler'ı katla.
+    Returns: (weights, bias, dropped_weights)
+    """
+    w = np.array(model.coef_[0], dtype=np.float64)
+    b = float(model.intercept_[0])
+    dropped = 0
+    if prune_eps > 0.0:
+        mask = np.abs(w) < prune_eps * np.max(np.abs(w))
+        dropped = int(np.count_nonzero(mask & (w != 0.0)))
+        w[mask] = 0.0
+
+    mean = scaler.mean_.astype(np.float64)
+    scale = scaler.scale_.astype(np.float64)
+    return w / scale, b - float((mean / scale) @ w), dropped
+
+
+def export_linear_to_c(model, scaler, output_file, prune_eps=0.0):
+    """
+    Logistic regression'ı (scaler katlanmış) tek bir dot product olarak C header'ına yaz.
+    Varsayılan olarak budama yok: ~23 ağırlıkta kazanç ihmal edilebilir, 1e-4 bile
+    --verify toleransını aşan olasılık farkı üretiyor.
+    """
+    weights, bias, dropped = fold_linear(model, scaler, prune_eps)
+    n_input = len(weights)
+    n_terms = int(np.count_nonzero(weights))
+
+    with open(output_file, 'w') as f:
+        f.write(f"// Auto-generated linear model ({type(model).__name__})\n")
+        f.write("// P(malicious) = sigmoid(b + w . x), StandardScaler folded into w and b\n\n")
+        f.write("#ifndef MODEL_WEIGHTS_H\n")
+        f.write("#define MODEL_WEIGHTS_H\n\n")
+        f.write("#include <math.h>\n\n")
+
+        f.write(f"#define N_INPUT {n_input}\n")
+        f.write("#define N_OUTPUT 1\n\n")
+
+        f.write("// Logit: single dot product over raw (unscaled) features[22]\n")
+        f.write("float linear_logit(const float x[N_INPUT]) {\n")
+        inputs = [f"x[{i}]" for i in range(n_input)]
+        f.write(f"    return {_c_linear_terms(bias, inputs, weights)};\n")
+        f.write("}\n\n")
+
+        f.write("// Probability [0.0, 1.0] (>0.5 = malicious)\n")
+        f.write("float linear_inference(const float features[N_INPUT]) {\n")
+        f.write("    return 1.0f / (1.0f + expf(-linear_logit(features)));\n")
+        f.write("}\n\n")
+
+        _write_model_inference(f, "linear_inference")
+
+        f.write("// Classify request: 0=benign, 1=malicious\n")
+        f.write("// threshold 0.5 <=> logit >= 0: no expf\n")
+        f.write("int classify_request(const float features[N_INPUT], float threshold=0.5f) {\n")
+        f.write("    if (threshold == 0.5f) {\n")
+        f.write("        return (linear_logit(features) >= 0.0f) ? 1 : 0;\n")
+        f.write("    }\n")
+        f.write("    return (linear_inference(features) >= threshold) ? 1 : 0;\n")
+        f.write("}\n\n")
+
+        f.write("#endif // MODEL_WEIGHTS_H\n")
+
+    print(f"[+] Linear model exported to: {output_file}")
+
+    print("\n[*] Model Statistics:")
+    pruned = f" (dropped |w| < {prune_eps:g} * max: {dropped})" if prune_eps > 0.0 else ""
+    print(f"    Weights: {n_terms} non-zero of {n_input}{pruned} + bias")
+    print("    Memory: constants inlined in code")
+    print_cost_estimate({"fadd": n_terms, "fmul": n_terms, "expf": 1})
+    print_cost_estimate({"fadd": n_terms, "fmul": n_terms, "fcmp": 1},
+                        label="classify_request(0.5)")
+
+
+def model_kind(model):
+    """
+    Returns: "mlp", "tree" veya "linear"
+    """
+    if isinstance(model, MLPClassifier):
+        return "mlp"
+    if isinstance(model, DecisionTreeClassifier):
+        return "tree"
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return "linear"
+    raise ValueError(f"Desteklenmeyen model tipi: {type(model).__name__}")
+
+
+def reference_proba(model, scaler, X):
+    """
+    Export edilen C kodunun vermesi gereken P(malicious) (float64, sklearn).
+    Lineer modellerde sigmoid(decision_function): SGD (hinge vb.) için de tanımlı.
+    """
+    kind = model_kind(model)
+    if kind == "tree":
+        return model.predict_proba(X)[:, list(model.classes_).index(1)]
+    X_scaled = scaler.transform(X)
+    if kind == "linear":
+        return expit(model.decision_function(X_scaled))
+    return model.predict_proba(X_scaled)[:, 1]
+
+
+VERIFY_SOURCE = """
+#include "scaler_params.h"
+#include "model_weights.h"
+
+extern "C" void score_batch(const float* X, int n, float* proba, int* label) {
+    float f[N_FEATURES];
+    for (int r = 0; r < n; r++) {
+        for (int i = 0; i < N_FEATURES; i++) {
+            f[i] = X[r * N_FEATURES + i];
+        }
+        scale_features(f);
+        proba[r] = model_inference(f);
+        label[r] = classify_request(f);
+    }
+}
+"""
+
+
+def verify_export(header_dir, X, ref_proba, ref_label, tolerance=1e-4):
+    """
+    Üretilen header'ları host C++ derleyicisiyle derleyip referans (sklearn veya
+    quantization referansı) ile karşılaştır.
+    Returns: True / False (derleyici yoksa None)
+    """
+    import ctypes
+    from host_build import build_shared_library, find_compiler
+
+    if find_compiler() is None:
+        print("[!] C++ compiler not found, skipping host-side verification")
+        return None
+
+    print(f"\n[*] Verifying exported headers with a host C++ build ({len(X)} samples)...")
+    lib = build_shared_library(VERIFY_SOURCE, include_dirs=[header_dir], name="verify_export")
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    proba = np.empty(len(X), dtype=np.float32)
+    label = np.empty(len(X), dtype=np.int32)
+    lib.score_batch(
+        X.ctypes.data_as(ctypes.POINTER(ctypes.c_float)), ctypes.c_int(len(X)),
+        proba.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+        label.ctypes.data_as(ctypes.POINTER(ctypes.c_int))
+    )
+
+    diff = np.abs(proba.astype(np.float64) - ref_proba)
+    # Threshold'a tolerans kadar yakın örneklerde karar farkı beklenebilir
+    decided = np.abs(ref_proba - 0.5) > tolerance
+    mismatches = int(np.sum((label != ref_label) & decided))
+    print(f"    Max |p_C - p_ref|: {diff.max():.3g} (mean {diff.mean():.3g})")
+    print(f"    Decision mismatches: {mismatches} / {len(X)} "
+          f"({int(np.sum(~decided))} samples within {tolerance:g} of the threshold)")
+    ok = diff.max() <= tolerance and mismatches == 0
+    print("[+] Host C build matches the reference" if ok
+          else "[!] Host C build does NOT match the reference")
+    return ok
 
 
 def main():
-    import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_dir = os.path.dirname(script_dir)
-    
+
+    parser = argparse.ArgumentParser(description="Modeli ESP8266 için C header'larına export et")
+    parser.add_argument("--mode", choices=["float", "folded", "int8"], default="float",
+                        help="MLP için: float: float32 ağırlıklar; folded: scaler katlanmış, budanmış, "
+                             "unroll edilmiş float32; int8: quantize edilmiş integer-only inference")
+    parser.add_argument("--tree-style", choices=["ifelse", "array"], default="ifelse",
+                        help="DecisionTree: iç içe if/else veya kompakt node dizisi")
+    parser.add_argument("--csv", default=os.path.join(project_dir, "http_requests_labeled.csv"),
+                        help="int8 kalibrasyonu (train split) ve doğrulama (test split) için CSV")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Feature cache'i kullanma, CSV'den yeniden çıkar")
+    parser.add_argument("--calib-samples", type=int, default=100000,
+                        help="int8: kalibrasyonda kullanılacak maksimum train örneği")
+    parser.add_argument("--prune-eps", type=float, default=None,
+                        help="folded/lineer: |w| < eps * katman max|W| olan ağırlıkları at "
+                             "(0 = budama yok; varsayılan folded 1e-4, lineer 0)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Header'ları host C++ derleyicisiyle derleyip test split'inde referansla karşılaştır")
+    parser.add_argument("--output-dir", default=os.path.join(project_dir, "esp8266_firmware"),
+                        help="Header'ların yazılacağı dizin")
+    args = parser.parse_args()
+
     print("[*] Loading trained model and scaler...")
     
     # Model ve scaler'ı yükle
@@ -212,25 +850,87 @@ def main():
     print(f"    Scaler type: {type(scaler).__name__}")
     
     # Export
-    firmware_dir = os.path.join(project_dir, "esp8266_firmware")
+    firmware_dir = args.output_dir
     os.makedirs(firmware_dir, exist_ok=True)
-    
-    print("\n[*] Exporting scaler parameters...")
-    export_scaler_to_c(scaler, os.path.join(firmware_dir, "scaler_params.h"))
-    
-    print("\n[*] Exporting model weights...")
-    export_mlp_to_c(model, os.path.join(firmware_dir, "model_weights.h"))
+    scaler_file = os.path.join(firmware_dir, "scaler_params.h")
+    model_file = os.path.join(firmware_dir, "model_weights.h")
+
+    kind = model_kind(model)
+    if kind != "mlp" and args.mode != "float":
+        print(f"[!] --mode {args.mode} only applies to MLP models, ignoring")
+    mlp_mode = args.mode if kind == "mlp" else None
+
+    if mlp_mode == "int8" or args.verify:
+        from train_models import load_training_data, split_dataset
+
+        X, y = load_training_data(args.csv, args.no_cache)
+        X_train, _, X_test, _, _, y_test = split_dataset(X, y)
+
+    if kind == "tree":
+        print("\n[*] Exporting scaler (trees use raw features)...")
+        export_identity_scaler_to_c(model.n_features_in_, scaler_file,
+                                    "Decision tree uses raw features (no scaling)")
+
+        print("\n[*] Exporting decision tree...")
+        export_tree_to_c(model, model_file, args.tree_style)
+    elif kind == "linear":
+        print("\n[*] Exporting scaler (folded into the weights)...")
+        export_identity_scaler_to_c(len(scaler.mean_), scaler_file,
+                                    "StandardScaler folded into model_weights.h (linear model)")
+
+        print("\n[*] Exporting linear model...")
+        export_linear_to_c(model, scaler, model_file,
+                           0.0 if args.prune_eps is None else args.prune_eps)
+    elif mlp_mode == "int8":
+        if len(X_train) > args.calib_samples:
+            rng = np.random.default_rng(42)
+            X_train = X_train[rng.choice(len(X_train), args.calib_samples, replace=False)]
+
+        print(f"\n[*] Calibrating int8 quantization on {len(X_train)} train samples...")
+        params = quantize_mlp(model, scaler, X_train)
+        evaluate_quantization(model, scaler, params, X_test, y_test)
+
+        print("\n[*] Exporting scaler (folded into input quantization)...")
+        export_identity_scaler_to_c(len(scaler.mean_), scaler_file,
+                                    "StandardScaler folded into model_weights.h (int8 mode)")
+
+        print("\n[*] Exporting int8 model...")
+        export_mlp_int8_to_c(params, model_file)
+    elif mlp_mode == "folded":
+        print("\n[*] Exporting scaler (folded into layer 1)...")
+        export_identity_scaler_to_c(len(scaler.mean_), scaler_file,
+                                    "StandardScaler folded into model_weights.h (folded mode)")
+
+        print("\n[*] Exporting folded model...")
+        export_mlp_folded_to_c(model, scaler, model_file,
+                               1e-4 if args.prune_eps is None else args.prune_eps)
+    else:
+        print("\n[*] Exporting scaler parameters...")
+        export_scaler_to_c(scaler, scaler_file)
+
+        print("\n[*] Exporting model weights...")
+        export_mlp_to_c(model, model_file)
+
+    if args.verify:
+        if mlp_mode == "int8":
+            ref_proba = quantized_predict_proba(params, X_test)
+            ref_label = quantized_predict(params, X_test)
+        else:
+            ref_proba = reference_proba(model, scaler, X_test)
+            ref_label = (ref_proba >= 0.5).astype(np.int32)
+        verify_export(firmware_dir, X_test, ref_proba, ref_label)
     
     print("\n" + "="*60)
     print("✅ Export complete!")
     print("="*60)
     print("\nGenerated files:")
     print("  - scaler_params.h   (feature scaling)")
-    print("  - model_weights.h   (MLP inference)")
+    print(f"  - model_weights.h   ({type(model).__name__} inference"
+          f"{', ' + mlp_mode if mlp_mode else ''})")
     print("\nNext steps:")
     print("  1. Copy these .h files to your ESP8266 project")
     print("  2. Include them in your Arduino sketch")
-    print("  3. Use scale_features() and mlp_inference() functions")
+    print("  3. Use scale_features() and model_inference() functions")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Parse edilmiş CSV ile eğitim arasındaki feature cache'i.
+(N, 22) float32 X ve int32 y, .npy dosyaları olarak saklanır ve
+np.load(mmap_mode="r") ile kopyalanmadan açılır.
+Cache anahtarı: CSV içeriğinin hash'i + features.feature_version().
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from features import N_FEATURES, feature_version, load_dataset_from_csv
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feature_cache")
+HASH_BLOCK_SIZE = 16 * 1024 * 1024
+# Başka process'lere ait yarım kalmış build dizinleri ("<key>.<pid>.tmp") ancak bu
+# kadar süredir hiç yazılmamışsa silinir; devam eden build'ler dosyalarına yazmaya devam eder
+STALE_TMP_SECONDS = 3600
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def csv_content_hash(csv_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    CSV'nin içerik hash'i. (size, mtime) değişmediyse index'teki hash
+    yeniden kullanılır; böylece büyük CSV'ler her seferinde okunmaz.
+    """
+    real = os.path.realpath(csv_path)
+    st = os.stat(real)
+    index_path = os.path.join(cache_dir, "index.json")
+    index = _load_json(index_path, {})
+
+    entry = index.get(real)
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = _file_sha256(real)
+    index[real] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_json(index_path, index)
+    return digest
+
+
+def cache_entry_dir(csv_path, cache_dir=DEFAULT_CACHE_DIR):
+    key = f"{csv_content_hash(csv_path, cache_dir)[:16]}-{feature_version()}"
+    return os.path.join(cache_dir, key)
+
+
+def _last_write_time(path):
+    """Dizinin ve içindeki dosyaların en son değişme zamanı (okunamazsa None)."""
+    try:
+        latest = os.stat(path).st_mtime
+        for name in os.listdir(path):
+            latest = max(latest, os.stat(os.path.join(path, name)).st_mtime)
+    except OSError:
+        return None
+    return latest
+
+
+def _is_abandoned_tmp(entry, name, now):
+    """
+    Build temp dizini silinebilir mi: bu process'e ait (önceki başarısız build)
+    veya STALE_TMP_SECONDS'tır yazılmamış. Başka process'in devam eden build'i korunur.
+    """
+    pid = name[:-len(".tmp")].rpartition(".")[2]
+    if pid == str(os.getpid()):
+        return True
+    last_write = _last_write_time(entry)
+    return last_write is not None and now - last_write > STALE_TMP_SECONDS
+
+
+def _prune_stale_entries(cache_dir, source, keep):
+    """
+    Aynı kaynak CSV'ye ait eski (başka hash / feature versiyonu) kayıtları ve
+    terk edilmiş build temp dizinlerini sil.
+    """
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if entry == keep or not os.path.isdir(entry):
+            continue
+        if name.endswith(".tmp"):
+            if _is_abandoned_tmp(entry, name, now):
+                shutil.rmtree(entry, ignore_errors=True)
+            continue
+        meta = _load_json(os.path.join(entry, "meta.json"), {})
+        if meta.get("source") == source:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def build_feature_cache(csv_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    CSV'den feature'ları çıkarıp cache'e yaz. Returns: cache kayıt dizini
+    """
+    entry = cache_entry_dir(csv_path, cache_dir)
+    X, y = load_dataset_from_csv(csv_path)
+
+    tmp = f"{entry}.{os.getpid()}.tmp"
+    os.makedirs(tmp, exist_ok=True)
+    np.save(os.path.join(tmp, "X.npy"), np.ascontiguousarray(X, dtype=np.float32))
+    np.save(os.path.join(tmp, "y.npy"), np.ascontiguousarray(y, dtype=np.int32))
+    _write_json(os.path.join(tmp, "meta.json"), {
+        "source": os.path.realpath(csv_path),
+        "feature_version": feature_version(),
+        "n_samples": int(len(y)),
+        "n_features": N_FEATURES,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+
+    if os.path.isdir(entry):
+        shutil.rmtree(entry, ignore_errors=True)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Aynı kaydı eşzamanlı üreten başka bir process önce bitirdi; onunkini kullan
+        if not os.path.exists(os.path.join(entry, "meta.json")):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+    _prune_stale_entries(cache_dir, os.path.realpath(csv_path), keep=entry)
+    return entry
+
+
+def load_features_cached(csv_path, cache_dir=DEFAULT_CACHE_DIR, rebuild=False):
+    """
+    Feature matrisini cache'ten yükle; yoksa (veya CSV / feature tanımı
+    değiştiyse) CSV'den üretip cache'e yaz.
+    Returns: (X, y) - read-only memory-mapped numpy array'ler
+    """
+    entry = cache_entry_dir(csv_path, cache_dir)
+    if rebuild or not os.path.exists(os.path.join(entry, "meta.json")):
+        print("[*] Feature cache miss, extracting features from CSV...")
+        entry = build_feature_cache(csv_path, cache_dir)
+        print(f"[+] Feature cache written: {entry}")
+    else:
+        print(f"[+] Feature cache hit: {entry}")
+
+    X = np.load(os.path.join(entry, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(entry, "y.npy"), mmap_mode="r")
+    return X, y
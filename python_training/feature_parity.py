@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Python feature extraction ile firmware'deki C extract_features()
+(esp8266_firmware/include/esp8266_features.h) arasındaki parity testi.
+
+Header host C++ derleyicisiyle shared library'ye derlenir, ctypes ile
+parse edilmiş log satırlarından oluşan bir corpus üzerinde çağrılır ve
+vektörler feature bazında Python yoluyla karşılaştırılır. Aynı çalıştırma
+C extractor'ın istek başına maliyetini de ölçer (micro-benchmark).
+
+    python3 feature_parity.py --csv ../http_requests_labeled.csv --rows 200000
+"""
+import argparse
+import ctypes
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from bench_features import load_rows_from_csv, make_synthetic_rows
+from features import N_FEATURES, extract_features_batch, parse_headers_str
+from host_build import build_shared_library, find_compiler
+from ip_window import IPWindowTracker, ip_to_u32
+
+FIRMWARE_INCLUDE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "esp8266_firmware", "include"
+)
+
+FEATURE_NAMES = [
+    "method_get", "method_post", "method_head", "method_other",
+    "path_length", "num_params", "max_param_len",
+    "has_login_keyword", "has_sqli_pattern", "has_xss_pattern", "path_entropy",
+    "num_headers", "user_agent_length", "has_suspicious_ua", "content_length",
+    "has_uncommon_header", "accept_language_length", "host_length", "referer_length",
+    "req_count_last_10s", "login_admin_hits_last_60s", "unique_paths_last_60s",
+]
+
+# Firmware en fazla 20 header satırı saklar (esp8266_waf.ino: headers[20])
+FIRMWARE_MAX_HEADERS = 20
+
+# ip_window.h: IP_WINDOW_MAX_IPS (LRU davranışı da karşılaştırılsın diye Python tarafı aynı boyutta)
+FIRMWARE_MAX_IPS = 32
+
+# ip/timestamp kolonu olmayan corpus'lar için sentetik istemciler (tablodan fazla -> eviction)
+SYNTHETIC_CLIENTS = 48
+SYNTHETIC_START_TIME = 1700000000.0
+SYNTHETIC_MEAN_GAP = 0.02
+
+# Entropy: Python float64 math.log2, C float32 log2f
+ENTROPY_TOLERANCE = 1e-4
+
+# Bilinen sınır durumları: sentetik / gerçek corpus'ta nadir görülenler
+EDGE_CASES = [
+    {"method": "get", "path": "/", "query": "", "user_agent": "", "headers": "", "content_length": "0"},
+    {"method": "PUT", "path": "/a", "query": "a=1&&b=", "user_agent": "curl/7.1",
+     "headers": "User-Agent: curl/7.1", "content_length": "12"},
+    {"method": "GET", "path": "/search", "query": "q" * 300 + "&x=' union select 1--",
+     "user_agent": "Mozilla/5.0", "headers": "Host: example.com", "content_length": "0"},
+    {"method": "GET", "path": "/" + "a" * 400 + "/wp-login.php", "query": "",
+     "user_agent": "Mozilla/5.0", "headers": "", "content_length": "0"},
+    {"method": "POST", "path": "/login", "query": "noequals&k=v=w", "user_agent": "python-requests/2.25",
+     "headers": "Accept-Language:  en-US,en ;Referer: https://example.com/;X-Forwarded-For: 1.2.3.4",
+     "content_length": "abc"},
+    {"method": "HEAD", "path": "/", "query": "", "user_agent": "Mozilla/5.0 (compatible; MSIE 9.0)",
+     "headers": "User-Agent: Mozilla/5.0 (compatible; MSIE 9.0);Host: h", "content_length": "0"},
+]
+
+WRAPPER_SOURCE = """
+#include "esp8266_features.h"
+#include "ip_window.h"
+
+extern "C" void extract_batch(
+    const char** method, const char** path, const char** query, const char** user_agent,
+    const char** headers, const int* header_start, const int* content_length,
+    int n, float* out
+) {
+    for (int r = 0; r < n; r++) {
+        extract_features(method[r], path[r], query[r], user_agent[r],
+                         headers + header_start[r], header_start[r + 1] - header_start[r],
+                         content_length[r], out + r * 22);
+    }
+}
+
+extern "C" void window_batch(
+    const unsigned int* ip, const unsigned int* sec, const char** path, int n, float* out
+) {
+    ip_window_reset();
+    for (int r = 0; r < n; r++) {
+        float* f = out + r * 22;
+        ip_window_observe(ip[r], sec[r], path[r], f[7] > 0.5f, f + 19);
+    }
+}
+"""
+
+
+def load_c_extractor(include_dir=FIRMWARE_INCLUDE_DIR):
+    lib = build_shared_library(WRAPPER_SOURCE, include_dirs=[include_dir], name="features")
+    lib.extract_batch.restype = None
+    lib.window_batch.restype = None
+    return lib
+
+
+def assign_clients(rows, seed=42):
+    """
+    ip/timestamp'i olmayan satırlara sentetik istemci ve artan zaman damgası ata
+    (f19-f21 her corpus'ta test edilsin diye). Sıcak birkaç IP + uzun kuyruk.
+    """
+    rng = random.Random(seed)
+    ips = [f"10.1.{i // 256}.{i % 256}" for i in range(SYNTHETIC_CLIENTS)]
+    weights = [1.0 / (i + 1) for i in range(SYNTHETIC_CLIENTS)]
+    t = SYNTHETIC_START_TIME
+    out = []
+    for r in rows:
+        t += rng.expovariate(1.0 / SYNTHETIC_MEAN_GAP)
+        if r.get("ip") and r.get("timestamp"):
+            out.append(r)
+            continue
+        r = dict(r)
+        r["ip"] = r.get("ip") or rng.choices(ips, weights)[0]
+        r["timestamp"] = r.get("timestamp") or f"{t:.3f}"
+        out.append(r)
+    return out
+
+
+def _header_lines(headers_str):
+    """
+    CSV'deki "Name: value;Name: value" -> firmware'in göreceği header satırları.
+    Python ile aynı ayrıştırma kullanılır (parse_headers_str): ';' içeren değerler
+    (ör. User-Agent) CSV formatında zaten bölünmüş olur, C tarafına aynı görünüm verilir.
+    """
+    headers = parse_headers_str(headers_str or "")
+    return [f"{name}: {value}" for name, value in headers.items()][:FIRMWARE_MAX_HEADERS]
+
+
+def _content_length_int(value):
+    # Firmware: String::toInt() (parse edilemezse 0), Python ile aynı
+    try:
+        return int(value or "0")
+    except ValueError:
+        return 0
+
+
+class CBatch:
+    """
+    Satırları C'ye verilecek ctypes dizilerine bir kez dönüştür (benchmark'ta
+    tekrar tekrar kullanılabilsin diye).
+    """
+
+    def __init__(self, rows):
+        def strings(values):
+            arr = (ctypes.c_char_p * len(values))()
+            arr[:] = [(v or "").encode("utf-8") for v in values]
+            return arr
+
+        self.n = len(rows)
+        self.method = strings([r.get("method") for r in rows])
+        self.path = strings([r.get("path") for r in rows])
+        self.query = strings([r.get("query") for r in rows])
+        self.user_agent = strings([r.get("user_agent") for r in rows])
+
+        header_lines, starts = [], [0]
+        for r in rows:
+            header_lines.extend(_header_lines(r.get("headers")))
+            starts.append(len(header_lines))
+        self.headers = strings(header_lines) if header_lines else (ctypes.c_char_p * 1)()
+        self.header_start = (ctypes.c_int * len(starts))(*starts)
+        self.content_length = (ctypes.c_int * self.n)(
+            *[_content_length_int(r.get("content_length")) for r in rows]
+        )
+        self.ip = (ctypes.c_uint * self.n)(*[ip_to_u32(r["ip"]) for r in rows])
+        self.sec = (ctypes.c_uint * self.n)(*[int(float(r["timestamp"])) for r in rows])
+        self.out = np.zeros((self.n, N_FEATURES), dtype=np.float32)
+
+    def run(self, lib):
+        out = self.out.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+        lib.extract_batch(
+            self.method, self.path, self.query, self.user_agent,
+            self.headers, self.header_start, self.content_length,
+            ctypes.c_int(self.n), out
+        )
+        lib.window_batch(self.ip, self.sec, self.path, ctypes.c_int(self.n), out)
+        return self.out
+
+
+def python_features(rows):
+    columns = {
+        name: [r.get(name) for r in rows]
+        for name in ("method", "path", "query", "user_agent", "headers", "content_length",
+                     "ip", "timestamp")
+    }
+    return extract_features_batch(
+        columns["method"], columns["path"], columns["query"],
+        columns["user_agent"], columns["headers"], columns["content_length"],
+        ips=columns["ip"], timestamps=columns["timestamp"],
+        window=IPWindowTracker(max_ips=FIRMWARE_MAX_IPS),
+    )
+
+
+def compare(X_py, X_c, rows, show=3):
+    """
+    Feature bazında fark raporu. Returns: farklı satır sayısı
+    """
+    tolerance = np.zeros(N_FEATURES, dtype=np.float32)
+    tolerance[FEATURE_NAMES.index("path_entropy")] = ENTROPY_TOLERANCE
+    bad = np.abs(X_py - X_c) > tolerance
+
+    print(f"\n{'Feature':29s} | {'Mismatch':>9s} | {'Max |diff|':>10s}")
+    print("-" * 55)
+    for j, name in enumerate(FEATURE_NAMES):
+        count = int(bad[:, j].sum())
+        max_diff = float(np.max(np.abs(X_py[:, j] - X_c[:, j]))) if len(X_py) else 0.0
+        marker = "  <-- DRIFT" if count else ""
+        print(f"f{j:<2d} {name:25s} | {count:9d} | {max_diff:10.4g}{marker}")
+
+        for i in np.flatnonzero(bad[:, j])[:show]:
+            row = rows[i]
+            print(f"      row {i}: python={X_py[i, j]:g} c={X_c[i, j]:g} "
+                  f"method={row.get('method')!r} path={(row.get('path') or '')[:60]!r} "
+                  f"query={(row.get('query') or '')[:60]!r} headers={(row.get('headers') or '')[:60]!r}")
+
+    return int(bad.any(axis=1).sum())
+
+
+def benchmark(lib, batch, repeats):
+    """
+    C extractor'ın istek başına süresi (ctypes çağrı maliyeti batch'e dağılır).
+    """
+    batch.run(lib)  # ısınma
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        batch.run(lib)
+        best = min(best, time.perf_counter() - t0)
+    return best / max(batch.n, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python <-> C feature extraction parity testi")
+    parser.add_argument("--csv", help="Corpus: parse_access_log CSV'si (verilmezse sentetik)")
+    parser.add_argument("--rows", type=int, default=100000, help="Maksimum satır sayısı")
+    parser.add_argument("--include-dir", default=FIRMWARE_INCLUDE_DIR,
+                        help="esp8266_features.h dizini")
+    parser.add_argument("--repeats", type=int, default=5, help="Benchmark tekrar sayısı")
+    args = parser.parse_args()
+
+    if find_compiler() is None:
+        print("[!] C++ compiler not found (install g++/clang++ or set CXX)")
+        sys.exit(2)
+
+    if args.csv:
+        print(f"[*] Loading rows from {args.csv} ...")
+        rows = load_rows_from_csv(args.csv, args.rows)
+    else:
+        print(f"[*] Generating {args.rows} synthetic rows ...")
+        rows = make_synthetic_rows(args.rows)
+    rows = assign_clients(EDGE_CASES + rows)
+    print(f"    {len(rows)} rows (incl. {len(EDGE_CASES)} edge cases)")
+
+    print("[*] Compiling esp8266_features.h with the host compiler ...")
+    lib = load_c_extractor(args.include_dir)
+
+    t0 = time.perf_counter()
+    X_py = python_features(rows)
+    t_py = time.perf_counter() - t0
+
+    batch = CBatch(rows)
+    X_c = batch.run(lib).copy()
+    n_bad = compare(X_py, X_c, rows)
+
+    per_request = benchmark(lib, batch, args.repeats)
+    print(f"\n{'='*60}")
+    print(f"PARITY: {len(rows) - n_bad} / {len(rows)} rows identical "
+          f"({n_bad} differ)")
+    print(f"C extract_features (host): {per_request * 1e9:,.0f} ns/request "
+          f"({1 / per_request:,.0f} requests/sec)")
+    print(f"Python batch extraction:   {t_py / len(rows) * 1e9:,.0f} ns/request")
+    print('='*60)
+
+    if n_bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,30 @@
 HTTP request feature extraction (22 boyutlu sayısal vektör).
 """
 import csv
+import hashlib
+import json
 import math
-from typing import List, Dict, Tuple
+from typing import List, Dict, Sequence, Tuple
+
+import numpy as np
+
+from ip_window import IPWindowTracker, behavioral_features, window_spec
+from pattern_matcher import PatternMatcher
+
+N_FEATURES = 22
+
+# Toplu extraction'daki string kolonları: numpy >= 2.0'da değişken genişlikli
+# StringDType + np.strings, eski sürümlerde sabit genişlikli '<U' + np.char
+if hasattr(np, "strings"):
+    _STR_DTYPE = np.dtypes.StringDType()
+    _strings = np.strings
+else:
+    _STR_DTYPE = np.str_
+    _strings = np.char
+
+# Feature extraction mantığı değiştiğinde artırılır (feature cache'ini geçersiz kılar).
+# Pattern listelerindeki değişiklikler feature_version() ile otomatik yakalanır.
+FEATURE_SCHEMA = 2
 
 LOGIN_KEYWORDS = [
     "admin", "login", "wp-admin", "wp-login", "phpmyadmin",
@@ -33,6 +55,28 @@ COMMON_HEADERS = {
 }
 
 
+# Import sırasında bir kez derlenen automaton'lar
+REQUEST_MATCHER = PatternMatcher({
+    "login": LOGIN_KEYWORDS,
+    "sqli": SQLI_PATTERNS,
+    "xss": XSS_PATTERNS,
+})
+UA_MATCHER = PatternMatcher({"suspicious_ua": SUSPICIOUS_UA_KEYWORDS})
+
+
+def feature_version() -> str:
+    """
+    Feature tanımının özeti: FEATURE_SCHEMA + tüm pattern/header listeleri.
+    Listelerden biri değişirse farklı bir değer döner.
+    """
+    spec = [
+        FEATURE_SCHEMA, N_FEATURES,
+        LOGIN_KEYWORDS, SQLI_PATTERNS, XSS_PATTERNS,
+        SUSPICIOUS_UA_KEYWORDS, sorted(COMMON_HEADERS), window_spec(),
+    ]
+    return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()[:16]
+
+
 def shannon_entropy(s: str) -> float:
     if not s:
         return 0.0
@@ -47,14 +91,6 @@ def shannon_entropy(s: str) -> float:
     return ent
 
 
-def contains_any(haystack: str, patterns: List[str]) -> int:
-    h = haystack.lower()
-    for p in patterns:
-        if p in h:
-            return 1
-    return 0
-
-
 def parse_headers_str(headers_str: str) -> Dict[str, str]:
     headers = {}
     if not headers_str:
@@ -70,24 +106,33 @@ def parse_headers_str(headers_str: str) -> Dict[str, str]:
     return headers
 
 
-def extract_features_from_row(row: Dict[str, str]) -> Tuple[List[float], int]:
-    """
-    row: {'ip','method','path','query','user_agent','headers','content_length','label'}
-    Returns: (features[22], label)
-    """
-    method = (row.get("method") or "").upper()
-    path = row.get("path") or ""
-    query = row.get("query") or ""
-    ua = row.get("user_agent") or ""
-    headers_str = row.get("headers") or ""
-    content_length_str = row.get("content_length") or "0"
-    label_str = row.get("label") or "0"
-
-    # 0-3: method one-hot
+def _method_features(method: str) -> Tuple[int, int, int, int]:
+    """f0-f3: method one-hot (GET, POST, HEAD, OTHER)."""
+    method = (method or "").upper()
     m_get = 1 if method == "GET" else 0
     m_post = 1 if method == "POST" else 0
     m_head = 1 if method == "HEAD" else 0
     m_other = 1 if (method not in ("GET", "POST", "HEAD")) else 0
+    return m_get, m_post, m_head, m_other
+
+
+def _request_line_patterns(path: str, query: str) -> Tuple[int, int, int, float]:
+    """f7-f10: login/sqli/xss flag'leri (Aho-Corasick) ve path+query entropy'si."""
+    path = path or ""
+    query = query or ""
+    combined = path + "?" + query if query else path
+
+    flags = REQUEST_MATCHER.scan(combined)
+    has_login_keyword = 1 if flags & REQUEST_MATCHER.bits["login"] else 0
+    has_sqli_pattern = 1 if flags & REQUEST_MATCHER.bits["sqli"] else 0
+    has_xss_pattern = 1 if flags & REQUEST_MATCHER.bits["xss"] else 0
+    return has_login_keyword, has_sqli_pattern, has_xss_pattern, shannon_entropy(combined)
+
+
+def _request_line_features(path: str, query: str) -> Tuple[int, int, int, int, int, int, float]:
+    """f4-f10: path_length, num_params, max_param_len, keyword flag'leri, entropy."""
+    path = path or ""
+    query = query or ""
 
     # 4: path_length
     path_length = len(path)
@@ -106,22 +151,28 @@ def extract_features_from_row(row: Dict[str, str]) -> Tuple[List[float], int]:
             if len(v) > max_param_len:
                 max_param_len = len(v)
 
-    combined = path + "?" + query if query else path
+    (has_login_keyword, has_sqli_pattern, has_xss_pattern,
+     path_entropy) = _request_line_patterns(path, query)
 
-    has_login_keyword = contains_any(combined, LOGIN_KEYWORDS)
-    has_sqli_pattern = contains_any(combined, SQLI_PATTERNS)
-    has_xss_pattern = contains_any(combined, XSS_PATTERNS)
-    path_entropy = shannon_entropy(combined)
+    return (path_length, num_params, max_param_len,
+            has_login_keyword, has_sqli_pattern, has_xss_pattern, path_entropy)
 
-    headers = parse_headers_str(headers_str)
-    num_headers = len(headers)
-    user_agent_length = len(ua)
-    has_suspicious_ua = contains_any(ua, SUSPICIOUS_UA_KEYWORDS)
 
-    try:
-        content_length = int(content_length_str)
-    except ValueError:
-        content_length = 0
+def _suspicious_ua(ua: str) -> int:
+    """f13: has_suspicious_ua (Aho-Corasick)."""
+    return 1 if UA_MATCHER.search(ua or "") else 0
+
+
+def _user_agent_features(ua: str) -> Tuple[int, int]:
+    """f12-f13: user_agent_length, has_suspicious_ua."""
+    ua = ua or ""
+    return len(ua), _suspicious_ua(ua)
+
+
+def _header_features(headers_str: str) -> Tuple[int, int, int, int, int]:
+    """f11, f15-f18: num_headers, has_uncommon_header, accept-language/host/referer uzunlukları."""
+    headers = parse_headers_str(headers_str or "")
+    num_headers = len(headers)
 
     has_uncommon_header = 0
     for hname in headers.keys():
@@ -132,11 +183,44 @@ def extract_features_from_row(row: Dict[str, str]) -> Tuple[List[float], int]:
     accept_language_length = len(headers.get("accept-language", ""))
     host_length = len(headers.get("host", ""))
     referer_length = len(headers.get("referer", ""))
+    return (num_headers, has_uncommon_header,
+            accept_language_length, host_length, referer_length)
+
+
+def _content_length_value(content_length_str) -> int:
+    """f14: content_length (parse edilemezse 0)."""
+    try:
+        return int(content_length_str or "0")
+    except ValueError:
+        return 0
+
+
+def extract_features_from_row(row: Dict[str, str],
+                              window: IPWindowTracker = None) -> Tuple[List[float], int]:
+    """
+    row: {'ip','timestamp','method','path','query','user_agent','headers','content_length','label'}
+    window: verilirse f19-f21 bu tracker ile hesaplanır (satırlar zaman sırasıyla verilmeli)
+    Returns: (features[22], label)
+    """
+    label_str = row.get("label") or "0"
+
+    m_get, m_post, m_head, m_other = _method_features(row.get("method"))
+    (path_length, num_params, max_param_len,
+     has_login_keyword, has_sqli_pattern, has_xss_pattern,
+     path_entropy) = _request_line_features(row.get("path"), row.get("query"))
+    user_agent_length, has_suspicious_ua = _user_agent_features(row.get("user_agent"))
+    (num_headers, has_uncommon_header, accept_language_length,
+     host_length, referer_length) = _header_features(row.get("headers"))
+    content_length = _content_length_value(row.get("content_length"))
 
-    # İlk POC: IP davranışsal özellikleri kapalı (0)
+    # f19-f21: IP davranışsal (tracker yoksa 0)
     req_count_last_10s = 0.0
     login_admin_hits_last_60s = 0.0
     unique_paths_last_60s = 0.0
+    if window is not None:
+        (req_count_last_10s, login_admin_hits_last_60s,
+         unique_paths_last_60s) = window.observe(
+            row.get("ip"), row.get("timestamp"), row.get("path"), has_login_keyword)
 
     features = [
         float(m_get),                      # f0
@@ -167,16 +251,171 @@ def extract_features_from_row(row: Dict[str, str]) -> Tuple[List[float], int]:
     return features, label
 
 
+def _per_unique(fn, *columns) -> np.ndarray:
+    """
+    fn'i her tekil değer (veya değer tuple'ı) için bir kez çalıştırıp sonucu
+    tüm satırlara dağıtır. Log'larda path/UA/header değerleri çok tekrar ettiği
+    için pahalı string işlemleri satır sayısı yerine tekil değer sayısı kadar yapılır.
+    Returns: (N, k) float64 matris
+    """
+    n = len(columns[0])
+    keys = columns[0] if len(columns) == 1 else zip(*columns)
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(k, len(index)) for k in keys), dtype=np.intp, count=n
+    )
+    if len(columns) == 1:
+        table = [fn(k) for k in index]
+    else:
+        table = [fn(*k) for k in index]
+    table = np.array(table, dtype=np.float64).reshape(len(index), -1)
+    return table[codes]
+
+
+def _string_column(values: Sequence, default: str = "") -> np.ndarray:
+    """Sütunu string array'e çevir (None / boş -> default)."""
+    return np.array([v or default for v in values], dtype=_STR_DTYPE)
+
+
+def _method_columns(methods: Sequence) -> np.ndarray:
+    """f0-f3: method one-hot (GET, POST, HEAD, OTHER). Returns: (N, 4) bool"""
+    upper = _strings.upper(_string_column(methods))
+    m_get = upper == "GET"
+    m_post = upper == "POST"
+    m_head = upper == "HEAD"
+    return np.stack([m_get, m_post, m_head, ~(m_get | m_post | m_head)], axis=1)
+
+
+def _query_columns(queries: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    f5-f6: num_params, max_param_len.
+    Tüm query'ler '&' ile birleştirilip tek seferde parçalanır; her query
+    count('&') + 1 parça verir, max_param_len segment bazında reduceat ile alınır.
+    """
+    query_list = [q or "" for q in queries]
+    q = np.array(query_list, dtype=_STR_DTYPE)
+    parts_per_query = _strings.count(q, "&") + 1
+    num_params = np.where(_strings.str_len(q) > 0, parts_per_query, 0)
+
+    parts = np.array("&".join(query_list).split("&"), dtype=_STR_DTYPE)
+    # "k=v" -> len(v); '=' yoksa find() = -1 ve parçanın tamamı değer sayılır
+    value_len = _strings.str_len(parts) - _strings.find(parts, "=") - 1
+    starts = np.zeros(len(q), dtype=np.intp)
+    np.cumsum(parts_per_query[:-1], out=starts[1:])
+    return num_params, np.maximum.reduceat(value_len, starts)
+
+
+def _content_length_column(content_lengths: Sequence) -> np.ndarray:
+    """
+    f14: content_length. numpy'nin str -> int64 dönüşümü int() ile aynı kuralları
+    izler; parse edilemeyen (-> 0) veya int64'e sığmayan değer varsa tekil değer
+    bazında _content_length_value'ya düşülür.
+    """
+    try:
+        values = _string_column(content_lengths, "0").astype(np.int64)
+    except (ValueError, OverflowError):
+        return _per_unique(_content_length_value, content_lengths)[:, 0]
+    return values.astype(np.float64)
+
+
+def extract_features_batch(methods: Sequence, paths: Sequence, queries: Sequence,
+                           user_agents: Sequence, headers: Sequence,
+                           content_lengths: Sequence, ips: Sequence = None,
+                           timestamps: Sequence = None,
+                           window: IPWindowTracker = None) -> np.ndarray:
+    """
+    Kolon bazlı toplu feature extraction.
+    Her argüman N uzunluğunda bir sütundur (list / numpy array).
+
+    Method one-hot, path/UA uzunlukları, param sayısı / max param uzunluğu ve
+    content_length numpy string işlemleriyle (np.strings / np.char) hesaplanır.
+    Aho-Corasick flag'leri, entropy ve header parse'ı satır satır yolla aynı
+    Python koduyla, her tekil değer için bir kez çalışır (_per_unique).
+    ips + timestamps verilirse f19-f21 IP sliding-window motoruyla hesaplanır
+    (satırlar zaman sıralı olmalı; window verilirse durum çağrılar arasında korunur).
+    Returns: (N, 22) float32, C-contiguous matris.
+    Sonuç, her satır için extract_features_from_row çıktısının float32'ye
+    çevrilmiş haliyle bit düzeyinde aynıdır.
+    """
+    n = len(methods)
+    X = np.zeros((n, N_FEATURES), dtype=np.float32)
+    if n == 0:
+        return X
+
+    X[:, 0:4] = _method_columns(methods)                               # f0-f3
+    X[:, 4] = _strings.str_len(_string_column(paths))                  # f4
+    X[:, 5], X[:, 6] = _query_columns(queries)                         # f5-f6
+    X[:, 7:11] = _per_unique(_request_line_patterns, paths, queries)   # f7-f10
+    header_feats = _per_unique(_header_features, headers)
+    X[:, 11] = header_feats[:, 0]                                      # f11
+    X[:, 12] = _strings.str_len(_string_column(user_agents))           # f12
+    X[:, 13] = _per_unique(_suspicious_ua, user_agents)[:, 0]           # f13
+    X[:, 14] = _content_length_column(content_lengths)                 # f14
+    X[:, 15:19] = header_feats[:, 1:5]                                 # f15-f18
+    if ips is not None and timestamps is not None:                     # f19-f21
+        X[:, 19:22] = behavioral_features(ips, timestamps, paths, X[:, 7], window)
+    return X
+
+
+def _csv_column(rows: List[List[str]], header: List[str], name: str) -> List:
+    """csv.reader satırlarından tek bir kolonu çek (eksik kolon/hücre -> None)."""
+    if name not in header:
+        return [None] * len(rows)
+    i = header.index(name)
+    return [r[i] if len(r) > i else None for r in rows]
+
+
+def _dataset_from_rows(rows: List[List[str]], header: List[str],
+                       window: IPWindowTracker = None):
+    # timestamp kolonu olmayan (eski) CSV'lerde f19-f21 = 0
+    behavioral = "ip" in header and "timestamp" in header
+    X = extract_features_batch(
+        _csv_column(rows, header, "method"),
+        _csv_column(rows, header, "path"),
+        _csv_column(rows, header, "query"),
+        _csv_column(rows, header, "user_agent"),
+        _csv_column(rows, header, "headers"),
+        _csv_column(rows, header, "content_length"),
+        ips=_csv_column(rows, header, "ip") if behavioral else None,
+        timestamps=_csv_column(rows, header, "timestamp") if behavioral else None,
+        window=window,
+    )
+    y = np.zeros(len(rows), dtype=np.int32)
+    if rows:
+        y[:] = _per_unique(lambda v: int(v or "0"), _csv_column(rows, header, "label"))[:, 0]
+    return X, y
+
+
 def load_dataset_from_csv(path: str):
     """
     CSV'den feature vektörlerini yükle.
-    Returns: (X, y) - X: list of feature lists, y: list of labels
+    Returns: (X, y) - X: (N, 22) float32 numpy matrisi, y: (N,) int32 label'lar
     """
-    X, y = [], []
     with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            feats, label = extract_features_from_row(row)
-            X.append(feats)
-            y.append(label)
-    return X, y
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [r for r in reader if r]
+    return _dataset_from_rows(rows, header)
+
+
+def iter_dataset_batches(path: str, batch_size: int = 100000):
+    """
+    CSV'yi batch_size satırlık parçalar halinde oku.
+    Yields: (X, y) - X: (b, 22) float32, y: (b,) int32
+    Bellek kullanımı dataset boyutuna değil batch boyutuna bağlıdır.
+    IP pencere durumu batch'ler arasında taşınır (sonuç tek seferde okumayla aynı).
+    """
+    window = IPWindowTracker()
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = []
+        for r in reader:
+            if not r:
+                continue
+            rows.append(r)
+            if len(rows) >= batch_size:
+                yield _dataset_from_rows(rows, header, window)
+                rows = []
+        if rows:
+            yield _dataset_from_rows(rows, header, window)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Firmware header'larını host'ta (x86/ARM) C++ derleyicisiyle shared library'ye
+derleyip ctypes ile çağırmak için yardımcılar.
+Header'lar C++ (default argüman kullanıyor), bu yüzden g++/clang++ gerekir.
+
+Derlenen .so'lar kullanıcıya özel cache dizininde tutulur ($XDG_CACHE_HOME veya
+~/.cache altında, 0700): paylaşılan /tmp'deki bir dizinden ctypes ile yükleme
+yapmak, başka bir yerel kullanıcının oraya kütüphane bırakmasına izin verirdi.
+"""
+import ctypes
+import hashlib
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+
+BUILD_DIR_NAME = "waf_host_build"
+COMPILER_CANDIDATES = ("g++", "clang++", "c++")
+CXXFLAGS = ["-O2", "-std=c++11", "-shared", "-fPIC", "-Wall"]
+
+
+def find_compiler():
+    """
+    Returns: C++ derleyicisinin yolu (CXX ortam değişkeni önceliklidir) veya None
+    """
+    candidates = [os.environ["CXX"]] if os.environ.get("CXX") else []
+    candidates.extend(COMPILER_CANDIDATES)
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def default_build_dir():
+    """Returns: kullanıcıya özel build cache dizini ($XDG_CACHE_HOME/waf_host_build)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, BUILD_DIR_NAME)
+
+
+def _ensure_private_dir(path):
+    """
+    Dizini 0700 ile oluştur; POSIX'te symlink olmadığını, mevcut kullanıcıya ait
+    olduğunu ve başkalarının yazamadığını doğrula (aksi halde RuntimeError).
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.name != "posix":
+        return
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise RuntimeError(f"Build dizini güvenli değil (dizin değil / başka kullanıcıya ait): {path}")
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        os.chmod(path, 0o700)
+
+
+def build_shared_library(source, include_dirs=(), name="waf_host", build_dir=None,
+                         extra_flags=()):
+    """
+    C++ kaynak metnini shared library'ye derle ve ctypes.CDLL döndür.
+    Çıktı, kaynak + include edilen header'ların içeriğine göre cache'lenir.
+    build_dir verilmezse default_build_dir() kullanılır. Her derleme kendi geçici
+    dosyalarına yazar ve sonucu os.replace ile yerine koyar; eşzamanlı derlemeler
+    birbirinin çıktısını bozmaz.
+    """
+    compiler = find_compiler()
+    if compiler is None:
+        raise RuntimeError("C++ derleyicisi bulunamadı (g++ / clang++ kurun veya CXX ayarlayın)")
+
+    digest = hashlib.sha256(source.encode("utf-8"))
+    digest.update(" ".join(list(extra_flags)).encode("utf-8"))
+    for inc in include_dirs:
+        for entry in sorted(os.listdir(inc)):
+            if entry.endswith(".h"):
+                with open(os.path.join(inc, entry), "rb") as f:
+                    digest.update(entry.encode("utf-8") + f.read())
+
+    if build_dir is None:
+        build_dir = default_build_dir()
+    _ensure_private_dir(build_dir)
+    stem = f"{name}_{digest.hexdigest()[:16]}"
+    lib_path = os.path.join(build_dir, f"{stem}.so")
+    if not os.path.exists(lib_path):
+        fd, src_path = tempfile.mkstemp(prefix=f"{stem}.", suffix=".cpp", dir=build_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(source)
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{stem}.", suffix=".so.tmp", dir=build_dir)
+        os.close(fd)
+        try:
+            cmd = [compiler, *CXXFLAGS, *extra_flags]
+            cmd += [f"-I{inc}" for inc in include_dirs]
+            cmd += [src_path, "-o", tmp_path]
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"Derleme başarısız:\n{' '.join(cmd)}\n{proc.stderr}")
+            os.replace(tmp_path, lib_path)
+        finally:
+            for path in (src_path, tmp_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    return ctypes.CDLL(lib_path)
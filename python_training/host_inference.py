@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Firmware'in matematiğini host'ta taklit eden toplu skorlama motoru.
+
+scaler_params.h / model_weights.h header'larını (veya best_model.pkl /
+scaler.pkl'i aynı export koduyla) okuyup modeli (N, 22) float32 matris
+üzerinde vektörize çalıştırır:
+- float MLP, folded MLP, lineer model: float32, C'deki işlem sırasıyla
+  (toplamalar feature sırasıyla, her adım float32'ye yuvarlanarak)
+- int8 MLP: quantization.quantized_logits() ile aynı tamsayı hesabı
+- decision tree (if/else veya node dizisi): float32 karşılaştırmalar
+
+Bir günlük trafiği aday modelden geçirip kararlarını production modeliyle
+karşılaştırmak için:
+    python3 host_inference.py --csv day.csv --model candidate/ --baseline ../esp8266_firmware/include
+"""
+import argparse
+import contextlib
+import io
+import os
+import pickle
+import re
+import tempfile
+import time
+
+import numpy as np
+
+from quantization import quantized_logits
+
+_FLOAT = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?f?"
+_ARRAY_RE = re.compile(r"const\s+\w+\s+(\w+)\s*((?:\[[^\]]*\])+)\s*=\s*\{(.*?)\};", re.S)
+_SCALAR_RE = re.compile(rf"const\s+float\s+(\w+)\s*=\s*({_FLOAT})\s*;")
+_DEFINE_RE = re.compile(r"#define\s+(\w+)\s+(-?\d+)\b")
+_NUMBER_RE = re.compile(_FLOAT)
+_TERM_RE = re.compile(rf"([+-])\s*(x\[\d+\]|h\d+_\d+)\s*\*\s*({_FLOAT})")
+
+
+def _f32(token):
+    return np.float32(float(token.rstrip("f")))
+
+
+def _strip_comments(text):
+    return re.sub(r"//[^\n]*", "", text)
+
+
+def _arrays(text):
+    """
+    Returns: {isim: düz numpy dizisi (float64)} - C array tanımları
+    """
+    arrays = {}
+    for name, _, body in _ARRAY_RE.findall(text):
+        arrays[name] = np.array([float(t.rstrip("f")) for t in _NUMBER_RE.findall(body)])
+    return arrays
+
+
+def _function_body(text, name):
+    match = re.search(rf"\b{name}\s*\([^)]*\)\s*\{{", text)
+    if match is None:
+        raise ValueError(f"Header'da {name}() bulunamadı")
+    depth, start = 1, match.end()
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i]
+    raise ValueError(f"{name}() gövdesi kapanmıyor")
+
+
+class HostModel:
+    """
+    Header'dan okunmuş model. predict_proba / predict firmware'deki
+    model_inference / classify_request ile aynı sonucu verir.
+    """
+
+    def __init__(self, kind, n_features, scaler=None, **params):
+        self.kind = kind
+        self.n_features = n_features
+        self.scaler = scaler  # (mean, scale) float32 veya None (katlanmış / yok)
+        self.params = params
+
+    def __repr__(self):
+        return f"HostModel(kind={self.kind!r}, n_features={self.n_features})"
+
+    def _scale(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"X (N, {self.n_features}) olmalı, {X.shape} geldi")
+        if self.scaler is None:
+            return X
+        mean, scale = self.scaler
+        return (X - mean) / scale
+
+    def _logit_float_mlp(self, X):
+        # C: sum = B[h]; for i: sum += features[i] * W[i][h]  (sırayla, float32)
+        a = X
+        for k, (W, b) in enumerate(self.params["layers"]):
+            acc = np.broadcast_to(b, (len(a), len(b))).copy()
+            for i in range(W.shape[0]):
+                acc += a[:, i:i + 1] * W[i]
+            a = np.maximum(acc, np.float32(0.0)) if k < len(self.params["layers"]) - 1 else acc
+        return a[:, 0]
+
+    def _logit_unrolled(self, X):
+        # C: tek ifade, soldan sağa: bias +/- x[i] * |w| ...
+        env = {f"x[{i}]": X[:, i] for i in range(X.shape[1])}
+        for name, bias, terms in self.params["statements"]:
+            acc = np.full(len(X), bias, dtype=np.float32)
+            for sign, operand, weight in terms:
+                prod = env[operand] * weight
+                acc = acc - prod if sign == "-" else acc + prod
+            if name is None:
+                return acc
+            env[name] = np.maximum(acc, np.float32(0.0))
+        raise ValueError("Unroll edilmiş ifadede return yok")
+
+    def _tree_proba(self, X):
+        p = self.params
+        node = np.zeros(len(X), dtype=np.int64)
+        rows = np.arange(len(X))
+        while True:
+            feature = p["feature"][node]
+            active = feature >= 0
+            if not active.any():
+                return p["value"][node]
+            r, n = rows[active], node[active]
+            go_left = X[r, feature[active]] <= p["threshold"][n]
+            node[active] = np.where(go_left, p["left"][n], p["right"][n])
+
+    def logit(self, X):
+        """
+        Sigmoid öncesi çıkış (tree için tanımsız). int8: float32 logit = acc * QOUT_SCALE
+        """
+        Xs = self._scale(X)
+        if self.kind == "mlp_float":
+            return self._logit_float_mlp(Xs)
+        if self.kind in ("mlp_folded", "linear"):
+            return self._logit_unrolled(Xs)
+        if self.kind == "mlp_int8":
+            acc = quantized_logits(self.params["quant"], Xs)
+            return acc.astype(np.float32) * self.params["quant"]["logit_scale"]
+        raise ValueError(f"{self.kind} modelinde logit yok")
+
+    def predict_proba(self, X):
+        """
+        Returns: (N,) float32 P(malicious) - firmware'deki model_inference()
+        """
+        if self.kind == "tree":
+            return self._tree_proba(self._scale(X))
+        logit = self.logit(X)
+        with np.errstate(over="ignore"):
+            return (np.float32(1.0) / (np.float32(1.0) + np.exp(-logit))).astype(np.float32)
+
+    def predict(self, X, threshold=0.5):
+        """
+        Returns: (N,) int32 karar - firmware'deki classify_request()
+        (threshold 0.5'te logit >= 0; int8'de tamsayı akümülatör >= 0)
+        """
+        if threshold == 0.5 and self.kind == "mlp_int8":
+            return (quantized_logits(self.params["quant"], self._scale(X)) >= 0).astype(np.int32)
+        if threshold == 0.5 and self.kind in ("mlp_folded", "linear"):
+            return (self.logit(X) >= 0).astype(np.int32)
+        return (self.predict_proba(X) >= np.float32(threshold)).astype(np.int32)
+
+
+def _parse_unrolled(body):
+    statements = []
+    for match in re.finditer(rf"(?:float\s+(h\d+_\d+)|return)\s*=?\s*({_FLOAT})((?:\s*[+-]\s*\S+\s*\*\s*{_FLOAT})*)\s*;", body):
+        name, bias, rest = match.groups()
+        terms = [(sign, operand, _f32(weight)) for sign, operand, weight in _TERM_RE.findall(rest)]
+        statements.append((name, _f32(bias), terms))
+    return statements
+
+
+def _parse_tree_ifelse(body):
+    """
+    İç içe if/else -> node dizileri (export_tree_to_c ile aynı numaralandırma gerekmez).
+    """
+    tokens = re.findall(
+        rf"if\s*\(x\[(\d+)\]\s*<=\s*({_FLOAT})\)\s*\{{|\}}\s*else\s*\{{|return\s+({_FLOAT})\s*;|\}}",
+        body)
+    feature, threshold, left, right, value = [], [], [], [], []
+    pos = 0
+
+    def parse():
+        nonlocal pos
+        feat, thr, ret = tokens[pos]
+        pos += 1
+        node = len(feature)
+        feature.append(-1)
+        threshold.append(np.float32(0.0))
+        left.append(-1)
+        right.append(-1)
+        value.append(np.float32(0.0))
+        if ret:
+            value[node] = _f32(ret)
+            return node
+        feature[node] = int(feat)
+        threshold[node] = _f32(thr)
+        left[node] = parse()
+        pos += 1  # "} else {"
+        right[node] = parse()
+        pos += 1  # "}"
+        return node
+
+    parse()
+    return {
+        "feature": np.array(feature, dtype=np.int64),
+        "threshold": np.array(threshold, dtype=np.float32),
+        "left": np.array(left, dtype=np.int64),
+        "right": np.array(right, dtype=np.int64),
+        "value": np.array(value, dtype=np.float32),
+    }
+
+
+def load_headers(header_dir):
+    """
+    scaler_params.h + model_weights.h -> HostModel
+    """
+    with open(os.path.join(header_dir, "scaler_params.h"), "r", encoding="utf-8") as f:
+        scaler_text = _strip_comments(f.read())
+    with open(os.path.join(header_dir, "model_weights.h"), "r", encoding="utf-8") as f:
+        text = _strip_comments(f.read())
+
+    scaler_arrays = _arrays(scaler_text)
+    n_features = int(dict(_DEFINE_RE.findall(scaler_text))["N_FEATURES"])
+    scaler = None
+    if "SCALER_MEAN" in scaler_arrays:
+        scaler = (scaler_arrays["SCALER_MEAN"].astype(np.float32),
+                  scaler_arrays["SCALER_SCALE"].astype(np.float32))
+
+    arrays = _arrays(text)
+    defines = {k: int(v) for k, v in _DEFINE_RE.findall(text)}
+
+    if "tree_inference" in text:
+        if "TREE_FEATURE" in arrays:
+            params = {
+                "feature": arrays["TREE_FEATURE"].astype(np.int64),
+                "threshold": arrays["TREE_THRESHOLD"].astype(np.float32),
+                "left": arrays["TREE_LEFT"].astype(np.int64),
+                "right": arrays["TREE_RIGHT"].astype(np.int64),
+                "value": arrays["TREE_VALUE"].astype(np.float32),
+            }
+        else:
+            params = _parse_tree_ifelse(_function_body(text, "tree_inference"))
+        return HostModel("tree", n_features, scaler, **params)
+
+    if "mlp_logit_q" in text:
+        layers = []
+        k = 0
+        while f"W{k}" in arrays:
+            n_out, n_in = defines[f"L{k}_OUT"], defines[f"L{k}_IN"]
+            layer = {
+                "weights": arrays[f"W{k}"].astype(np.int8).reshape(n_out, n_in),
+                "bias": arrays[f"B{k}"].astype(np.int64),
+            }
+            if f"L{k}_MULT" in defines:
+                layer["pre_shift"] = defines[f"L{k}_PRE"]
+                layer["multiplier"] = defines[f"L{k}_MULT"]
+                layer["shift"] = defines[f"L{k}_SHIFT"]
+            layers.append(layer)
+            k += 1
+        scalars = dict(_SCALAR_RE.findall(text))
+        quant = {
+            "input_mul": arrays["QIN_MUL"].astype(np.float32),
+            "input_add": arrays["QIN_ADD"].astype(np.float32),
+            "layers": layers,
+            "logit_scale": _f32(scalars["QOUT_SCALE"]),
+        }
+        return HostModel("mlp_int8", n_features, scaler, quant=quant)
+
+    for kind, function in (("mlp_folded", "mlp_logit"), ("linear", "linear_logit")):
+        if re.search(rf"\b{function}\s*\(", text):
+            statements = _parse_unrolled(_function_body(text, function))
+            return HostModel(kind, n_features, scaler, statements=statements)
+
+    if "W0" in arrays and "L0_IN" in defines:
+        layers = []
+        k = 0
+        while f"W{k}" in arrays:
+            n_in, n_out = defines[f"L{k}_IN"], defines[f"L{k}_OUT"]
+            layers.append((arrays[f"W{k}"].astype(np.float32).reshape(n_in, n_out),
+                           arrays[f"B{k}"].astype(np.float32)))
+            k += 1
+        return HostModel("mlp_float", n_features, scaler, layers=layers)
+
+    # Eski tek gizli katmanlı format (W_INPUT_HIDDEN / W_HIDDEN_OUTPUT)
+    if "W_INPUT_HIDDEN" in arrays:
+        n_input, n_hidden, n_output = defines["N_INPUT"], defines["N_HIDDEN"], defines["N_OUTPUT"]
+        layers = [
+            (arrays["W_INPUT_HIDDEN"].astype(np.float32).reshape(n_input, n_hidden),
+             arrays["B_HIDDEN"].astype(np.float32)),
+            (arrays["W_HIDDEN_OUTPUT"].astype(np.float32).reshape(n_hidden, n_output),
+             arrays["B_OUTPUT"].astype(np.float32)),
+        ]
+        return HostModel("mlp_float", n_features, scaler, layers=layers)
+
+    raise ValueError(f"{header_dir}: tanınmayan model_weights.h formatı")
+
+
+def load_pickles(model_path, scaler_path, mode="float", X_calib=None, tree_style="ifelse"):
+    """
+    Pickle'ları firmware ile aynı export koduyla geçici header'lara yazıp yükle.
+    mode="int8" için kalibrasyon verisi (ham train feature'ları) X_calib gerekir.
+    """
+    import export_model_to_c as exporter
+
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(scaler_path, "rb") as f:
+        scaler = pickle.load(f)
+
+    kind = exporter.model_kind(model)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        scaler_file = os.path.join(tmp, "scaler_params.h")
+        model_file = os.path.join(tmp, "model_weights.h")
+        if kind == "tree":
+            exporter.export_identity_scaler_to_c(model.n_features_in_, scaler_file, "tree")
+            exporter.export_tree_to_c(model, model_file, tree_style)
+        elif kind == "linear":
+            exporter.export_identity_scaler_to_c(len(scaler.mean_), scaler_file, "linear")
+            exporter.export_linear_to_c(model, scaler, model_file)
+        elif mode == "int8":
+            if X_calib is None:
+                raise ValueError("int8 modu için X_calib (kalibrasyon verisi) gerekli")
+            params = exporter.quantize_mlp(model, scaler, X_calib)
+            exporter.export_identity_scaler_to_c(len(scaler.mean_), scaler_file, "int8")
+            exporter.export_mlp_int8_to_c(params, model_file)
+        elif mode == "folded":
+            exporter.export_identity_scaler_to_c(len(scaler.mean_), scaler_file, "folded")
+            exporter.export_mlp_folded_to_c(model, scaler, model_file)
+        else:
+            exporter.export_scaler_to_c(scaler, scaler_file)
+            exporter.export_mlp_to_c(model, model_file)
+        return load_headers(tmp)
+
+
+def load_model(spec, mode="float"):
+    """
+    spec: header dizini veya best_model.pkl yolu (scaler.pkl aynı dizinde)
+    """
+    if os.path.isdir(spec):
+        return load_headers(spec)
+    return load_pickles(spec, os.path.join(os.path.dirname(spec), "scaler.pkl"), mode)
+
+
+def _score(name, model, X, threshold):
+    t0 = time.perf_counter()
+    proba = model.predict_proba(X)
+    label = model.predict(X, threshold)
+    elapsed = time.perf_counter() - t0
+    rate = len(X) / elapsed if elapsed > 0 else float("inf")
+    print(f"[+] {name}: {model.kind}, {len(X)} rows in {elapsed:.2f}s ({rate:,.0f} rows/s), "
+          f"malicious: {int(label.sum())} ({label.mean() * 100:.2f}%)")
+    return proba, label
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(description="Export edilmiş modeli host'ta toplu skorla")
+    parser.add_argument("--csv", default=os.path.join(project_dir, "http_requests_labeled.csv"),
+                        help="parse_access_log çıktısı CSV (feature cache üzerinden okunur)")
+    parser.add_argument("--model", default=os.path.join(project_dir, "esp8266_firmware", "include"),
+                        help="Aday model: header dizini veya best_model.pkl")
+    parser.add_argument("--mode", choices=["float", "folded"], default="float",
+                        help="Pickle verildiğinde kullanılacak MLP export modu "
+                             "(int8 için önce export_model_to_c.py --mode int8)")
+    parser.add_argument("--baseline", default=None,
+                        help="Karşılaştırılacak production modeli (header dizini veya .pkl)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="classify_request threshold")
+    parser.add_argument("--output", default=None,
+                        help="Satır başına olasılık/karar CSV'si (opsiyonel)")
+    parser.add_argument("--show-diffs", type=int, default=10,
+                        help="Karar farkı olan ilk N satırı yazdır")
+    args = parser.parse_args()
+
+    from feature_cache import load_features_cached
+    from train_models import compute_metrics
+
+    X, y = load_features_cached(args.csv)
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y, dtype=np.int32)
+    print(f"[+] Loaded {len(X)} rows")
+
+    candidate = load_model(args.model, args.mode)
+    proba, label = _score("Candidate", candidate, X, args.threshold)
+    columns = [proba, label]
+    header = "candidate_proba,candidate_label"
+    fmt = ["%.6f", "%d"]
+
+    if y.any():
+        acc, precision, recall, f1 = compute_metrics(y, label)
+        print(f"    vs. labels: acc {acc:.4f}, precision {precision:.4f}, "
+              f"recall {recall:.4f}, F1 {f1:.4f}")
+
+    if args.baseline:
+        baseline = load_model(args.baseline, args.mode)
+        base_proba, base_label = _score("Baseline", baseline, X, args.threshold)
+        diff = np.flatnonzero(label != base_label)
+        newly_blocked = int(np.sum((label == 1) & (base_label == 0)))
+        print(f"\n[*] Decision diff: {len(diff)} rows ({len(diff) / max(len(X), 1) * 100:.3f}%), "
+              f"newly blocked: {newly_blocked}, newly allowed: {len(diff) - newly_blocked}")
+        for row in diff[:args.show_diffs]:
+            print(f"    row {row}: baseline {base_label[row]} ({base_proba[row]:.4f}) -> "
+                  f"candidate {label[row]} ({proba[row]:.4f})")
+        columns += [base_proba, base_label]
+        header += ",baseline_proba,baseline_label"
+        fmt += ["%.6f", "%d"]
+
+    if args.output:
+        np.savetxt(args.output, np.column_stack(columns), fmt=fmt, delimiter=",",
+                   header=header, comments="")
+        print(f"\n[+] Decisions written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+IP bazlı davranışsal feature'lar (f19-f21) için sliding-window motoru.
+
+    f19 req_count_last_10s         son 10 saniyedeki istek sayısı
+    f20 login_admin_hits_last_60s  son 60 saniyedeki login/admin (f7) istekleri
+    f21 unique_paths_last_60s      son 60 saniyedeki tekil path sayısı (yaklaşık)
+
+Her IP için sabit boyutlu ring buffer'lar tutulur:
+- f19: 10 x 1 s bucket sayacı
+- f20: 12 x 5 s bucket sayacı
+- f21: 12 x 5 s bucket'lık 64 bitlik path bitmap'leri; pencere içindeki
+  bitmap'ler OR'lanıp linear counting ile tekil sayı tahmin edilir.
+
+İstek başına iş sabittir (en fazla 10 + 12 bucket temizlenir, 12 bitmap OR'lanır),
+toplamlar artımlı tutulur. Tablo en fazla max_ips IP tutar; dolunca en uzun
+süredir görülmeyen IP atılır (LRU). Sayımlar mevcut isteği de içerir.
+
+60 s pencere 5 s'lik bucket sınırlarına hizalıdır (55-60 s arası kapsar).
+Firmware'deki karşılığı: esp8266_firmware/include/ip_window.h (parity testi:
+feature_parity.py). İki tarafın aynı sonucu vermesi için path hash'i (FNV-1a),
+bucket düzeni, sayaç doyumu ve linear counting tablosu birebir aynıdır.
+"""
+import ipaddress
+import math
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+
+SHORT_BUCKETS = 10          # f19: 10 x 1 s
+LONG_BUCKETS = 12           # f20-f21: 12 x 5 s
+LONG_BUCKET_SECONDS = 5
+PATH_BITMAP_BITS = 64
+COUNTER_MAX = 65535         # firmware'de uint16 bucket sayaçları
+# Saat bir IP'nin son isteğinden bu kadar (tüm pencere) geri giderse saat yeniden
+# başlamış sayılır (cihaz reset'i / millis() taşması) ve IP'nin penceresi sıfırlanır.
+# Daha küçük geri sıçramalar (sırasız log satırları) mevcut saniyeye yazılır.
+RESET_SECONDS = LONG_BUCKETS * LONG_BUCKET_SECONDS
+
+DEFAULT_MAX_IPS = 100000
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+# Linear counting: bitmap'te v bit sıfırsa tahmin = -m * ln(v / m), v = 0 (doymuş) -> m * ln(m)
+LINEAR_COUNT_TABLE = [round(PATH_BITMAP_BITS * math.log(PATH_BITMAP_BITS))] + [
+    round(-PATH_BITMAP_BITS * math.log(v / PATH_BITMAP_BITS))
+    for v in range(1, PATH_BITMAP_BITS + 1)
+]
+
+
+def window_spec():
+    """Pencere parametreleri (features.feature_version() özetine girer)."""
+    return [SHORT_BUCKETS, LONG_BUCKETS, LONG_BUCKET_SECONDS, PATH_BITMAP_BITS, COUNTER_MAX,
+            RESET_SECONDS]
+
+
+def ip_to_u32(ip: str) -> int:
+    """Firmware'deki IPAddress -> uint32 karşılığı; IPv4 olmayanlar (ör. ::1) hash'lenir."""
+    try:
+        return int(ipaddress.IPv4Address(ip))
+    except ValueError:
+        return zlib.crc32(ip.encode("utf-8"))
+
+
+def path_hash(path: str) -> int:
+    """32 bit FNV-1a (UTF-8 byte'ları üzerinde, firmware ile aynı)."""
+    h = FNV_OFFSET
+    for b in (path or "").encode("utf-8"):
+        h = ((h ^ b) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+@lru_cache(maxsize=65536)
+def path_bit(path: str) -> int:
+    """Path'in bitmap'teki biti (path'ler çok tekrar ettiği için cache'li)."""
+    return 1 << (path_hash(path) % PATH_BITMAP_BITS)
+
+
+def linear_count(bitmap: int) -> int:
+    zeros = PATH_BITMAP_BITS - bin(bitmap).count("1")
+    return LINEAR_COUNT_TABLE[zeros]
+
+
+class _IPState:
+    __slots__ = ("last_sec", "req", "req_total", "login", "login_total", "paths")
+
+    def __init__(self, sec):
+        self.last_sec = sec
+        self.req = [0] * SHORT_BUCKETS
+        self.req_total = 0
+        self.login = [0] * LONG_BUCKETS
+        self.login_total = 0
+        self.paths = [0] * LONG_BUCKETS
+
+    def advance(self, sec):
+        """Pencereyi sec'e kaydır, süresi dolan bucket'ları sıfırla (geri giden zaman yok sayılır)."""
+        last = self.last_sec
+        if sec <= last:
+            return
+        for s in range(last + 1, last + 1 + min(sec - last, SHORT_BUCKETS)):
+            i = s % SHORT_BUCKETS
+            self.req_total -= self.req[i]
+            self.req[i] = 0
+
+        b_last = last // LONG_BUCKET_SECONDS
+        b_new = sec // LONG_BUCKET_SECONDS
+        for b in range(b_last + 1, b_last + 1 + min(b_new - b_last, LONG_BUCKETS)):
+            i = b % LONG_BUCKETS
+            self.login_total -= self.login[i]
+            self.login[i] = 0
+            self.paths[i] = 0
+        self.last_sec = sec
+
+
+class IPWindowTracker:
+    """
+    Zaman sıralı istek akışından IP başına f19-f21 hesaplayan streaming motor.
+
+        tracker = IPWindowTracker()
+        f19, f20, f21 = tracker.observe(ip, timestamp, path, login_hit)
+
+    timestamp: epoch saniye (float/int/str); None veya parse edilemezse
+    istek pencereye eklenmez ve (0, 0, 0) döner.
+    """
+
+    def __init__(self, max_ips: int = DEFAULT_MAX_IPS):
+        if max_ips < 1:
+            raise ValueError("max_ips must be >= 1")
+        self.max_ips = max_ips
+        self.evictions = 0
+        self._table = OrderedDict()
+
+    def __len__(self):
+        return len(self._table)
+
+    def observe(self, ip, timestamp, path: str, login_hit) -> Tuple[int, int, int]:
+        if not ip or timestamp is None or timestamp == "":
+            return 0, 0, 0
+        try:
+            sec = math.floor(float(timestamp))
+        except (TypeError, ValueError, OverflowError):
+            return 0, 0, 0
+
+        table = self._table
+        state = table.get(ip)
+        if state is None:
+            if len(table) >= self.max_ips:
+                table.popitem(last=False)
+                self.evictions += 1
+            state = _IPState(sec)
+            table[ip] = state
+        else:
+            table.move_to_end(ip)
+            if sec > state.last_sec:
+                state.advance(sec)
+            elif state.last_sec - sec >= RESET_SECONDS:
+                state = _IPState(sec)
+                table[ip] = state
+        sec = state.last_sec
+
+        i = sec % SHORT_BUCKETS
+        if state.req[i] < COUNTER_MAX:
+            state.req[i] += 1
+            state.req_total += 1
+
+        b = (sec // LONG_BUCKET_SECONDS) % LONG_BUCKETS
+        if login_hit and state.login[b] < COUNTER_MAX:
+            state.login[b] += 1
+            state.login_total += 1
+        paths = state.paths
+        paths[b] |= path_bit(path or "")
+
+        union = 0
+        for bitmap in paths:
+            union |= bitmap
+        return state.req_total, state.login_total, linear_count(union)
+
+
+def behavioral_features(ips: Sequence, timestamps: Sequence, paths: Sequence,
+                        login_flags: Sequence, tracker: IPWindowTracker = None) -> np.ndarray:
+    """
+    Satır sırasıyla (zaman sıralı olmalı) f19-f21'i hesapla.
+    tracker verilirse durum çağrılar arasında korunur (batch'li okuma).
+    Returns: (N, 3) float32
+    """
+    if tracker is None:
+        tracker = IPWindowTracker()
+    observe = tracker.observe
+    values = [observe(ip, ts, path, login)
+              for ip, ts, path, login in zip(ips, timestamps, paths, login_flags)]
+    return np.array(values, dtype=np.float32).reshape(len(values), 3)
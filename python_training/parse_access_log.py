@@ -2,16 +2,61 @@
 """
 Apache/Nginx access.log -> CSV dönüştürücü + otomatik etiketleme.
 Format: IP - - [timestamp] "METHOD /path?query HTTP/x.x" status size "referer" "user-agent" "-"
+Zaman damgası epoch saniye olarak yazılır (IP sliding-window feature'ları ve replay için).
 """
-import re
+import argparse
+import bz2
+import calendar
 import csv
+import glob
+import gzip
+import heapq
+import io
+import lzma
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse, parse_qs
 
+from pattern_matcher import PatternMatcher
+
+try:
+    import zstandard  # .zst log'lar için (opsiyonel)
+except ImportError:
+    zstandard = None
+
 # Regex pattern (Apache combined log format)
 LOG_PATTERN = re.compile(
     r'^(\S+) \S+ \S+ \[([^\]]+)\] "(\S+) (\S+) (\S+)" (\d+) (\S+) "([^"]*)" "([^"]*)" "([^"]*)"'
 )
 
+CSV_FIELDS = [
+    "ip", "timestamp", "method", "path", "query", "user_agent", "headers", "content_length",
+    "status", "label"
+]
+
+# CLF zaman damgası: "10/Oct/2000:13:55:36 -0700" (sabit genişlik)
+MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+CLF_TIMESTAMP_LEN = 26
+
+# Dakika (tarih + saat:dakika + timezone) -> epoch; log satırları zaman sıralı olduğu için
+# strptime yerine dakika başına bir kez hesaplanır, satır başına yalnızca saniye parse edilir
+_MINUTE_EPOCH_CACHE = {}
+MINUTE_EPOCH_CACHE_MAX = 4096
+
+# --sort-by-time: dosya içi küçük sıra bozukluklarını düzelten yeniden sıralama penceresi
+DEFAULT_SORT_BUFFER = 10000
+
+# Her N satırda bir ilerleme yazdır
+PROGRESS_EVERY = 50000
+
+# Sıkıştırılmış log'lar stream halinde açılır
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
 # Malicious pattern'ler (path/query/UA'da bunlar varsa label=1)
 LOGIN_KEYWORDS = [
     "admin", "login", "wp-admin", "wp-login", "phpmyadmin",
@@ -35,6 +80,15 @@ SUSPICIOUS_UA_KEYWORDS = [
     "nmap", "scanner", "exploit", "hack", "injection"
 ]
 
+# Etiketleme automaton'ları (import sırasında bir kez derlenir)
+REQUEST_MATCHER = PatternMatcher({
+    "login": LOGIN_KEYWORDS,
+    "sqli": SQLI_PATTERNS,
+    "xss": XSS_PATTERNS,
+})
+UA_MATCHER = PatternMatcher({"suspicious_ua": SUSPICIOUS_UA_KEYWORDS})
+
+
 def is_malicious(method, path, query, user_agent):
     """
     Basit kural tabanlı etiketleme:
@@ -42,25 +96,52 @@ def is_malicious(method, path, query, user_agent):
     - user_agent'ta suspicious keyword varsa -> 1
     - Diğer durumlarda -> 0
     """
-    combined = (path + "?" + query).lower()
-    ua_lower = user_agent.lower()
-
-    for kw in LOGIN_KEYWORDS:
-        if kw in combined:
-            return 1
-    for pat in SQLI_PATTERNS:
-        if pat in combined:
-            return 1
-    for pat in XSS_PATTERNS:
-        if pat in combined:
-            return 1
-    for kw in SUSPICIOUS_UA_KEYWORDS:
-        if kw in ua_lower:
-            return 1
-
+    if REQUEST_MATCHER.search(path + "?" + query):
+        return 1
+    if UA_MATCHER.search(user_agent):
+        return 1
     return 0
 
 
+def _minute_epoch(ts):
+    """
+    "10/Oct/2000:13:55:.. -0700" -> 13:55:00'ın (yerel saat) epoch'u.
+    """
+    try:
+        day = int(ts[0:2])
+        month = MONTHS[ts[3:6]]
+        year = int(ts[7:11])
+        hour = int(ts[12:14])
+        minute = int(ts[15:17])
+        sign = -1 if ts[21] == "-" else 1
+        offset = sign * (int(ts[22:24]) * 3600 + int(ts[24:26]) * 60)
+        return calendar.timegm((year, month, day, hour, minute, 0)) - offset
+    except (KeyError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def parse_clf_timestamp(ts):
+    """
+    CLF zaman damgası -> epoch saniye (int). Format dışıysa None.
+    Sabit genişlikli alanlar dilimlenir; dakikaya kadar olan kısım cache'lenir.
+    """
+    if len(ts) != CLF_TIMESTAMP_LEN or ts[17] != ":" or ts[20] != " ":
+        return None
+    key = ts[:17] + ts[20:]
+    base = _MINUTE_EPOCH_CACHE.get(key)
+    if base is None:
+        base = _minute_epoch(ts)
+        if base is None:
+            return None
+        if len(_MINUTE_EPOCH_CACHE) >= MINUTE_EPOCH_CACHE_MAX:
+            _MINUTE_EPOCH_CACHE.clear()
+        _MINUTE_EPOCH_CACHE[key] = base
+    seconds = ts[18:20]
+    if not seconds.isdigit():
+        return None
+    return base + int(seconds)
+
+
 def parse_log_line(line):
     """
     Tek log satırını parse et, dict döndür.
@@ -80,10 +161,32 @@ def parse_log_line(line):
     user_agent = match.group(9)
     extra = match.group(10)
 
-    # URL'yi parse et
+    return _build_row(ip, timestamp, method, url, status, size, referer, user_agent)
+
+
+def _split_url(url):
+    """
+    URL -> (path, query). urlparse ile aynı sonucu verir.
+    """
+    # Hızlı yol: log'ların neredeyse tamamı "/path?query" (origin-form) biçiminde;
+    # scheme/netloc/fragment/params yoksa urlparse'a gerek yok.
+    if url.startswith("/") and not url.startswith("//") and "#" not in url:
+        path, _, query = url.partition("?")
+        if ";" not in path:
+            return path or "/", query
+
     parsed = urlparse(url)
     path = parsed.path if parsed.path else "/"
     query = parsed.query if parsed.query else ""
+    return path, query
+
+
+def _build_row(ip, timestamp, method, url, status, size, referer, user_agent):
+    """
+    Regex gruplarından CSV satırını (dict) oluştur.
+    """
+    # URL'yi parse et
+    path, query = _split_url(url)
 
     # Headers string (basit: referer varsa ekle)
     headers_parts = []
@@ -93,72 +196,360 @@ def parse_log_line(line):
         headers_parts.append(f"Referer: {referer}")
     headers_str = ";".join(headers_parts)
 
-    # Content-Length (size'dan tahmin, GET için genelde 0)
+    # Content-Length (size'dan tahmin, GET için genelde 0); CLF'deki yanıt boyutu
+    # yalnızca bu kolona yazılır (f14), ayrı bir response_size kolonu tutulmaz
     try:
         content_length = int(size) if size != "-" else 0
     except ValueError:
         content_length = 0
 
+    epoch = parse_clf_timestamp(timestamp)
+
     # Label
     label = is_malicious(method, path, query, user_agent)
 
     return {
         "ip": ip,
+        "timestamp": epoch if epoch is not None else "",
         "method": method,
         "path": path,
         "query": query,
         "user_agent": user_agent if user_agent != "-" else "",
         "headers": headers_str,
         "content_length": content_length,
+        "status": int(status),
         "label": label
     }
 
 
+def _iter_text_lines(fin):
+    for line in fin:
+        line = line.strip()
+        if not line:
+            continue
+        row = parse_log_line(line)
+        if row is None:
+            # parse başarısız
+            continue
+        yield row
+
+
+def _iter_block_rows(data):
+    """
+    Satır sonuna hizalı bir bytes bloğunu parse et.
+    """
+    # open(..., errors="ignore") ile aynı decode + universal newline davranışı
+    return _iter_text_lines(io.StringIO(data.decode("utf-8", errors="ignore"), newline=None))
+
+
+def iter_log_rows_text(path, start=0, end=None):
+    """
+    Düz log dosyasını satır satır parse et (her satır str'ye decode edilip LOG_PATTERN ile).
+    end verilirse yalnızca [start, end) byte aralığı okunur.
+    """
+    if end is None:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fin:
+            yield from _iter_text_lines(fin)
+        return
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    yield from _iter_block_rows(data)
+
+
+def is_compressed(path):
+    return path.endswith(COMPRESSED_SUFFIXES)
+
+
+def open_log_stream(path):
+    """
+    Sıkıştırılmış log'u (gz/bz2/xz/zst) binary stream olarak aç.
+    Açma işlemi stream halinde yapılır; geçici dosya yazılmaz.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    if path.endswith(".xz"):
+        return lzma.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path}: .zst desteği için 'pip install zstandard' gerekli")
+        # read_across_frames: çok frame'li dosyalar (pzstd çıktısı, cat ile birleştirilmiş
+        # rotated log'lar) ilk frame'den sonra sessizce kesilmesin
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True,
+                                                         read_across_frames=True)
+        return io.BufferedReader(raw)
+    return open(path, "rb")
+
+
+def _iter_stream_blocks(stream, block_size):
+    """
+    Stream'den ~block_size byte'lık, satır sonuna hizalı bloklar oku.
+    Bellek kullanımı dosya boyutundan bağımsızdır.
+    """
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            break
+        if not data.endswith(b"\n"):
+            data += stream.readline()
+        yield data
+
+
+def iter_log_rows(path):
+    """
+    Tek bir log dosyasını (düz veya sıkıştırılmış) parse et.
+    """
+    if not is_compressed(path):
+        yield from iter_log_rows_text(path)
+        return
+
+    with open_log_stream(path) as stream:
+        fin = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore")
+        yield from _iter_text_lines(fin)
+
+
+def expand_inputs(patterns):
+    """
+    Girdi path/glob listesini dosya listesine çevir (verilen sırada,
+    glob eşleşmeleri kendi içinde alfabetik).
+    """
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print(f"[!] No files match: {pattern}")
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def _new_counts():
+    return {"parsed": 0, "malicious": 0, "benign": 0}
+
+
+def _report_progress(counts):
+    print(f"  Processed {counts['parsed']} lines... "
+          f"(benign: {counts['benign']}, malicious: {counts['malicious']})")
+
+
+def _write_rows(rows, writer, counts, report=False):
+    for row in rows:
+        writer.writerow(row)
+        counts["parsed"] += 1
+
+        if row["label"] == 1:
+            counts["malicious"] += 1
+        else:
+            counts["benign"] += 1
+
+        if report and counts["parsed"] % PROGRESS_EVERY == 0:
+            _report_progress(counts)
+    return counts
+
+
+def _parse_sequential(input_logs, writer):
+    """
+    Log'ları tek process'te sırayla parse et.
+    """
+    counts = _new_counts()
+    for input_log in input_logs:
+        print(f"  -> {input_log}")
+        _write_rows(iter_log_rows(input_log), writer, counts, report=True)
+    return counts
+
+
+def _row_time(row):
+    # Zaman damgası parse edilemeyen satırlar en başa
+    return row["timestamp"] if row["timestamp"] != "" else 0
+
+
+def iter_time_sorted(rows, buffer_size=DEFAULT_SORT_BUFFER):
+    """
+    Neredeyse sıralı satır akışını buffer_size'lık bir min-heap penceresiyle sırala.
+    Access log'lar istek bitişine göre yazıldığı için dosya içinde küçük sıra
+    bozuklukları olur; bozukluk pencereden küçükse çıktı tam sıralıdır.
+    Eşit zaman damgalarında giriş sırası korunur.
+    """
+    heap = []
+    for seq, row in enumerate(rows):
+        item = (_row_time(row), seq, row)
+        if len(heap) < buffer_size:
+            heapq.heappush(heap, item)
+        else:
+            yield heapq.heappushpop(heap, item)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def iter_merged_rows(input_logs, buffer_size=DEFAULT_SORT_BUFFER):
+    """
+    Birden fazla log dosyasını zaman sırasına göre birleştir (k-way merge).
+    Her dosya stream halinde okunur; bellekte dosya başına buffer_size satır tutulur.
+    """
+    streams = [iter_time_sorted(iter_log_rows(path), buffer_size) for path in input_logs]
+    return heapq.merge(*streams, key=_row_time)
+
+
+def _parse_merged(input_logs, writer, buffer_size):
+    """
+    Log'ları zaman sıralı olarak tek CSV'de birleştir.
+    """
+    for input_log in input_logs:
+        print(f"  -> {input_log}")
+    counts = _new_counts()
+    _write_rows(iter_merged_rows(input_logs, buffer_size), writer, counts, report=True)
+    return counts
+
+
+def _chunk_ranges(path, chunk_size):
+    """
+    Dosyayı ~chunk_size byte'lık, satır sonuna hizalı (start, end) aralıklarına böl.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end)
+                f.readline()  # bir sonraki '\n'e kadar ilerle
+                end = f.tell()
+            else:
+                end = size
+            yield start, end
+            start = end
+
+
+def _parse_range(path, start, end):
+    """
+    Worker: düz dosyanın [start, end) byte aralığını parse et.
+    Returns: (CSV metni, counts)
+    """
+    return _rows_to_csv(iter_log_rows_text(path, start, end))
+
+
+def _parse_block(data):
+    """
+    Worker: sıkıştırılmış stream'den okunmuş bir bloğu parse et.
+    Returns: (CSV metni, counts)
+    """
+    return _rows_to_csv(_iter_block_rows(data))
+
+
+def _rows_to_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    counts = _write_rows(rows, writer, _new_counts())
+    return out.getvalue(), counts
+
+
+def _iter_tasks(input_logs, chunk_size):
+    """
+    Worker görevleri: düz dosyalar byte aralığı olarak (worker kendisi okur),
+    sıkıştırılmış dosyalar ana process'te stream edilip blok olarak gönderilir.
+    """
+    for input_log in input_logs:
+        print(f"  -> {input_log}")
+        if is_compressed(input_log):
+            with open_log_stream(input_log) as stream:
+                for block in _iter_stream_blocks(stream, chunk_size):
+                    yield _parse_block, (block,)
+        else:
+            for start, end in _chunk_ranges(input_log, chunk_size):
+                yield _parse_range, (input_log, start, end)
+
+
+def _parse_parallel(input_logs, fout, workers, chunk_size):
+    """
+    Log'ları satır sonuna hizalı chunk'lara bölüp process pool'da parse et.
+    Sonuçlar orijinal sırada CSV'ye yazılır; bellekte en fazla
+    2 * workers chunk (ve sonucu) tutulur.
+    """
+    counts = _new_counts()
+    next_report = PROGRESS_EVERY
+    window = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        tasks = _iter_tasks(input_logs, chunk_size)
+
+        def submit_next():
+            task = next(tasks, None)
+            if task is None:
+                return False
+            fn, fn_args = task
+            pending.append(pool.submit(fn, *fn_args))
+            return True
+
+        while len(pending) < window and submit_next():
+            pass
+
+        while pending:
+            text, chunk_counts = pending.popleft().result()
+            submit_next()
+
+            fout.write(text)
+            for key in counts:
+                counts[key] += chunk_counts[key]
+
+            if counts["parsed"] >= next_report:
+                _report_progress(counts)
+                while next_report <= counts["parsed"]:
+                    next_report += PROGRESS_EVERY
+    return counts
+
+
 def main():
-    import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_dir = os.path.dirname(script_dir)
-    
-    input_log = os.path.join(project_dir, "access.log")
-    output_csv = os.path.join(project_dir, "http_requests_labeled.csv")
-
-    print(f"[*] Parsing {input_log} ...")
-    
-    parsed_count = 0
-    malicious_count = 0
-    benign_count = 0
-
-    with open(input_log, "r", encoding="utf-8", errors="ignore") as fin, \
-         open(output_csv, "w", newline="", encoding="utf-8") as fout:
-        
-        writer = csv.DictWriter(fout, fieldnames=[
-            "ip", "method", "path", "query", "user_agent", "headers", "content_length", "label"
-        ])
-        writer.writeheader()
 
-        for line_num, line in enumerate(fin, start=1):
-            line = line.strip()
-            if not line:
-                continue
+    parser = argparse.ArgumentParser(description="access.log -> etiketli CSV")
+    parser.add_argument("--input", nargs="+", default=[os.path.join(project_dir, "access.log")],
+                        help="Girdi log dosyaları / glob'lar (.gz, .bz2, .xz, .zst desteklenir)")
+    parser.add_argument("--output", default=os.path.join(project_dir, "http_requests_labeled.csv"),
+                        help="Çıktı CSV dosyası")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Paralel parse için process sayısı (1 = tek process)")
+    parser.add_argument("--chunk-size-mb", type=int, default=64,
+                        help="Worker başına chunk boyutu (MB)")
+    parser.add_argument("--sort-by-time", action="store_true",
+                        help="Çıktıyı zaman damgasına göre sırala (birden fazla log'u k-way merge ile birleştirir)")
+    parser.add_argument("--sort-buffer", type=int, default=DEFAULT_SORT_BUFFER,
+                        help="Dosya içi sıra bozuklukları için yeniden sıralama penceresi (satır)")
+    args = parser.parse_args()
+    if args.sort_buffer < 1:
+        parser.error("--sort-buffer must be >= 1")
 
-            row = parse_log_line(line)
-            if row is None:
-                # parse başarısız
-                continue
+    input_logs = expand_inputs(args.input)
+    output_csv = args.output
 
-            writer.writerow(row)
-            parsed_count += 1
+    print(f"[*] Parsing {len(input_logs)} log file(s) ...")
+    if args.sort_by_time:
+        print(f"    Time-sorted merge (sort buffer: {args.sort_buffer} rows)")
+        if args.workers > 1:
+            print("[!] --sort-by-time merges in a single process; --workers ignored")
+    elif args.workers > 1:
+        print(f"    Workers: {args.workers}, chunk size: {args.chunk_size_mb} MB")
 
-            if row["label"] == 1:
-                malicious_count += 1
-            else:
-                benign_count += 1
+    with open(output_csv, "w", newline="", encoding="utf-8") as fout:
+        writer = csv.DictWriter(fout, fieldnames=CSV_FIELDS)
+        writer.writeheader()
 
-            if parsed_count % 50000 == 0:
-                print(f"  Processed {parsed_count} lines... (benign: {benign_count}, malicious: {malicious_count})")
+        if args.sort_by_time:
+            counts = _parse_merged(input_logs, writer, args.sort_buffer)
+        elif args.workers > 1:
+            counts = _parse_parallel(input_logs, fout, args.workers,
+                                     args.chunk_size_mb * 1024 * 1024)
+        else:
+            counts = _parse_sequential(input_logs, writer)
 
-    print(f"[+] Done! Parsed {parsed_count} requests.")
-    print(f"    Benign: {benign_count}, Malicious: {malicious_count}")
+    print(f"[+] Done! Parsed {counts['parsed']} requests.")
+    print(f"    Benign: {counts['benign']}, Malicious: {counts['malicious']}")
     print(f"[+] Output: {output_csv}")
 
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Çoklu pattern eşleştirici (Aho-Corasick).
+features.py ve parse_access_log.py'deki keyword listeleri için ortak kullanılır:
+string bir kez küçük harfe çevrilir, tek geçişte taranır ve eşleşen pattern
+aileleri (login, sqli, xss, ...) bit maskesi olarak döner.
+"""
+from typing import Dict, Sequence
+
+try:
+    import ahocorasick  # pyahocorasick (C extension)
+except ImportError:
+    ahocorasick = None
+
+
+class PatternMatcher:
+    """
+    Pattern ailelerinden import sırasında bir kez derlenen automaton.
+
+    families: {"login": [...], "sqli": [...], ...}
+    scan(text)   -> eşleşen ailelerin bit maskesi (bits[name] ile test edilir)
+    search(text) -> herhangi bir pattern eşleşti mi (ilk eşleşmede durur)
+
+    Eşleştirme, eski `p in text.lower()` döngüleriyle aynıdır (case-insensitive
+    substring). pyahocorasick kurulu değilse aynı sonucu veren, string'i yine
+    tek sefer lower() eden döngü tabanlı fallback kullanılır.
+    """
+
+    def __init__(self, families: Dict[str, Sequence[str]]):
+        self.families = list(families)
+        self.bits = {name: 1 << i for i, name in enumerate(self.families)}
+        self.all_mask = (1 << len(self.families)) - 1
+
+        # Aynı pattern birden fazla ailede olabilir -> maskeleri birleştir
+        masks = {}
+        for name, patterns in families.items():
+            for p in patterns:
+                masks[p] = masks.get(p, 0) | self.bits[name]
+
+        self._automaton = None
+        self._fallback = [(self.bits[name], tuple(patterns))
+                          for name, patterns in families.items() if patterns]
+        if ahocorasick is not None and masks:
+            automaton = ahocorasick.Automaton()
+            for p, mask in masks.items():
+                automaton.add_word(p, mask)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def scan(self, text: str) -> int:
+        if not text:
+            return 0
+        h = text.lower()
+        mask = 0
+        if self._automaton is not None:
+            for _, m in self._automaton.iter(h):
+                mask |= m
+                if mask == self.all_mask:
+                    break
+            return mask
+        for bit, patterns in self._fallback:
+            for p in patterns:
+                if p in h:
+                    mask |= bit
+                    break
+        return mask
+
+    def search(self, text: str) -> bool:
+        if not text:
+            return False
+        h = text.lower()
+        if self._automaton is not None:
+            for _ in self._automaton.iter(h):
+                return True
+            return False
+        for _, patterns in self._fallback:
+            for p in patterns:
+                if p in h:
+                    return True
+        return False
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+MLP için int8 post-training quantization (PTQ) ve quantize edilmiş
+matematiğin Python referans implementasyonu.
+
+Şema (simetrik, zero-point = 0, katman başına tek scale):
+- Giriş: StandardScaler giriş quantization'ına katlanır (int16):
+      x_q = round(clamp(x * QIN_MUL + QIN_ADD, -32767, 32767))
+  QIN_MUL = 1 / (scale * s_in), QIN_ADD = -mean / (scale * s_in)
+  (firmware'de ayrı scale_features / bölme adımı kalmaz). Ham feature'lar
+  8 bitte ciddi doğruluk kaybettiriyor; int16 giriş x int8 ağırlık çarpımı
+  yine de int32 akümülatöre sığar.
+- Katman k: W_q = round(W / s_w) (int8), b_q = round(b / (s_a * s_w)) (int32)
+      acc = b_q + sum(a_q * W_q)                        (int32)
+- Gizli katman: ReLU + requantization (sabit noktalı çarpan, sadece tamsayı).
+  ReLU çıkışı negatif olmadığı için aktivasyonlar uint8 [0, 255]:
+      a_q' = min(((max(acc, 0) >> PRE) * MULT + 2^(SHIFT-1)) >> SHIFT, 255)
+- Çıkış: logit = acc * QOUT_SCALE; sınıf = acc >= 0 (threshold 0.5)
+
+quantized_logits() C koduyla birebir aynı tamsayı işlemlerini yapar; böylece
+float modele göre doğruluk kaybı host'ta ölçülebilir.
+"""
+import numpy as np
+from sklearn.neural_network import MLPClassifier
+
+QMAX = 127            # int8 ağırlıklar
+INPUT_QMAX = 32767    # int16 giriş
+ACT_QMAX = 255        # uint8 gizli aktivasyonlar (ReLU sonrası)
+INT32_MAX = 2**31 - 1
+
+# Aktivasyon aralığı kalibrasyonu: uç değerlerin scale'i şişirmemesi için
+CALIBRATION_PERCENTILE = 99.99
+
+# Requantization çarpanının minimum çözünürlüğü (bit)
+MULT_BITS = 14
+
+
+def _calibrated_scale(values, percentile, qmax):
+    """
+    Kalibrasyon verisinden simetrik scale (|x| persentili / qmax).
+    """
+    bound = float(np.percentile(np.abs(values), percentile))
+    if bound <= 0.0:
+        bound = float(np.max(np.abs(values))) or 1.0
+    return bound / qmax
+
+
+def _requant_params(ratio, acc_max):
+    """
+    acc * ratio ~= ((acc >> PRE) * MULT) >> SHIFT olacak şekilde (PRE, MULT, SHIFT) seç.
+    (acc_max >> PRE) * MULT + yuvarlama terimi int32'ye sığmalı (ESP8266: 32-bit
+    çarpma); PRE, MULT en az MULT_BITS bit çözünürlükte kalana kadar büyütülür.
+    """
+    for pre in range(0, 31):
+        scaled_max = acc_max >> pre
+        for shift in range(30, 0, -1):
+            mult = int(round(ratio * (1 << (shift + pre))))
+            if mult < 1:
+                break
+            if scaled_max * mult + (1 << (shift - 1)) <= INT32_MAX:
+                if mult >= (1 << MULT_BITS) or shift == 30:
+                    return pre, mult, shift
+                break
+    raise ValueError(f"Requantization çarpanı int32'ye sığmıyor (ratio={ratio:g}, acc_max={acc_max})")
+
+
+def quantize_mlp(model, scaler, X_calib, percentile=CALIBRATION_PERCENTILE):
+    """
+    Eğitilmiş MLPClassifier + StandardScaler -> int8 quantization parametreleri.
+
+    X_calib: kalibrasyon için ham (scale edilmemiş) feature matrisi (train split)
+    Returns: dict (input_mul, input_add, input_scale, layers, logit_scale)
+    """
+    if not isinstance(model, MLPClassifier) or model.activation != "relu":
+        raise ValueError("int8 export sadece ReLU aktivasyonlu MLPClassifier destekler")
+    if model.coefs_[-1].shape[1] != 1:
+        raise ValueError("int8 export sadece binary (tek çıkışlı) MLP destekler")
+
+    mean = scaler.mean_.astype(np.float64)
+    scale = scaler.scale_.astype(np.float64)
+    act = (np.asarray(X_calib, dtype=np.float64) - mean) / scale
+
+    s_in = _calibrated_scale(act, percentile, INPUT_QMAX)
+    params = {
+        "input_mul": (1.0 / (scale * s_in)).astype(np.float32),
+        "input_add": (-mean / (scale * s_in)).astype(np.float32),
+        "input_scale": s_in,
+        "layers": [],
+    }
+
+    a_scale, a_max = s_in, INPUT_QMAX
+    n_layers = len(model.coefs_)
+    for k, (W, b) in enumerate(zip(model.coefs_, model.intercepts_)):
+        s_w = (float(np.max(np.abs(W))) or 1.0) / QMAX
+        acc_scale = a_scale * s_w
+        W_q = np.clip(np.round(W / s_w), -QMAX, QMAX).astype(np.int8)
+        b_q = np.round(b / acc_scale).astype(np.int64)
+        layer = {
+            # C tarafında çıkış nöronu başına ardışık erişim için [out][in]
+            "weights": np.ascontiguousarray(W_q.T),
+            "bias": b_q,
+            "acc_scale": acc_scale,
+        }
+
+        if k < n_layers - 1:
+            act = np.maximum(act @ W + b, 0.0)
+            s_out = _calibrated_scale(act, percentile, ACT_QMAX)
+            acc_max = int(np.max(np.abs(b_q) + a_max * np.abs(W_q.astype(np.int64)).sum(axis=0)))
+            if acc_max > INT32_MAX:
+                raise ValueError(f"Katman {k} akümülatörü int32'ye sığmıyor")
+            layer["pre_shift"], layer["multiplier"], layer["shift"] = _requant_params(
+                acc_scale / s_out, acc_max)
+            layer["out_scale"] = s_out
+            a_scale, a_max = s_out, ACT_QMAX
+        params["layers"].append(layer)
+
+    params["logit_scale"] = params["layers"][-1]["acc_scale"]
+    return params
+
+
+def quantize_input(params, X):
+    """
+    Ham feature'lar -> int16 giriş (C: float çarp-topla, clamp, sıfırdan uzağa yuvarla).
+    """
+    v = np.asarray(X, dtype=np.float32) * params["input_mul"] + params["input_add"]
+    v = np.clip(v, np.float32(-INPUT_QMAX), np.float32(INPUT_QMAX))
+    return np.trunc(v + np.copysign(np.float32(0.5), v)).astype(np.int64)
+
+
+def quantized_logits(params, X):
+    """
+    Firmware'deki mlp_logit_q() ile aynı tamsayı hesabı.
+    Returns: (N,) int64 çıkış akümülatörü (logit = acc * logit_scale)
+    """
+    a = quantize_input(params, X)
+    for layer in params["layers"]:
+        acc = a @ layer["weights"].T.astype(np.int64) + layer["bias"]
+        if "multiplier" not in layer:
+            return acc[:, 0]
+        acc = np.maximum(acc, 0) >> layer["pre_shift"]
+        shift = layer["shift"]
+        a = np.minimum((acc * layer["multiplier"] + (1 << (shift - 1))) >> shift, ACT_QMAX)
+    raise ValueError("Quantized modelde çıkış katmanı yok")
+
+
+def quantized_predict_proba(params, X):
+    """
+    Returns: (N,) float32 malicious olasılığı (C: sigmoid(acc * QOUT_SCALE))
+    """
+    logits = quantized_logits(params, X).astype(np.float32) * np.float32(params["logit_scale"])
+    return (1.0 / (1.0 + np.exp(-logits))).astype(np.float32)
+
+
+def quantized_predict(params, X):
+    """
+    Returns: (N,) int32 sınıf (threshold 0.5 <=> acc >= 0)
+    """
+    return (quantized_logits(params, X) >= 0).astype(np.int32)
+
+
+def quantized_size_bytes(params):
+    """
+    Parametre boyutu (byte): int8 ağırlıklar, int32 bias'lar, float32 giriş tabloları.
+    """
+    total = params["input_mul"].nbytes + params["input_add"].nbytes
+    for layer in params["layers"]:
+        total += layer["weights"].size + layer["bias"].size * 4
+    return total
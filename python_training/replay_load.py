@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+WAF yük testi: parse edilmiş log / CSV'deki istekleri hedefe (ESP8266 WAF veya
+yerel backend_api) belirlenen hızda tekrar oynatır.
+
+Open-loop: istekler yanıtları beklemeden takvime göre gönderilir; sunucu
+yavaşlarsa kuyruk büyür ve bu gecikmeye yansır (gecikme, planlanan gönderim
+anından ölçülür -> coordinated omission yok).
+
+Modlar:
+    constant  sabit --rate istek/sn
+    ramp      --rate'ten --rate-end'e doğrusal artış (--duration boyunca)
+    replay    CSV timestamp'lerindeki gerçek aralıklarla (--speedup ile hızlandırılmış)
+
+Ölçülenler: gecikme histogramı (p50/p95/p99), WAF kararları (403 = blocked),
+502/diğer status'lar, timeout / bağlantı hataları; CSV'de label varsa
+tespit doğruluğu.
+
+    python3 replay_load.py --target http://192.168.1.50 --csv ../http_requests_labeled.csv --rate 20
+    python3 replay_load.py --target http://127.0.0.1:8080 --builtin --mode ramp --rate 50 --rate-end 500
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+from urllib.parse import quote, urlsplit
+
+from async_http import HTTPConnectionPool
+
+DEFAULT_CONNECTIONS = 64
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_INFLIGHT = 10000
+
+# requests kütüphanesiyle (test_waf.py) aynı URL quoting: boşluk, <, >, " vb. encode edilir
+URL_SAFE_CHARS = "!#$%&'()*+,/:;=?@[]~"
+
+# Gecikme histogramı: 1 µs'den itibaren logaritmik bucket'lar (%5 çözünürlük)
+HIST_BASE = 1.05
+HIST_MIN_SECONDS = 1e-6
+HIST_BUCKETS = 400   # ~1 µs .. ~5 saat
+
+# Özet histogram sınırları (ms)
+REPORT_EDGES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+HTTP_BLOCKED = 403
+HTTP_BAD_GATEWAY = 502
+
+
+class LatencyHistogram:
+    """
+    Sabit bellekli, log ölçekli gecikme histogramı. Percentile'lar bucket
+    üst sınırından okunur (göreli hata <= %5).
+    """
+
+    def __init__(self):
+        self.counts = [0] * HIST_BUCKETS
+        self.total = 0
+        self.max = 0.0
+        self.sum = 0.0
+
+    def record(self, seconds):
+        if seconds <= HIST_MIN_SECONDS:
+            i = 0
+        else:
+            i = min(int(math.log(seconds / HIST_MIN_SECONDS, HIST_BASE)) + 1, HIST_BUCKETS - 1)
+        self.counts[i] += 1
+        self.total += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _upper(self, i):
+        return HIST_MIN_SECONDS * HIST_BASE ** i
+
+    def percentile(self, p):
+        if self.total == 0:
+            return 0.0
+        target = max(1, math.ceil(self.total * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._upper(i), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0.0
+
+    def coarse(self, edges_ms=REPORT_EDGES_MS):
+        """Özet bucket'lar: [(etiket, adet), ...]"""
+        out = [0] * (len(edges_ms) + 1)
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            ms = self._upper(i) * 1000.0
+            k = next((j for j, e in enumerate(edges_ms) if ms <= e), len(edges_ms))
+            out[k] += c
+        labels = [f"<= {e} ms" for e in edges_ms] + [f"> {edges_ms[-1]} ms"]
+        return list(zip(labels, out))
+
+
+class ReplayStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.status = {}
+        self.sent = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.conn_errors = 0
+        self.dropped = 0
+        # label'lı satırlar için: (label, blocked) -> adet
+        self.confusion = {(0, 0): 0, (0, 1): 0, (1, 0): 0, (1, 1): 0}
+
+    def record_response(self, status, latency, label):
+        self.completed += 1
+        self.latency.record(latency)
+        self.status[status] = self.status.get(status, 0) + 1
+        if label is not None and status != HTTP_BAD_GATEWAY:
+            self.confusion[(label, 1 if status == HTTP_BLOCKED else 0)] += 1
+
+
+def load_items_from_csv(path, limit=None):
+    """
+    parse_access_log CSV'si -> istek listesi.
+    Her öğe: {"method", "target", "headers", "label", "timestamp"}
+    """
+    items = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            target = row.get("path") or "/"
+            if row.get("query"):
+                target += "?" + row["query"]
+            headers = {}
+            if row.get("user_agent"):
+                headers["User-Agent"] = row["user_agent"]
+            for part in (row.get("headers") or "").split(";"):
+                name, sep, value = part.partition(":")
+                if sep and name.strip().lower() == "referer" and value.strip():
+                    headers["Referer"] = value.strip()
+            label = row.get("label")
+            ts = row.get("timestamp")
+            items.append({
+                "method": (row.get("method") or "GET").upper(),
+                "target": target,
+                "headers": headers,
+                "label": int(label) if label not in (None, "") else None,
+                "timestamp": float(ts) if ts not in (None, "") else None,
+            })
+            if limit and len(items) >= limit:
+                break
+    return items
+
+
+def load_items_from_log(paths, limit=None):
+    """Ham access log(lar) -> istek listesi (parse_access_log ile aynı parse)."""
+    from parse_access_log import iter_merged_rows
+
+    items = []
+    for row in iter_merged_rows(paths):
+        target = row["path"] + ("?" + row["query"] if row["query"] else "")
+        headers = {"User-Agent": row["user_agent"]} if row["user_agent"] else {}
+        items.append({
+            "method": row["method"].upper(),
+            "target": target,
+            "headers": headers,
+            "label": row["label"],
+            "timestamp": float(row["timestamp"]) if row["timestamp"] != "" else None,
+        })
+        if limit and len(items) >= limit:
+            break
+    return items
+
+
+def load_builtin_items():
+    """test_waf.py'deki senaryolar (expected -> label)."""
+    from test_waf import TEST_CASES
+
+    return [{
+        "method": "GET",
+        "target": case["path"],
+        "headers": {"User-Agent": case["user_agent"]},
+        "label": 1 if case["expected"] == "malicious" else 0,
+        "timestamp": None,
+    } for case in TEST_CASES]
+
+
+def schedule_offsets(mode, rate, rate_end, duration, items=None, speedup=1.0):
+    """
+    Gönderim anları (başlangıca göre saniye) üreteci.
+    constant: i / rate;  ramp: N(t) = r0*t + (r1-r0)*t^2/(2D) = i çözümü;
+    replay: (ts_i - ts_0) / speedup (her satır bir kez; duration kullanılmaz).
+    """
+    if mode == "replay":
+        t0 = items[0]["timestamp"]
+        for item in items:
+            yield (item["timestamp"] - t0) / speedup
+        return
+
+    i = 0
+    while True:
+        if mode == "constant" or rate_end == rate:
+            t = i / rate
+        else:
+            a = (rate_end - rate) / (2.0 * duration)
+            t = (-rate + math.sqrt(rate * rate + 4.0 * a * i)) / (2.0 * a)
+        if t >= duration:
+            return
+        yield t
+        i += 1
+
+
+async def run_load(pool, items, offsets, timeout, max_inflight):
+    """
+    Open-loop gönderim: her istek planlanan anında task olarak başlatılır.
+    Returns: (ReplayStats, geçen süre)
+    """
+    stats = ReplayStats()
+    loop = asyncio.get_running_loop()
+    inflight = set()
+
+    async def fire(item, scheduled):
+        try:
+            target = quote(item["target"], safe=URL_SAFE_CHARS)
+            response = await asyncio.wait_for(
+                pool.request(item["method"], target, item["headers"]), timeout
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            stats.conn_errors += 1
+        else:
+            stats.record_response(response.status, loop.time() - scheduled, item["label"])
+
+    start = loop.time()
+    for k, offset in enumerate(offsets):
+        scheduled = start + offset
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        item = items[k % len(items)]
+        stats.sent += 1
+        if len(inflight) >= max_inflight:
+            stats.dropped += 1
+            continue
+        task = asyncio.create_task(fire(item, scheduled))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+
+    if inflight:
+        await asyncio.wait(inflight)
+    return stats, loop.time() - start
+
+
+def summarize(stats, elapsed, args):
+    lat = stats.latency
+    summary = {
+        "target": args.target,
+        "mode": args.mode,
+        "elapsed_sec": round(elapsed, 3),
+        "sent": stats.sent,
+        "completed": stats.completed,
+        "achieved_rps": round(stats.completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(lat.mean() * 1000, 3),
+            "p50": round(lat.percentile(50) * 1000, 3),
+            "p95": round(lat.percentile(95) * 1000, 3),
+            "p99": round(lat.percentile(99) * 1000, 3),
+            "max": round(lat.max * 1000, 3),
+        },
+        "latency_histogram": dict(lat.coarse()),
+        "status": {str(k): v for k, v in sorted(stats.status.items())},
+        "blocked": stats.status.get(HTTP_BLOCKED, 0),
+        "backend_errors": stats.status.get(HTTP_BAD_GATEWAY, 0),
+        "timeouts": stats.timeouts,
+        "connection_errors": stats.conn_errors,
+        "dropped": stats.dropped,
+        "error_rate": round((stats.timeouts + stats.conn_errors + stats.dropped) / stats.sent, 4)
+        if stats.sent else 0.0,
+    }
+    c = stats.confusion
+    if sum(c.values()):
+        tp, fp, fn, tn = c[(1, 1)], c[(0, 1)], c[(1, 0)], c[(0, 0)]
+        summary["detection"] = {
+            "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+            "precision": round(tp / (tp + fp), 4) if tp + fp else 0.0,
+            "recall": round(tp / (tp + fn), 4) if tp + fn else 0.0,
+        }
+    return summary
+
+
+def print_report(summary):
+    print(f"\n{'='*60}")
+    print(f"REPLAY LOAD REPORT ({summary['mode']} -> {summary['target']})")
+    print('='*60)
+    print(f"  Sent:      {summary['sent']:,}   Completed: {summary['completed']:,}   "
+          f"in {summary['elapsed_sec']:.1f}s ({summary['achieved_rps']:,.1f} req/s)")
+    lat = summary["latency_ms"]
+    print(f"  Latency:   p50 {lat['p50']:.2f} ms | p95 {lat['p95']:.2f} ms | "
+          f"p99 {lat['p99']:.2f} ms | max {lat['max']:.2f} ms")
+
+    hist = summary["latency_histogram"]
+    peak = max(hist.values()) or 1
+    for label, count in hist.items():
+        if count:
+            print(f"    {label:>12s} | {'#' * max(1, round(40 * count / peak)):40s} {count}")
+
+    completed = summary["completed"] or 1
+    print(f"  Blocked:   {summary['blocked']:,} ({100 * summary['blocked'] / completed:.1f}%)"
+          f"   Backend 502: {summary['backend_errors']:,}")
+    print(f"  Status:    {summary['status']}")
+    print(f"  Errors:    timeouts {summary['timeouts']:,} | connection {summary['connection_errors']:,}"
+          f" | dropped {summary['dropped']:,} | error rate {100 * summary['error_rate']:.2f}%")
+    if "detection" in summary:
+        d = summary["detection"]
+        print(f"  Detection: TP {d['tp']} FP {d['fp']} FN {d['fn']} TN {d['tn']} | "
+              f"precision {d['precision']:.3f} recall {d['recall']:.3f}")
+    print('='*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WAF traffic replay load generator (asyncio, open-loop)")
+    parser.add_argument("--target", default="http://192.168.1.50", help="WAF / backend URL")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--csv", help="parse_access_log CSV'si")
+    source.add_argument("--log", nargs="+", help="Ham access log(lar) (zaman sıralı birleştirilir)")
+    source.add_argument("--builtin", action="store_true", help="test_waf.py senaryoları (varsayılan)")
+    parser.add_argument("--limit", type=int, help="Kaynaktan okunacak maksimum istek")
+    parser.add_argument("--mode", choices=("constant", "ramp", "replay"), default="constant")
+    parser.add_argument("--rate", type=float, default=10.0, help="İstek/sn (ramp: başlangıç)")
+    parser.add_argument("--rate-end", type=float, help="ramp: bitiş hızı (istek/sn)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test süresi (sn, constant/ramp)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="replay: zaman ölçeği")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                        help="Maksimum eşzamanlı bağlantı (ESP8266 için 4-5 önerilir)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="İstek timeout'u (sn)")
+    parser.add_argument("--max-inflight", type=int, default=DEFAULT_MAX_INFLIGHT,
+                        help="Bu kadar istek beklerken yenileri düşürülür (dropped)")
+    parser.add_argument("--output", help="Özeti JSON olarak kaydet")
+    args = parser.parse_args()
+
+    url = urlsplit(args.target)
+    if url.scheme != "http" or not url.hostname:
+        parser.error("--target must be an http:// URL")
+    if args.rate <= 0 or args.duration <= 0:
+        parser.error("--rate and --duration must be > 0")
+    if args.mode == "ramp" and (args.rate_end is None or args.rate_end <= 0):
+        parser.error("--mode ramp requires --rate-end > 0")
+
+    if args.csv:
+        print(f"[*] Loading requests from {args.csv} ...")
+        items = load_items_from_csv(args.csv, args.limit)
+    elif args.log:
+        print(f"[*] Parsing {len(args.log)} log file(s) ...")
+        items = load_items_from_log(args.log, args.limit)
+    else:
+        items = load_builtin_items()
+    if not items:
+        print("[!] No requests to replay")
+        raise SystemExit(1)
+
+    if args.mode == "replay":
+        items = [it for it in items if it["timestamp"] is not None]
+        if not items:
+            parser.error("--mode replay needs rows with timestamps (parse_access_log CSV)")
+        n = len(items)
+        expected = (items[-1]["timestamp"] - items[0]["timestamp"]) / args.speedup
+        print(f"    {n:,} requests, replaying {expected:.1f}s of traffic at {args.speedup:g}x")
+    elif args.mode == "ramp":
+        print(f"    {len(items):,} requests, ramp {args.rate:g} -> {args.rate_end:g} req/s "
+              f"over {args.duration:g}s")
+    else:
+        print(f"    {len(items):,} requests, {args.rate:g} req/s for {args.duration:g}s")
+
+    offsets = schedule_offsets(args.mode, args.rate, args.rate_end or args.rate,
+                               args.duration, items, args.speedup)
+
+    async def run():
+        pool = HTTPConnectionPool(url.hostname, url.port or 80, args.connections)
+        try:
+            return await run_load(pool, items, offsets, args.timeout, args.max_inflight)
+        finally:
+            pool.close()
+
+    print(f"[*] Driving {args.target} (open loop, {args.connections} connections) ...")
+    stats, elapsed = asyncio.run(run())
+    summary = summarize(stats, elapsed, args)
+    print_report(summary)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"[+] Report saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+ESP8266 bütçesine uygun küçük model araması (hyperparameter sweep).
+- MLP: gizli katman genişliği / derinliği / L2 (alpha)
+- Decision Tree: max_depth / min_samples_leaf
+- Logistic Regression: C
+Adaylar paralel eğitilir; MLP'ler successive halving ile kademeli eğitilir
+ve kötü giden denemeler erken durdurulur. Sonuçlar n_params, float32 byte
+ve inference başına MAC kısıtlarına göre filtrelenip F1'e göre sıralanır;
+F1 - model boyutu Pareto sınırı raporlanır.
+"""
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+import warnings
+
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from features import N_FEATURES
+from train_models import (
+    count_params,
+    estimate_macs,
+    evaluate_model,
+    load_training_data,
+    report_test_metrics,
+    save_model,
+    split_dataset,
+)
+
+# Arama uzayı
+MLP_WIDTHS = (4, 6, 8, 12, 16)
+MLP_DEPTHS = (1, 2)
+MLP_ALPHAS = (1e-5, 1e-4, 1e-3, 1e-2)
+TREE_DEPTHS = (3, 4, 5, 6, 8)
+TREE_MIN_LEAF = (5, 10, 50)
+LOGREG_C = (0.01, 0.1, 1.0, 10.0)
+
+# Successive halving: MLP'ler için toplam epoch bütçeleri, her turda ilk 1/ETA kalır
+EPOCH_SCHEDULE = (5, 15, 40)
+ETA = 2
+
+# Worker process'lerde paylaşılan veri (_init_worker ile atanır)
+_DATA = {}
+
+
+def mlp_cost(hidden, n_features=N_FEATURES):
+    """
+    Eğitmeden MLP maliyeti: (n_params, MACs). Çıkış katmanı 1 nöron.
+    """
+    sizes = [n_features] + list(hidden) + [1]
+    macs = sum(a * b for a, b in zip(sizes[:-1], sizes[1:]))
+    return macs + sum(sizes[1:]), macs
+
+
+def build_trials():
+    """
+    Arama uzayındaki tüm denemeler (config dict listesi).
+    """
+    trials = []
+    for depth, width, alpha in itertools.product(MLP_DEPTHS, MLP_WIDTHS, MLP_ALPHAS):
+        hidden = (width,) * depth
+        n_params, macs = mlp_cost(hidden)
+        trials.append({
+            "name": f"MLP{hidden} alpha={alpha:g}",
+            "estimator": MLPClassifier,
+            "params": dict(
+                hidden_layer_sizes=hidden,
+                activation="relu",
+                solver="adam",
+                alpha=alpha,
+                batch_size=64,
+                learning_rate_init=1e-3,
+                random_state=42,
+                warm_start=True,
+            ),
+            "scaled": True,
+            "iterative": True,
+            "est_params": n_params,
+            "est_macs": macs,
+        })
+    for depth, min_leaf in itertools.product(TREE_DEPTHS, TREE_MIN_LEAF):
+        trials.append({
+            "name": f"DecisionTree(max_depth={depth}, min_leaf={min_leaf})",
+            "estimator": DecisionTreeClassifier,
+            "params": dict(
+                max_depth=depth,
+                min_samples_leaf=min_leaf,
+                random_state=42,
+                class_weight="balanced"
+            ),
+            "scaled": False,
+            "iterative": False,
+            # Eğitimden önce bilinen üst sınır: tam dolu ağaç
+            "est_params": (2 ** (depth + 1) - 1) * 4,
+            "est_macs": depth,
+        })
+    for c in LOGREG_C:
+        trials.append({
+            "name": f"LogisticRegression(C={c:g})",
+            "estimator": LogisticRegression,
+            "params": dict(
+                C=c,
+                max_iter=1000,
+                class_weight="balanced",
+                solver="lbfgs",
+                random_state=42
+            ),
+            "scaled": True,
+            "iterative": False,
+            "est_params": N_FEATURES + 1,
+            "est_macs": N_FEATURES,
+        })
+    for i, trial in enumerate(trials):
+        trial["id"] = i
+    return trials
+
+
+def within_budget(n_params, macs, limits):
+    if n_params is None or macs is None:
+        return False
+    return (n_params <= limits["max_params"]
+            and n_params * 4 <= limits["max_bytes"]
+            and macs <= limits["max_macs"])
+
+
+def _init_worker(data):
+    _DATA.update(data)
+
+
+def _run_trial(task):
+    """
+    Worker: denemeyi (gerekirse önceki turdaki modelden devam ederek) eğit.
+    task: (trial, model veya None, epoch sayısı veya None)
+    """
+    trial, model, epochs = task
+    if model is None:
+        model = trial["estimator"](**trial["params"])
+    if epochs is not None:
+        # warm_start=True: fit() önceki ağırlıklardan devam eder
+        model.max_iter = epochs
+
+    suffix = "scaled" if trial["scaled"] else "raw"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=ConvergenceWarning)
+        result = evaluate_model(
+            trial["name"], model,
+            _DATA[f"X_train_{suffix}"], _DATA["y_train"],
+            _DATA[f"X_val_{suffix}"], _DATA["y_val"]
+        )
+    result["id"] = trial["id"]
+    return result
+
+
+def _run_round(pool, tasks):
+    if pool is None:
+        return [_run_trial(t) for t in tasks]
+    return pool.map(_run_trial, tasks, chunksize=1)
+
+
+def pareto_frontier(results):
+    """
+    F1 - model boyutu (float32 byte) Pareto sınırı: daha küçük hiçbir modelin
+    daha yüksek (veya eşit) F1'e sahip olmadığı sonuçlar, boyuta göre artan.
+    """
+    frontier = []
+    best_f1 = -1.0
+    for r in sorted(results, key=lambda r: (r["n_params"], -r["f1"])):
+        if r["f1"] > best_f1:
+            frontier.append(r)
+            best_f1 = r["f1"]
+    return frontier
+
+
+def run_sweep(trials, data, limits, jobs):
+    """
+    Successive halving ile arama.
+    Returns: deneme sonuçları (her deneme için son tur)
+    """
+    feasible = [t for t in trials if t["iterative"] is False
+                or within_budget(t["est_params"], t["est_macs"], limits)]
+    skipped = len(trials) - len(feasible)
+    print(f"[*] {len(feasible)} trials within budget ({skipped} skipped before training)")
+
+    by_id = {t["id"]: t for t in feasible}
+    final = {}
+    pool = None
+    if jobs > 1:
+        pool = multiprocessing.Pool(processes=jobs, initializer=_init_worker, initargs=(data,))
+    else:
+        _init_worker(data)
+
+    try:
+        # Tur 0: tüm denemeler; iteratif olmayanlar burada tamamlanır
+        tasks = [(t, None, EPOCH_SCHEDULE[0] if t["iterative"] else None) for t in feasible]
+        t0 = time.perf_counter()
+        results = _run_round(pool, tasks)
+        print(f"    Round 0: {len(tasks)} trials, {EPOCH_SCHEDULE[0]} epochs "
+              f"({time.perf_counter() - t0:.1f}s)")
+
+        survivors = []
+        for r in results:
+            r["epochs"] = EPOCH_SCHEDULE[0] if by_id[r["id"]]["iterative"] else None
+            final[r["id"]] = r
+            if by_id[r["id"]]["iterative"]:
+                survivors.append(r)
+
+        for rnd in range(1, len(EPOCH_SCHEDULE)):
+            if not survivors:
+                break
+            # Kötü giden denemeleri erken durdur: yalnızca ilk 1/ETA devam eder
+            survivors.sort(key=lambda r: r["f1"], reverse=True)
+            keep = max(1, math.ceil(len(survivors) / ETA))
+            for r in survivors[keep:]:
+                r["stopped_early"] = True
+            survivors = survivors[:keep]
+
+            extra = EPOCH_SCHEDULE[rnd] - EPOCH_SCHEDULE[rnd - 1]
+            tasks = [(by_id[r["id"]], r["model"], extra) for r in survivors]
+            t0 = time.perf_counter()
+            results = _run_round(pool, tasks)
+            print(f"    Round {rnd}: {len(tasks)} trials, +{extra} epochs "
+                  f"({time.perf_counter() - t0:.1f}s)")
+            for prev, r in zip(survivors, results):
+                r["epochs"] = EPOCH_SCHEDULE[rnd]
+                r["train_time"] += prev["train_time"]
+                final[r["id"]] = r
+            survivors = results
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    for r in final.values():
+        r["scaled"] = by_id[r["id"]]["scaled"]
+        r["n_params"] = count_params(r["model"])
+        r["macs"] = estimate_macs(r["model"])
+        r["size_bytes"] = r["n_params"] * 4
+        r["within_budget"] = within_budget(r["n_params"], r["macs"], limits)
+        r.setdefault("stopped_early", False)
+    return list(final.values())
+
+
+def _print_table(title, rows):
+    print("\n" + "="*100)
+    print(title)
+    print("="*100)
+    print(f"{'Model':42s} | {'F1':>6s} | {'Params':>6s} | {'Bytes':>6s} | {'MACs':>5s} | "
+          f"{'Epochs':>6s} | {'Time':>7s}")
+    print("-"*100)
+    for r in rows:
+        epochs = "-" if r["epochs"] is None else str(r["epochs"])
+        flag = " (stopped)" if r["stopped_early"] else ""
+        print(f"{r['name'][:42]:42s} | {r['f1']:6.4f} | {r['n_params']:6d} | "
+              f"{r['size_bytes']:6d} | {r['macs']:5d} | {epochs:>6s} | "
+              f"{r['train_time']:6.1f}s{flag}")
+
+
+def _write_report(path, limits, ranked, frontier, rejected):
+    def row(r):
+        return {
+            "name": r["name"], "f1": r["f1"], "precision": r["precision"],
+            "recall": r["recall"], "n_params": r["n_params"],
+            "size_bytes": r["size_bytes"], "macs": r["macs"], "epochs": r["epochs"],
+            "train_time": r["train_time"], "stopped_early": r["stopped_early"],
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "limits": limits,
+            "ranked": [row(r) for r in ranked],
+            "pareto_frontier": [row(r) for r in frontier],
+            "over_budget": [row(r) for r in rejected],
+        }, f, indent=2)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(description="ESP8266 bütçeli model araması")
+    parser.add_argument("--csv", default=os.path.join(project_dir, "http_requests_labeled.csv"),
+                        help="Etiketli CSV (parse_access_log çıktısı)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Feature cache'i kullanma, CSV'den yeniden çıkar")
+    parser.add_argument("--max-params", type=int, default=1000, help="Maksimum parametre sayısı")
+    parser.add_argument("--max-bytes", type=int, default=4096, help="Maksimum float32 model boyutu")
+    parser.add_argument("--max-macs", type=int, default=1000, help="Inference başına maksimum MAC")
+    parser.add_argument("--max-train", type=int, default=0,
+                        help="Arama için train set'ten alınacak maksimum örnek (0 = hepsi)")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Paralel process sayısı (0 = CPU sayısı, 1 = sıralı)")
+    parser.add_argument("--report", default=os.path.join(script_dir, "sweep_results.json"),
+                        help="JSON rapor dosyası")
+    parser.add_argument("--save-best", action="store_true",
+                        help="Bütçeye uyan en iyi modeli best_model.pkl / scaler.pkl olarak kaydet")
+    args = parser.parse_args()
+
+    limits = {"max_params": args.max_params, "max_bytes": args.max_bytes,
+              "max_macs": args.max_macs}
+
+    X, y = load_training_data(args.csv, args.no_cache)
+    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(X, y)
+    if args.max_train and len(y_train) > args.max_train:
+        rng = np.random.default_rng(42)
+        idx = np.sort(rng.choice(len(y_train), args.max_train, replace=False))
+        X_train, y_train = X_train[idx], y_train[idx]
+    print(f"    Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
+
+    scaler = StandardScaler()
+    data = {
+        "X_train_scaled": scaler.fit_transform(X_train), "X_val_scaled": scaler.transform(X_val),
+        "X_train_raw": X_train, "X_val_raw": X_val,
+        "y_train": y_train, "y_val": y_val,
+    }
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    print(f"\n[*] Sweeping ({jobs} parallel job(s)), budget: params <= {args.max_params}, "
+          f"bytes <= {args.max_bytes}, MACs <= {args.max_macs}")
+    results = run_sweep(build_trials(), data, limits, jobs)
+
+    ranked = sorted((r for r in results if r["within_budget"]),
+                    key=lambda r: (-r["f1"], r["n_params"]))
+    rejected = [r for r in results if not r["within_budget"]]
+    frontier = pareto_frontier(ranked)
+
+    _print_table(f"RANKED CANDIDATES WITHIN BUDGET ({len(ranked)})", ranked)
+    if rejected:
+        print(f"\n[!] {len(rejected)} trained candidates exceeded the budget after training")
+    _print_table("PARETO FRONTIER (F1 vs. model size)", frontier)
+
+    _write_report(args.report, limits, ranked, frontier, rejected)
+    print(f"\n[+] Report: {args.report}")
+
+    if not ranked:
+        print("[!] No candidate fits the budget")
+        return
+
+    best = ranked[0]
+    print("\n" + "="*60)
+    print(f"BEST MODEL WITHIN BUDGET: {best['name']} (F1: {best['f1']:.4f})")
+    print("="*60)
+    print("\n[*] Evaluating best model on TEST set...")
+    X_test_used = scaler.transform(X_test) if best["scaled"] else X_test
+    report_test_metrics(best["model"], X_test_used, y_test)
+
+    if args.save_best:
+        save_model(script_dir, best["model"], scaler)
+
+
+if __name__ == "__main__":
+    main()
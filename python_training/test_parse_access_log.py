@@ -0,0 +1,49 @@
+"""
+parse_access_log okuyucu testleri (python -m pytest python_training).
+"""
+import gzip
+
+import pytest
+
+from parse_access_log import _iter_stream_blocks, iter_log_rows, open_log_stream
+
+LINE = ('10.0.0.{i} - - [10/Oct/2024:13:55:{s:02d} +0000] "GET /page/{i}?id={i} HTTP/1.1" '
+        '200 {i} "-" "Mozilla/5.0" "-"\n')
+
+
+def _lines(start, count):
+    return "".join(LINE.format(i=i, s=i % 60) for i in range(start, start + count)).encode("utf-8")
+
+
+def _two_frame_zst(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    cctx = zstandard.ZstdCompressor()
+    path = tmp_path / "access.log.zst"
+    # İki bağımsız frame: `cat a.log.zst b.log.zst` veya pzstd çıktısı gibi
+    first, second = _lines(0, 3), _lines(3, 4)
+    path.write_bytes(cctx.compress(first) + cctx.compress(second))
+    return str(path), first + second, len(first)
+
+
+def test_zst_reads_all_frames(tmp_path):
+    path, _, _ = _two_frame_zst(tmp_path)
+
+    rows = list(iter_log_rows(path))
+    assert [row["path"] for row in rows] == [f"/page/{i}" for i in range(7)]
+
+
+def test_zst_blocks_cross_frame_boundary(tmp_path):
+    # --workers yolu: blok tam frame sınırında bitince ikinci frame kaybolmamalı
+    path, expected, first_frame_size = _two_frame_zst(tmp_path)
+
+    with open_log_stream(path) as stream:
+        blocks = list(_iter_stream_blocks(stream, first_frame_size))
+    assert b"".join(blocks) == expected
+
+
+def test_gz_reads_all_members(tmp_path):
+    path = tmp_path / "access.log.gz"
+    path.write_bytes(gzip.compress(_lines(0, 2)) + gzip.compress(_lines(2, 2)))
+
+    rows = list(iter_log_rows(str(path)))
+    assert [row["content_length"] for row in rows] == [0, 1, 2, 3]
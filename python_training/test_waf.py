@@ -2,6 +2,8 @@
 """
 ESP8266 WAF test script'i.
 Çeşitli benign ve malicious HTTP istekleri göndererek WAF'ın tepkisini test eder.
+İstekler tek tek ve aralıklı gönderilir (fonksiyonel test); throughput / gecikme
+ölçümü için replay_load.py kullanın (--builtin aynı senaryoları yük altında oynatır).
 """
 import requests
 import time
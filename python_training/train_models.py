@@ -6,6 +6,12 @@
 - Küçük Decision Tree
 Her biri için accuracy, precision, recall, F1 ve parametre sayısını karşılaştırır.
 """
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -14,55 +20,89 @@ from sklearn.metrics import (
     precision_recall_fscore_support,
     accuracy_score
 )
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.tree import DecisionTreeClassifier
 import pickle
 
-from features import load_dataset_from_csv
+try:
+    import resource  # peak RSS ölçümü (Unix)
+except ImportError:
+    resource = None
+
+from features import N_FEATURES, iter_dataset_batches, load_dataset_from_csv
+from feature_cache import cache_entry_dir, load_features_cached
+
+
+CLASSES = np.array([0, 1])
 
 
-def evaluate_model(name, model, X_train, y_train, X_val, y_val):
+def count_params(model):
     """
-    Modeli eğit ve validation set'te değerlendir.
+    Parametre sayısı tahmini (desteklenmeyen model tipleri için None).
     """
-    print(f"\n{'='*60}")
-    print(f"Training: {name}")
-    print('='*60)
-    
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_val)
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return model.coef_.size + model.intercept_.size
+    if isinstance(model, MLPClassifier):
+        n_params = 0
+        for w, b in zip(model.coefs_, model.intercepts_):
+            n_params += w.size + b.size
+        return n_params
+    if isinstance(model, DecisionTreeClassifier):
+        return model.tree_.node_count * 4  # yaklaşık
+    return None
+
 
-    acc = accuracy_score(y_val, y_pred)
+def estimate_macs(model):
+    """
+    Inference başına tahmini multiply-accumulate (tree için karşılaştırma) sayısı.
+    """
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return model.coef_.size
+    if isinstance(model, MLPClassifier):
+        return sum(w.size for w in model.coefs_)
+    if isinstance(model, DecisionTreeClassifier):
+        return model.get_depth()
+    return None
+
+
+def compute_metrics(y_true, y_pred):
+    """
+    Returns: (accuracy, precision, recall, f1)
+    """
+    acc = accuracy_score(y_true, y_pred)
     precision, recall, f1, _ = precision_recall_fscore_support(
-        y_val, y_pred, average="binary", zero_division=0
+        y_true, y_pred, average="binary", zero_division=0
     )
-    cm = confusion_matrix(y_val, y_pred)
+    return acc, precision, recall, f1
 
-    print(f"\nConfusion matrix (Val):")
-    print(cm)
-    print(f"\nMetrics:")
-    print(f"  Accuracy:  {acc:.4f}")
-    print(f"  Precision: {precision:.4f}")
-    print(f"  Recall:    {recall:.4f}")
-    print(f"  F1-score:  {f1:.4f}")
 
-    # Parametre sayısı tahmini
-    n_params = None
-    if isinstance(model, LogisticRegression):
-        n_params = model.coef_.size + model.intercept_.size
-    elif isinstance(model, MLPClassifier):
-        n_params = 0
-        for w, b in zip(model.coefs_, model.intercepts_):
-            n_params += w.size + b.size
-    elif isinstance(model, DecisionTreeClassifier):
-        n_params = model.tree_.node_count * 4  # yaklaşık
+def _peak_rss_mb():
+    """
+    Process'in şimdiye kadarki en yüksek RSS değeri (MB), ölçülemezse None.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
 
-    if n_params is not None:
-        size_bytes = n_params * 4  # float32
-        print(f"\nModel size:")
-        print(f"  Param count: {n_params}")
-        print(f"  Float32 size: {size_bytes} bytes (~{size_bytes/1024:.2f} KB)")
+
+def evaluate_model(name, model, X_train, y_train, X_val, y_val, measure_rss=False):
+    """
+    Modeli eğit ve validation set'te değerlendir; eğitim süresi de ölçülür.
+    measure_rss=True: process'in peak RSS'i ve fit sırasındaki artışı da döner.
+    ru_maxrss process ömrü boyunca en yüksek değer olduğundan bu değerler yalnızca
+    modele ayrılmış taze bir process'te (train_candidates) modelin maliyetidir.
+    """
+    rss_before = _peak_rss_mb() if measure_rss else None
+    t0 = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_time = time.perf_counter() - t0
+    rss_after = _peak_rss_mb() if measure_rss else None
+
+    y_pred = model.predict(X_val)
+    acc, precision, recall, f1 = compute_metrics(y_val, y_pred)
 
     return {
         "name": name,
@@ -71,34 +111,407 @@ def evaluate_model(name, model, X_train, y_train, X_val, y_val):
         "precision": precision,
         "recall": recall,
         "f1": f1,
-        "n_params": n_params
+        "n_params": count_params(model),
+        "cm": confusion_matrix(y_val, y_pred, labels=CLASSES),
+        "train_time": train_time,
+        "peak_rss_mb": rss_after,
+        "fit_rss_mb": (rss_after - rss_before) if rss_after is not None else None,
     }
 
 
-def main():
-    import os
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_dir = os.path.dirname(script_dir)
-    csv_path = os.path.join(project_dir, "http_requests_labeled.csv")
-    
-    print("[*] Loading dataset from CSV...")
-    X, y = load_dataset_from_csv(csv_path)
-    X = np.array(X, dtype=np.float32)
-    y = np.array(y, dtype=np.int32)
+def print_evaluation(result):
+    print(f"\n{'='*60}")
+    print(f"Training: {result['name']}")
+    print('='*60)
+
+    print(f"\nConfusion matrix (Val):")
+    print(result["cm"])
+    print(f"\nMetrics:")
+    print(f"  Accuracy:  {result['acc']:.4f}")
+    print(f"  Precision: {result['precision']:.4f}")
+    print(f"  Recall:    {result['recall']:.4f}")
+    print(f"  F1-score:  {result['f1']:.4f}")
+
+    n_params = result["n_params"]
+    if n_params is not None:
+        size_bytes = n_params * 4  # float32
+        print(f"\nModel size:")
+        print(f"  Param count: {n_params}")
+        print(f"  Float32 size: {size_bytes} bytes (~{size_bytes/1024:.2f} KB)")
+
+    print(f"\nTraining cost:")
+    print(f"  Wall time: {result['train_time']:.2f}s")
+    if result["peak_rss_mb"] is not None:
+        print(f"  Fit RSS:   +{result['fit_rss_mb']:.1f} MB "
+              f"(worker peak {result['peak_rss_mb']:.1f} MB incl. interpreter + data)")
+
+
+# Karşılaştırılacak aday modeller.
+# scaled=False olan modeller ham (ölçeklenmemiş) feature'larla eğitilir.
+CANDIDATES = [
+    {
+        "name": "LogisticRegression",
+        "estimator": LogisticRegression,
+        "params": dict(
+            max_iter=1000,
+            class_weight="balanced",
+            solver="lbfgs",
+            random_state=42
+        ),
+        "scaled": True,
+    },
+    {
+        "name": "MLP(8)",
+        "estimator": MLPClassifier,
+        "params": dict(
+            hidden_layer_sizes=(8,),
+            activation="relu",
+            solver="adam",
+            alpha=1e-4,
+            batch_size=64,
+            learning_rate_init=1e-3,
+            max_iter=50,
+            random_state=42
+        ),
+        "scaled": True,
+    },
+    {
+        "name": "MLP(16)",
+        "estimator": MLPClassifier,
+        "params": dict(
+            hidden_layer_sizes=(16,),
+            activation="relu",
+            solver="adam",
+            alpha=1e-4,
+            batch_size=64,
+            learning_rate_init=1e-3,
+            max_iter=50,
+            random_state=42
+        ),
+        "scaled": True,
+    },
+    {
+        "name": "DecisionTree(max_depth=5)",
+        "estimator": DecisionTreeClassifier,
+        "params": dict(
+            max_depth=5,
+            min_samples_leaf=10,
+            random_state=42,
+            class_weight="balanced"
+        ),
+        "scaled": False,  # tree için scaling şart değil
+    },
+]
+
+# Worker process'lerde paylaşılan eğitim verisi (_init_worker ile atanır)
+_DATA = {}
+
+
+def _init_worker(data):
+    _DATA.update(data)
+
+
+def _run_candidate(candidate):
+    """
+    Tek bir aday modeli eğit (train_candidates'in aday başına taze worker'ında).
+    """
+    suffix = "scaled" if candidate["scaled"] else "raw"
+    model = candidate["estimator"](**candidate["params"])
+    result = evaluate_model(
+        candidate["name"], model,
+        _DATA[f"X_train_{suffix}"], _DATA["y_train"],
+        _DATA[f"X_val_{suffix}"], _DATA["y_val"], measure_rss=True
+    )
+    result["scaled"] = candidate["scaled"]
+    return result
+
+
+def _worker_context():
+    """
+    Aday worker'ları için multiprocessing context'i. fork ve spawn ile başlayan
+    process'ler Linux'ta ana process'in ru_maxrss değerini devralır; forkserver
+    çocukları küçük sunucu process'inden çatallandığı için sıfırdan başlar.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def train_candidates(candidates, data, jobs):
+    """
+    Adayları jobs process'te paralel eğit; sonuçlar aday sırasıyla döner.
+    jobs=1 dahil her aday kendi taze process'inde çalışır (maxtasksperchild=1),
+    böylece fit RSS'i ana process'in veya önceki adayların belleğini içermez.
+    """
+    with _worker_context().Pool(processes=max(1, jobs), initializer=_init_worker,
+                                initargs=(data,), maxtasksperchild=1) as pool:
+        return pool.map(_run_candidate, candidates, chunksize=1)
+
+
+def load_training_data(csv_path, no_cache=False, rebuild_cache=False):
+    """
+    Returns: (X float32, y int32) - feature cache üzerinden veya doğrudan CSV'den
+    """
+    if no_cache:
+        print("[*] Loading dataset from CSV...")
+        X, y = load_dataset_from_csv(csv_path)
+    else:
+        print("[*] Loading dataset (feature cache)...")
+        X, y = load_features_cached(csv_path, rebuild=rebuild_cache)
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y, dtype=np.int32)
 
     print(f"[+] Loaded {len(X)} samples")
     print(f"    Features: {X.shape[1]}")
     print(f"    Benign: {np.sum(y == 0)}, Malicious: {np.sum(y == 1)}")
+    return X, y
 
-    # Train/Val/Test split
-    print("\n[*] Splitting dataset...")
+
+def split_dataset(X, y):
+    """
+    Sabit seed'li, stratified %70 / %15 / %15 train/val/test ayrımı.
+    Returns: (X_train, X_val, X_test, y_train, y_val, y_test)
+    """
     X_train, X_tmp, y_train, y_tmp = train_test_split(
         X, y, test_size=0.3, random_state=42, stratify=y
     )
     X_val, X_test, y_val, y_test = train_test_split(
         X_tmp, y_tmp, test_size=0.5, random_state=42, stratify=y_tmp
     )
+    return X_train, X_val, X_test, y_train, y_val, y_test
+
+
+def report_test_metrics(model, X_test, y_test):
+    y_test_pred = model.predict(X_test)
+    acc, precision, recall, f1 = compute_metrics(y_test, y_test_pred)
+    cm = confusion_matrix(y_test, y_test_pred, labels=CLASSES)
+
+    print(f"\nConfusion matrix (Test):")
+    print(cm)
+    print(f"\nTest Metrics:")
+    print(f"  Accuracy:  {acc:.4f}")
+    print(f"  Precision: {precision:.4f}")
+    print(f"  Recall:    {recall:.4f}")
+    print(f"  F1-score:  {f1:.4f}")
+
 
+def save_model(script_dir, model, scaler):
+    """
+    Model ve scaler'ı export_model_to_c.py'nin beklediği yere kaydet.
+    """
+    print("\n[*] Saving best model and scaler...")
+    model_path = os.path.join(script_dir, "best_model.pkl")
+    scaler_path = os.path.join(script_dir, "scaler.pkl")
+
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+    with open(scaler_path, "wb") as f:
+        pickle.dump(scaler, f)
+
+    print("[+] Saved:")
+    print("    - best_model.pkl")
+    print("    - scaler.pkl")
+    print("\n[+] Training complete!")
+
+
+class _Reservoir:
+    """
+    Sabit kapasiteli reservoir sample (streaming modda val/test holdout'u).
+    """
+
+    def __init__(self, capacity, n_features, rng):
+        self.X = np.empty((capacity, n_features), dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.int32)
+        self.capacity = capacity
+        self.size = 0
+        self.seen = 0
+        self.rng = rng
+
+    def add(self, X, y):
+        n = len(y)
+        free = min(self.capacity - self.size, n)
+        if free:
+            self.X[self.size:self.size + free] = X[:free]
+            self.y[self.size:self.size + free] = y[:free]
+            self.size += free
+        if n > free:
+            # i. görülen örnek capacity/(i+1) olasılıkla rastgele bir slot'a yazılır
+            positions = self.seen + np.arange(free, n)
+            slots = self.rng.integers(0, positions + 1)
+            keep = slots < self.capacity
+            self.X[slots[keep]] = X[free:][keep]
+            self.y[slots[keep]] = y[free:][keep]
+        self.seen += n
+
+    def data(self):
+        return self.X[:self.size], self.y[:self.size]
+
+
+def _iter_training_batches(csv_path, batch_size, use_cache):
+    """
+    Feature batch'leri: feature cache varsa mmap dilimleri, yoksa CSV'den stream.
+    """
+    entry = cache_entry_dir(csv_path) if use_cache else None
+    if entry and os.path.exists(os.path.join(entry, "meta.json")):
+        X = np.load(os.path.join(entry, "X.npy"), mmap_mode="r")
+        y = np.load(os.path.join(entry, "y.npy"), mmap_mode="r")
+        for i in range(0, len(y), batch_size):
+            yield np.asarray(X[i:i + batch_size]), np.asarray(y[i:i + batch_size])
+        return
+    yield from iter_dataset_batches(csv_path, batch_size)
+
+
+def _iter_split_batches(csv_path, batch_size, use_cache):
+    """
+    Her satır sabit seed'li RNG ile train (%70) / val (%15) / test (%15)'e atanır;
+    her geçişte aynı atama üretilir.
+    Yields: (X, y, train_mask, val_mask, test_mask)
+    """
+    rng = np.random.default_rng(42)
+    for X, y in _iter_training_batches(csv_path, batch_size, use_cache):
+        u = rng.random(len(y))
+        val = u < 0.15
+        test = (u >= 0.15) & (u < 0.30)
+        yield X, y, ~(val | test), val, test
+
+
+def train_streaming(csv_path, batch_size, epochs, eval_every, holdout_max, use_cache):
+    """
+    Dataset'i belleğe almadan eğit: incremental StandardScaler + partial_fit
+    destekleyen modeller (SGD logistic regression, MLP).
+    Bellek kullanımı batch_size ve holdout_max ile sınırlıdır.
+    Returns: (best_model, scaler)
+    """
+    n_features = N_FEATURES
+
+    # Geçiş 1: scaler istatistikleri + val/test holdout
+    print("\n[*] Pass 1: incremental scaler statistics + holdout sampling...")
+    scaler = StandardScaler()
+    val = _Reservoir(holdout_max, n_features, np.random.default_rng(1))
+    test = _Reservoir(holdout_max, n_features, np.random.default_rng(2))
+    class_counts = np.zeros(2, dtype=np.int64)
+    for X, y, tr, va, te in _iter_split_batches(csv_path, batch_size, use_cache):
+        if tr.any():
+            scaler.partial_fit(X[tr])
+            class_counts += np.bincount(y[tr], minlength=2)[:2]
+        val.add(X[va], y[va])
+        test.add(X[te], y[te])
+
+    n_train = int(class_counts.sum())
+    print(f"    Train: {n_train}, Val: {val.size}/{val.seen}, Test: {test.size}/{test.seen}")
+    print(f"    Benign: {class_counts[0]}, Malicious: {class_counts[1]}")
+    if n_train == 0:
+        raise SystemExit("[!] No training samples")
+
+    # SGD partial_fit "balanced" desteklemiyor -> ağırlıkları 1. geçişten hesapla
+    class_weight = {
+        c: n_train / (2.0 * class_counts[c]) for c in CLASSES if class_counts[c] > 0
+    }
+
+    X_val, y_val = val.data()
+    X_val_scaled = scaler.transform(X_val)
+
+    models = {
+        "SGDLogisticRegression": SGDClassifier(
+            loss="log_loss",
+            alpha=1e-4,
+            class_weight=class_weight,
+            random_state=42
+        ),
+        "MLP(8)": MLPClassifier(
+            hidden_layer_sizes=(8,),
+            activation="relu",
+            solver="adam",
+            alpha=1e-4,
+            batch_size=64,
+            learning_rate_init=1e-3,
+            random_state=42
+        ),
+    }
+
+    def report_val(tag):
+        scores = {}
+        for name, model in models.items():
+            _, _, _, f1 = compute_metrics(y_val, model.predict(X_val_scaled))
+            scores[name] = f1
+        print(f"  [{tag}] " + " | ".join(f"{n}: F1={f:.4f}" for n, f in scores.items()))
+        return scores
+
+    # Geçiş 2..N: partial_fit
+    scores = {}
+    for epoch in range(1, epochs + 1):
+        print(f"\n[*] Epoch {epoch}/{epochs}")
+        step = 0
+        for X, y, tr, _, _ in _iter_split_batches(csv_path, batch_size, use_cache):
+            if not tr.any():
+                continue
+            X_scaled = scaler.transform(X[tr])
+            for model in models.values():
+                model.partial_fit(X_scaled, y[tr], classes=CLASSES)
+            step += 1
+            if eval_every and step % eval_every == 0 and len(y_val):
+                report_val(f"epoch {epoch}, batch {step}")
+        if len(y_val):
+            scores = report_val(f"epoch {epoch} done")
+
+    print("\n" + "="*60)
+    print("MODEL COMPARISON (Validation F1, streaming)")
+    print("="*60)
+    for name, model in models.items():
+        print(f"{name:30s} | F1: {scores.get(name, 0.0):.4f} | Params: {count_params(model)}")
+
+    best_name = max(models, key=lambda n: scores.get(n, 0.0))
+    print("\n" + "="*60)
+    print(f"BEST MODEL: {best_name} (F1: {scores.get(best_name, 0.0):.4f})")
+    print("="*60)
+
+    X_test, y_test = test.data()
+    if len(y_test):
+        print("\n[*] Evaluating best model on TEST set...")
+        report_test_metrics(models[best_name], scaler.transform(X_test), y_test)
+    return models[best_name], scaler
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(description="WAF model eğitimi ve karşılaştırma")
+    parser.add_argument("--csv", default=os.path.join(project_dir, "http_requests_labeled.csv"),
+                        help="Etiketli CSV (parse_access_log çıktısı)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Feature cache'i kullanma, CSV'den yeniden çıkar")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Feature cache'ini yeniden oluştur")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Aday modelleri paralel eğitecek process sayısı (0 = otomatik, 1 = sıralı)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Dataset'i belleğe almadan partial_fit ile eğit")
+    parser.add_argument("--batch-size", type=int, default=50000,
+                        help="Streaming modda batch başına satır sayısı")
+    parser.add_argument("--epochs", type=int, default=5,
+                        help="Streaming modda dataset üzerinden geçiş sayısı")
+    parser.add_argument("--eval-every", type=int, default=20,
+                        help="Streaming modda her N batch'te validation metriklerini yazdır")
+    parser.add_argument("--holdout-max", type=int, default=200000,
+                        help="Streaming modda val/test için tutulacak maksimum örnek")
+    args = parser.parse_args()
+    csv_path = args.csv
+
+    if args.streaming:
+        print(f"[*] Streaming training from {csv_path} (batch size {args.batch_size})...")
+        model, scaler = train_streaming(
+            csv_path, args.batch_size, args.epochs, args.eval_every,
+            args.holdout_max, use_cache=not args.no_cache
+        )
+        save_model(script_dir, model, scaler)
+        return
+
+    X, y = load_training_data(csv_path, args.no_cache, args.rebuild_cache)
+
+    # Train/Val/Test split
+    print("\n[*] Splitting dataset...")
+    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(X, y)
     print(f"    Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
 
     # Feature scaling
@@ -108,86 +521,29 @@ def main():
     X_val_scaled = scaler.transform(X_val)
     X_test_scaled = scaler.transform(X_test)
 
-    results = []
-
-    # 1) Logistic Regression
-    logreg = LogisticRegression(
-        max_iter=1000,
-        class_weight="balanced",
-        solver="lbfgs",
-        random_state=42
-    )
-    results.append(
-        evaluate_model(
-            "LogisticRegression",
-            logreg,
-            X_train_scaled, y_train,
-            X_val_scaled, y_val
-        )
-    )
-
-    # 2) Küçük MLP (8 nöron)
-    mlp8 = MLPClassifier(
-        hidden_layer_sizes=(8,),
-        activation="relu",
-        solver="adam",
-        alpha=1e-4,
-        batch_size=64,
-        learning_rate_init=1e-3,
-        max_iter=50,
-        random_state=42
-    )
-    results.append(
-        evaluate_model(
-            "MLP(8)",
-            mlp8,
-            X_train_scaled, y_train,
-            X_val_scaled, y_val
-        )
-    )
-
-    # 3) Biraz daha büyük MLP (16 nöron)
-    mlp16 = MLPClassifier(
-        hidden_layer_sizes=(16,),
-        activation="relu",
-        solver="adam",
-        alpha=1e-4,
-        batch_size=64,
-        learning_rate_init=1e-3,
-        max_iter=50,
-        random_state=42
-    )
-    results.append(
-        evaluate_model(
-            "MLP(16)",
-            mlp16,
-            X_train_scaled, y_train,
-            X_val_scaled, y_val
-        )
-    )
+    jobs = args.jobs if args.jobs > 0 else min(len(CANDIDATES), os.cpu_count() or 1)
+    print(f"\n[*] Training {len(CANDIDATES)} candidate models ({jobs} parallel job(s))...")
+    data = {
+        "X_train_scaled": X_train_scaled, "X_val_scaled": X_val_scaled,
+        "X_train_raw": X_train, "X_val_raw": X_val,
+        "y_train": y_train, "y_val": y_val,
+    }
+    t0 = time.perf_counter()
+    results = train_candidates(CANDIDATES, data, jobs)
+    total_time = time.perf_counter() - t0
 
-    # 4) Küçük Decision Tree
-    tree = DecisionTreeClassifier(
-        max_depth=5,
-        min_samples_leaf=10,
-        random_state=42,
-        class_weight="balanced"
-    )
-    results.append(
-        evaluate_model(
-            "DecisionTree(max_depth=5)",
-            tree,
-            X_train, y_train,  # tree için scaling şart değil
-            X_val, y_val
-        )
-    )
+    for r in results:
+        print_evaluation(r)
 
     # En iyi modeli seç (F1'e göre)
     print("\n" + "="*60)
     print("MODEL COMPARISON (Validation F1)")
     print("="*60)
     for r in results:
-        print(f"{r['name']:30s} | F1: {r['f1']:.4f} | Params: {r['n_params']}")
+        rss = f"+{r['fit_rss_mb']:.1f} MB" if r["fit_rss_mb"] is not None else "n/a"
+        print(f"{r['name']:30s} | F1: {r['f1']:.4f} | Params: {r['n_params']} | "
+              f"Time: {r['train_time']:.2f}s | Fit RSS: {rss}")
+    print(f"Total wall time: {total_time:.2f}s ({jobs} job(s))")
 
     best = max(results, key=lambda r: r["f1"])
     print("\n" + "="*60)
@@ -196,40 +552,10 @@ def main():
 
     # Test set üzerinde final değerlendirme
     print("\n[*] Evaluating best model on TEST set...")
-    if isinstance(best["model"], DecisionTreeClassifier):
-        X_test_used = X_test
-    else:
-        X_test_used = X_test_scaled
-
-    y_test_pred = best["model"].predict(X_test_used)
-    acc = accuracy_score(y_test, y_test_pred)
-    precision, recall, f1, _ = precision_recall_fscore_support(
-        y_test, y_test_pred, average="binary", zero_division=0
-    )
-    cm = confusion_matrix(y_test, y_test_pred)
-
-    print(f"\nConfusion matrix (Test):")
-    print(cm)
-    print(f"\nTest Metrics:")
-    print(f"  Accuracy:  {acc:.4f}")
-    print(f"  Precision: {precision:.4f}")
-    print(f"  Recall:    {recall:.4f}")
-    print(f"  F1-score:  {f1:.4f}")
+    X_test_used = X_test_scaled if best["scaled"] else X_test
 
-    # Model ve scaler'ı kaydet
-    print("\n[*] Saving best model and scaler...")
-    model_path = os.path.join(script_dir, "best_model.pkl")
-    scaler_path = os.path.join(script_dir, "scaler.pkl")
-    
-    with open(model_path, "wb") as f:
-        pickle.dump(best["model"], f)
-    with open(scaler_path, "wb") as f:
-        pickle.dump(scaler, f)
-    
-    print("[+] Saved:")
-    print("    - best_model.pkl")
-    print("    - scaler.pkl")
-    print("\n[+] Training complete!")
+    report_test_metrics(best["model"], X_test_used, y_test)
+    save_model(script_dir, best["model"], scaler)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+ESP8266 WAF'ın host'ta çalışan simülatörü (asyncio reverse proxy).
+
+Firmware'deki handleClient akışının aynısı: istek satırı + en fazla 20 header
+okunur, feature'lar çıkarılır (f19-f21 IP sliding window dahil), ölçeklenir,
+model çalıştırılır; malicious ise 403, değilse istek backend_api'ye iletilir
+ve sonuç dashboard'a /api/report ile bildirilir. Donanım olmadan uçtan uca
+gecikme / throughput testleri (replay_load.py) için hedef olarak kullanılır.
+
+Karar motorları:
+    c       firmware header'ları (esp8266_features.h, ip_window.h, scaler_params.h,
+            model_weights.h) host C++ derleyicisiyle derlenir -> firmware ile bire bir
+    python  features.py + ip_window.py + host_inference (derleyici yoksa / .pkl model)
+
+    python3 waf_simulator.py --port 8000 --backend http://127.0.0.1:8080 --dashboard http://127.0.0.1:5000
+    python3 replay_load.py --target http://127.0.0.1:8000 --csv ../http_requests_labeled.csv --rate 500
+"""
+import argparse
+import asyncio
+import ctypes
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from async_http import HTTPConnectionPool, read_request, wants_keep_alive
+from features import N_FEATURES, extract_features_from_row
+from host_build import build_shared_library, find_compiler
+from ip_window import IPWindowTracker, ip_to_u32
+from replay_load import LatencyHistogram
+
+FIRMWARE_INCLUDE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "esp8266_firmware", "include"
+)
+
+# esp8266_waf.ino ile aynı sabitler
+MAX_HEADERS = 20
+MALICIOUS_THRESHOLD = 0.5
+BACKEND_TIMEOUT = 5.0
+CLIENT_TIMEOUT = 1.0
+FIRMWARE_WINDOW_IPS = 32   # ip_window.h: IP_WINDOW_MAX_IPS
+
+REPORT_QUEUE_SIZE = 10000
+REPORT_WORKERS = 4
+REPORT_BATCH_SIZE = 100     # worker başına tek POST'taki en fazla olay (/api/report/batch)
+STATS_INTERVAL = 10.0
+
+# Backend'e iletilmeyen / yanıtta yeniden yazılan hop-by-hop header'lar
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-connection", "transfer-encoding",
+    "te", "trailer", "upgrade", "content-length", "host",
+}
+
+ENGINE_SOURCE = """
+#include "scaler_params.h"
+#include "model_weights.h"
+#include "esp8266_features.h"
+#include "ip_window.h"
+
+extern "C" void waf_reset() {
+    ip_window_reset();
+}
+
+// esp8266_waf.ino handleClient(): extract -> ip window -> scale -> inference
+extern "C" float waf_decide(
+    const char* method, const char* path, const char* query, const char* user_agent,
+    const char** headers, int num_headers, int content_length,
+    unsigned int client_ip, unsigned int now_sec, float* features_out
+) {
+    float features[N_FEATURES];
+    extract_features(method, path, query, user_agent, headers, num_headers,
+                     content_length, features);
+    ip_window_observe(client_ip, now_sec, path, features[7] > 0.5f, &features[19]);
+    for (int i = 0; i < N_FEATURES; i++) {
+        features_out[i] = features[i];
+    }
+    scale_features(features);
+    return model_inference(features);
+}
+"""
+
+_LEADING_INT_RE = re.compile(r"\s*([-+]?\d+)")
+
+
+def _to_int(text):
+    # Arduino String::toInt(): baştaki tamsayı, yoksa 0
+    m = _LEADING_INT_RE.match(text)
+    return int(m.group(1)) if m else 0
+
+
+def firmware_view(request):
+    """
+    İsteği firmware'in gördüğü haliyle döndür (parseRequestLine + header döngüsü).
+    Returns: dict(method, path, query, user_agent, header_lines, content_length)
+    """
+    full_path = request.target
+    q = full_path.find("?")
+    if q > 0:
+        path, query = full_path[:q], full_path[q + 1:]
+    else:
+        path, query = full_path, ""
+
+    header_lines = [f"{name}: {value}" for name, value in request.headers[:MAX_HEADERS]]
+    user_agent = ""
+    content_length = 0
+    for line in header_lines:
+        # Firmware: startsWith (büyük/küçük harf duyarlı)
+        if line.startswith("User-Agent:"):
+            user_agent = line[11:].strip()
+        elif line.startswith("Content-Length:"):
+            content_length = _to_int(line[15:])
+    return {
+        "method": request.method,
+        "path": path,
+        "query": query,
+        "user_agent": user_agent,
+        "header_lines": header_lines,
+        "content_length": content_length,
+    }
+
+
+def _c_str(text):
+    return text.encode("utf-8", "surrogateescape")
+
+
+class CEngine:
+    """Firmware header'larını derleyip doğrudan çağırır (firmware ile aynı sonuç)."""
+
+    name = "c"
+
+    def __init__(self, model_dir):
+        self.lib = build_shared_library(
+            ENGINE_SOURCE, include_dirs=[model_dir, FIRMWARE_INCLUDE_DIR], name="waf_simulator"
+        )
+        self.lib.waf_decide.restype = ctypes.c_float
+        self.lib.waf_reset()
+        self._features = (ctypes.c_float * N_FEATURES)()
+
+    def decide(self, view, client_ip, now):
+        lines = view["header_lines"]
+        headers = (ctypes.c_char_p * max(len(lines), 1))(*[_c_str(h) for h in lines])
+        proba = self.lib.waf_decide(
+            _c_str(view["method"]), _c_str(view["path"]), _c_str(view["query"]),
+            _c_str(view["user_agent"]), headers, len(lines), view["content_length"],
+            ctypes.c_uint(ip_to_u32(client_ip)), ctypes.c_uint(int(now) & 0xFFFFFFFF),
+            self._features,
+        )
+        return float(proba)
+
+
+class PythonEngine:
+    """features.py + ip_window.py + host_inference (eğitim tarafı semantiği)."""
+
+    name = "python"
+
+    def __init__(self, model_spec, mode="float"):
+        from host_inference import load_model
+
+        self.model = load_model(model_spec, mode)
+        self.window = IPWindowTracker(max_ips=FIRMWARE_WINDOW_IPS)
+
+    def decide(self, view, client_ip, now):
+        row = {
+            "ip": client_ip,
+            "timestamp": now,
+            "method": view["method"],
+            "path": view["path"],
+            "query": view["query"],
+            "user_agent": view["user_agent"],
+            "headers": ";".join(view["header_lines"]),
+            "content_length": view["content_length"],
+        }
+        features, _ = extract_features_from_row(row, self.window)
+        X = np.asarray([features], dtype=np.float32)
+        return float(self.model.predict_proba(X)[0])
+
+
+def make_engine(kind, model_spec, mode):
+    if kind == "auto":
+        kind = "c" if os.path.isdir(model_spec) and find_compiler() else "python"
+    if kind == "c":
+        if not os.path.isdir(model_spec):
+            raise SystemExit("[!] --engine c needs a header directory for --model")
+        return CEngine(model_spec)
+    return PythonEngine(model_spec, mode)
+
+
+def blocked_body(probability):
+    # esp8266_waf.ino blockRequest() ile aynı sayfa
+    return (
+        "<!DOCTYPE html>\r\n"
+        "<html><head><title>403 Forbidden</title></head>\r\n"
+        "<body>\r\n"
+        "<h1>403 Forbidden</h1>\r\n"
+        "<p>Your request has been blocked by the Web Application Firewall.</p>\r\n"
+        "<p>Reason: Malicious pattern detected</p>\r\n"
+        f"<p>Detection confidence: {probability * 100.0:.2f}%</p>\r\n"
+        "<hr><p><small>ESP8266 TinyML Mini-WAF</small></p>\r\n"
+        "</body></html>\r\n"
+    ).encode("utf-8")
+
+
+def build_response(status, reason, headers, body, keep_alive):
+    lines = [f"HTTP/1.1 {status} {reason}".rstrip()]
+    lines += [f"{name}: {value}" for name, value in headers if name.lower() not in HOP_BY_HOP]
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8", "surrogateescape") + body
+
+
+class DashboardReporter:
+    """
+    Olayları arka planda dashboard'a batch'ler hâlinde POST eder (istek yolunu bekletmez).
+    Kuyruk doluysa olay düşürülür ve sayılır.
+    """
+
+    def __init__(self, url, workers=REPORT_WORKERS, queue_size=REPORT_QUEUE_SIZE):
+        parts = urlsplit(url)
+        self.pool = HTTPConnectionPool(parts.hostname, parts.port or 80, workers)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    def submit(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _worker(self):
+        while True:
+            # Kuyrukta biriken olaylar tek NDJSON batch'inde gönderilir
+            batch = [await self.queue.get()]
+            while len(batch) < REPORT_BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                body = "".join(json.dumps(event) + "\n" for event in batch).encode("utf-8")
+                response = await asyncio.wait_for(
+                    self.pool.request("POST", "/api/report/batch",
+                                      [("Content-Type", "application/x-ndjson")], body),
+                    BACKEND_TIMEOUT,
+                )
+                if response.status == 200:
+                    accepted = json.loads(response.body).get("accepted", len(batch))
+                    self.sent += accepted
+                    self.failed += len(batch) - accepted
+                else:
+                    self.failed += len(batch)
+            except (OSError, ConnectionError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError, ValueError):
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def close(self, drain_timeout=2.0):
+        try:
+            await asyncio.wait_for(self.queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._tasks:
+            task.cancel()
+        self.pool.close()
+
+
+class WAFSimulator:
+    def __init__(self, engine, backend_url, reporter=None, threshold=MALICIOUS_THRESHOLD,
+                 backend_connections=32, keep_alive=False, verbose=False):
+        parts = urlsplit(backend_url)
+        self.engine = engine
+        self.backend = HTTPConnectionPool(parts.hostname, parts.port or 80, backend_connections)
+        self.reporter = reporter
+        self.threshold = threshold
+        self.keep_alive = keep_alive
+        self.verbose = verbose
+        self.counts = {"total": 0, "allowed": 0, "blocked": 0, "backend_errors": 0, "bad_requests": 0}
+        self.decision_latency = LatencyHistogram()
+        self.request_latency = LatencyHistogram()
+
+    async def handle_client(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else "0.0.0.0"
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), CLIENT_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError:
+                    self.counts["bad_requests"] += 1
+                    writer.write(build_response(400, "Bad Request", [], b"Bad Request", False))
+                    break
+                if request is None:
+                    break
+
+                keep_alive = self.keep_alive and wants_keep_alive(request)
+                writer.write(await self.process(request, client_ip, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def process(self, request, client_ip, keep_alive):
+        t0 = time.perf_counter()
+        self.counts["total"] += 1
+        view = firmware_view(request)
+
+        probability = self.engine.decide(view, client_ip, time.time())
+        malicious = probability >= self.threshold
+        self.decision_latency.record(time.perf_counter() - t0)
+
+        if malicious:
+            self.counts["blocked"] += 1
+            response = build_response(403, "Forbidden", [("Content-Type", "text/html")],
+                                      blocked_body(probability), keep_alive)
+        else:
+            self.counts["allowed"] += 1
+            response = await self.forward(view, request, keep_alive)
+
+        if self.reporter is not None:
+            self.reporter.submit({
+                "method": view["method"],
+                "path": view["path"],
+                "query": view["query"],
+                "user_agent": view["user_agent"],
+                "probability": round(probability, 4),
+                "classification": "MALICIOUS" if malicious else "BENIGN",
+                "action": "BLOCKED" if malicious else "ALLOWED",
+                "client_ip": client_ip,
+            })
+        self.request_latency.record(time.perf_counter() - t0)
+        if self.verbose:
+            print(f"[{'BLOCKED' if malicious else 'ALLOWED'}] {view['method']} {request.target} "
+                  f"(prob={probability:.4f})")
+        return response
+
+    async def forward(self, view, request, keep_alive):
+        if not view["method"] or not view["path"]:
+            return build_response(500, "Internal Server Error", [], b"WAF Error", keep_alive)
+        headers = [(n, v) for n, v in request.headers[:MAX_HEADERS] if n.lower() not in HOP_BY_HOP]
+        try:
+            response = await asyncio.wait_for(
+                self.backend.request(view["method"], request.target, headers, request.body),
+                BACKEND_TIMEOUT,
+            )
+        except (OSError, ConnectionError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError, ValueError):
+            self.counts["backend_errors"] += 1
+            return build_response(502, "Bad Gateway", [], b"Backend unavailable", keep_alive)
+        return build_response(response.status, response.reason, response.headers,
+                              response.body, keep_alive)
+
+    def stats_line(self, elapsed):
+        c = self.counts
+        line = (f"total={c['total']} allowed={c['allowed']} blocked={c['blocked']} "
+                f"502={c['backend_errors']} | {c['total'] / elapsed:,.1f} req/s | "
+                f"decision p50/p99 {self.decision_latency.percentile(50) * 1e6:.0f}/"
+                f"{self.decision_latency.percentile(99) * 1e6:.0f} us | "
+                f"request p99 {self.request_latency.percentile(99) * 1e3:.2f} ms")
+        if self.reporter is not None:
+            r = self.reporter
+            line += f" | reports sent={r.sent} failed={r.failed} dropped={r.dropped}"
+        return line
+
+
+async def serve(args):
+    engine = make_engine(args.engine, args.model, args.mode)
+    reporter = DashboardReporter(args.dashboard) if args.dashboard else None
+    sim = WAFSimulator(engine, args.backend, reporter, args.threshold,
+                       args.backend_connections, args.keep_alive, args.verbose)
+
+    server = await asyncio.start_server(sim.handle_client, args.host, args.port, backlog=1024)
+    print(f"[+] WAF simulator listening on http://{args.host}:{args.port} "
+          f"(engine: {engine.name}, model: {args.model})")
+    print(f"    Backend: {args.backend} | Dashboard: {args.dashboard or 'disabled'} | "
+          f"keep-alive: {'on' if args.keep_alive else 'off (firmware behaviour)'}")
+
+    start = time.perf_counter()
+
+    async def report_stats():
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(f"[*] {sim.stats_line(time.perf_counter() - start)}")
+
+    stats_task = asyncio.create_task(report_stats()) if args.stats_interval > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if stats_task is not None:
+            stats_task.cancel()
+        if reporter is not None:
+            await reporter.close()
+        sim.backend.close()
+        print(f"[+] {sim.stats_line(time.perf_counter() - start)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ESP8266 WAF simulator (async reverse proxy)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backend", default="http://127.0.0.1:8080", help="backend_api URL")
+    parser.add_argument("--dashboard", default="http://127.0.0.1:5000",
+                        help="Dashboard URL ('' = raporlama kapalı)")
+    parser.add_argument("--model", default=FIRMWARE_INCLUDE_DIR,
+                        help="Header dizini (scaler_params.h + model_weights.h) veya best_model.pkl")
+    parser.add_argument("--mode", choices=("float", "folded", "int8"), default="float",
+                        help=".pkl model için export modu (python engine)")
+    parser.add_argument("--engine", choices=("auto", "c", "python"), default="auto")
+    parser.add_argument("--threshold", type=float, default=MALICIOUS_THRESHOLD)
+    parser.add_argument("--backend-connections", type=int, default=32,
+                        help="Backend bağlantı havuzu boyutu")
+    parser.add_argument("--keep-alive", action="store_true",
+                        help="İstemci bağlantılarını açık tut (firmware her yanıttan sonra kapatır)")
+    parser.add_argument("--stats-interval", type=float, default=STATS_INTERVAL,
+                        help="İstatistik satırı aralığı (sn, 0 = kapalı)")
+    parser.add_argument("--verbose", action="store_true", help="Her kararı yazdır")
+    args = parser.parse_args()
+
+    for name in ("backend", "dashboard"):
+        url = getattr(args, name)
+        if url and (urlsplit(url).scheme != "http" or not urlsplit(url).hostname):
+            parser.error(f"--{name} must be an http:// URL")
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()